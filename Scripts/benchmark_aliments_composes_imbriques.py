@@ -0,0 +1,195 @@
+import os
+import sys
+import time
+import random
+import sqlite3
+import tempfile
+
+# Ajouter le chemin parent au path pour importer les modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.db_manager import DatabaseManager  # noqa: E402
+from benchmark_database import mesurer  # noqa: E402
+
+PROFONDEUR = 5  # Niveaux d'aliments composés
+LARGEUR = 20  # Aliments composés par niveau et ingrédients de chacun (fan-out)
+
+
+def construire_graphe(db_manager, db_path):
+    """
+    Crée PROFONDEUR niveaux de LARGEUR aliments composés. Chaque aliment composé
+    contient les LARGEUR aliments composés du niveau suivant ; ceux du dernier
+    niveau contiennent LARGEUR aliments de base.
+
+    Un développement naïf d'un aliment du premier niveau parcourt
+    LARGEUR ** PROFONDEUR chemins ; l'aplatissement mémoïsé ne calcule chaque
+    aliment composé qu'une fois.
+
+    Returns:
+        list: Les niveaux, chacun étant la liste de ses aliments composés
+    """
+    rng = random.Random(42)
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        """
+        INSERT INTO aliments (nom, calories, proteines, glucides, lipides, fibres, prix_kg)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        [
+            (
+                f"Aliment {i}",
+                rng.uniform(20, 500),
+                rng.uniform(0, 30),
+                rng.uniform(0, 80),
+                rng.uniform(0, 40),
+                rng.uniform(0, 10),
+                rng.uniform(1, 30),
+            )
+            for i in range(LARGEUR)
+        ],
+    )
+    conn.commit()
+    aliments = [row[0] for row in conn.execute("SELECT id FROM aliments")]
+    conn.close()
+
+    niveaux = [
+        [
+            db_manager.ajouter_aliment_compose(f"Niveau {niveau} - {i}", "", "Imbriqué")
+            for i in range(LARGEUR)
+        ]
+        for niveau in range(PROFONDEUR)
+    ]
+
+    # Construire du bas vers le haut : chaque ajout ne recalcule que ses parents
+    with db_manager.batch():
+        for aliment_compose_id in niveaux[-1]:
+            for aliment_id in aliments:
+                db_manager.ajouter_ingredient_aliment_compose(
+                    aliment_compose_id, aliment_id, rng.uniform(10, 200)
+                )
+        for niveau in range(PROFONDEUR - 2, -1, -1):
+            for aliment_compose_id in niveaux[niveau]:
+                for sous_compose_id in niveaux[niveau + 1]:
+                    db_manager.ajouter_sous_compose_aliment_compose(
+                        aliment_compose_id, sous_compose_id, rng.uniform(10, 200)
+                    )
+    return niveaux
+
+
+def developpement_naif(db_path, aliment_compose_id):
+    """Développe un aliment composé récursivement, sans mémoïsation (référence)"""
+    conn = sqlite3.connect(db_path)
+    composition = {}
+    for compose_id, aliment_id, sous_compose_id, quantite in conn.execute(
+        """
+        SELECT aliment_compose_id, aliment_id, sous_compose_id, quantite
+        FROM aliments_composes_ingredients
+        """
+    ):
+        composition.setdefault(compose_id, []).append(
+            (aliment_id, sous_compose_id, quantite)
+        )
+    conn.close()
+
+    def developper(compose_id, quantite_voulue, quantites):
+        ingredients = composition.get(compose_id, [])
+        poids = sum(quantite for _, _, quantite in ingredients)
+        for aliment_id, sous_compose_id, quantite in ingredients:
+            part = quantite_voulue * quantite / poids
+            if sous_compose_id is None:
+                quantites[aliment_id] = quantites.get(aliment_id, 0) + part
+            else:
+                developper(sous_compose_id, part, quantites)
+
+    quantites = {}
+    poids_total = sum(quantite for _, _, quantite in composition[aliment_compose_id])
+    developper(aliment_compose_id, poids_total, quantites)
+    return quantites
+
+
+def main():
+    """Mesure les aliments composés imbriqués (profondeur 5, fan-out 20)"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "imbriques.db")
+
+        db_manager = DatabaseManager(db_path)
+        db_manager.init_db()
+
+        print(
+            f"Construction du graphe ({PROFONDEUR} niveaux x {LARGEUR} aliments "
+            f"composés, fan-out {LARGEUR})..."
+        )
+        debut = time.perf_counter()
+        niveaux = construire_graphe(db_manager, db_path)
+        print(
+            f"    {PROFONDEUR * LARGEUR} aliments composés, "
+            f"{(PROFONDEUR - 1) * LARGEUR * LARGEUR + LARGEUR * LARGEUR} liens "
+            f"en {(time.perf_counter() - debut) * 1000:.0f} ms"
+        )
+
+        racine = niveaux[0][0]
+        feuille = niveaux[-1][0]
+        print(f"\nLARGEUR ** PROFONDEUR = {LARGEUR ** PROFONDEUR} chemins par racine")
+
+        debut = time.perf_counter()
+        reference = developpement_naif(db_path, racine)
+        print(
+            f"{'développement naïf (1 racine, référence)':<45} "
+            f"{(time.perf_counter() - debut) * 1000:>10.2f} ms  (1 exécution)"
+        )
+
+        # L'aplatissement mémoïsé doit donner les mêmes quantités
+        conn = sqlite3.connect(db_path)
+        aplatis = dict(
+            conn.execute(
+                """
+                SELECT aliment_id, quantite FROM aliments_composes_aplatis
+                WHERE aliment_compose_id = ?
+                """,
+                (racine,),
+            ).fetchall()
+        )
+        conn.close()
+        ecart = max(abs(aplatis[a] - q) / q for a, q in reference.items())
+        print(f"    écart relatif maximal avec l'aplatissement en cache: {ecart:.1e}")
+
+        mesurer(
+            "get_aliments_composes_resume (100 composés)",
+            db_manager.get_aliments_composes_resume,
+            50,
+        )
+        mesurer(
+            "get_aliment_compose (racine)",
+            lambda: db_manager.get_aliment_compose(racine),
+            200,
+        )
+        repas_id = db_manager.ajouter_repas("Repas", "Lundi", 1, 1)
+        mesurer(
+            "ajouter_aliment_compose_a_repas (racine)",
+            lambda: db_manager.ajouter_aliment_compose_a_repas(repas_id, racine, 250),
+            50,
+        )
+
+        aliment = db_manager.get_aliment(1)
+        calories = iter(range(100, 100000))
+        mesurer(
+            "modifier_aliment (utilisé par 100 composés)",
+            lambda: db_manager.modifier_aliment(
+                1, dict(aliment, calories=next(calories))
+            ),
+            50,
+        )
+        quantites = iter(range(1, 100000))
+        mesurer(
+            "ajouter_ingredient (dernier niveau, 80 parents)",
+            lambda: db_manager.ajouter_ingredient_aliment_compose(
+                feuille, 1, next(quantites)
+            ),
+            20,
+        )
+
+        db_manager.shutdown()
+
+
+if __name__ == "__main__":
+    main()
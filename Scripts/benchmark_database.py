@@ -0,0 +1,279 @@
+import os
+import sys
+import time
+import random
+import sqlite3
+import tempfile
+
+# Ajouter le chemin parent au path pour importer les modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.db_manager import DatabaseManager  # noqa: E402
+from src.database.db_connector import PROFILS_PRAGMA  # noqa: E402
+from src.database.db_aliments_composes import actualiser_aplatissement  # noqa: E402
+
+JOURS = ["Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi", "Samedi", "Dimanche"]
+
+
+def peupler_base(
+    db_path,
+    nb_aliments=500,
+    nb_semaines=52,
+    repas_par_jour=6,
+    nb_composes=200,
+    nb_recettes=500,
+):
+    """
+    Crée une base volumineuse pour les mesures :
+    - nb_aliments aliments répartis sur plusieurs magasins et catégories
+    - nb_semaines semaines de 7 jours avec repas_par_jour repas de 5 aliments
+    - nb_composes aliments composés de 5 ingrédients
+    - nb_recettes recettes de 8 aliments, dont une partie sans catégorie
+    """
+    rng = random.Random(42)
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    magasins = ["Carrefour", "Leclerc", "Auchan", "Lidl", "Marché", None]
+    categories = ["Protéines", "Féculents", "Légumes", "Fruits", "Laitiers", None]
+    cursor.executemany(
+        """
+        INSERT INTO aliments (nom, marque, magasin, categorie, calories,
+                              proteines, glucides, lipides, fibres, prix_kg)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        [
+            (
+                f"Aliment {i}",
+                f"Marque {i % 37}",
+                rng.choice(magasins),
+                rng.choice(categories),
+                rng.uniform(20, 500),
+                rng.uniform(0, 30),
+                rng.uniform(0, 80),
+                rng.uniform(0, 40),
+                rng.uniform(0, 10),
+                rng.uniform(1, 30),
+            )
+            for i in range(nb_aliments)
+        ],
+    )
+
+    for semaine_id in range(1, nb_semaines + 1):
+        for jour in JOURS:
+            for ordre in range(1, repas_par_jour + 1):
+                cursor.execute(
+                    "INSERT INTO repas (nom, jour, ordre, semaine_id) VALUES (?, ?, ?, ?)",
+                    (f"Repas {ordre}", jour, ordre, semaine_id),
+                )
+                repas_id = cursor.lastrowid
+                cursor.executemany(
+                    """
+                    INSERT INTO repas_aliments (repas_id, aliment_id, quantite)
+                    VALUES (?, ?, ?)
+                    """,
+                    [
+                        (repas_id, aliment_id, rng.uniform(20, 300))
+                        for aliment_id in rng.sample(range(1, nb_aliments + 1), 5)
+                    ],
+                )
+                if ordre == 1:
+                    cursor.execute(
+                        """
+                        INSERT INTO repas_multiplicateurs (repas_id, multiplicateur, ignore_course)
+                        VALUES (?, ?, ?)
+                        """,
+                        (repas_id, 2, 1 if jour == "Dimanche" else 0),
+                    )
+
+    aliments_composes = []
+    for i in range(nb_composes):
+        cursor.execute(
+            "INSERT INTO aliments_composes (nom, description, categorie) VALUES (?, ?, ?)",
+            (f"Composé {i}", "", rng.choice(["Sauce", "Mélange", "Pâte"])),
+        )
+        aliment_compose_id = cursor.lastrowid
+        aliments_composes.append(aliment_compose_id)
+        cursor.executemany(
+            """
+            INSERT INTO aliments_composes_ingredients (aliment_compose_id, aliment_id, quantite)
+            VALUES (?, ?, ?)
+            """,
+            [
+                (aliment_compose_id, aliment_id, rng.uniform(10, 200))
+                for aliment_id in rng.sample(range(1, nb_aliments + 1), 5)
+            ],
+        )
+    # Ingrédients insérés directement : calculer l'aplatissement et les totaux
+    actualiser_aplatissement(cursor, aliments_composes)
+
+    cursor.executemany(
+        "INSERT INTO categories_repas (nom, couleur) VALUES (?, ?)",
+        [
+            ("Petit-déjeuner", "#f1c40f"),
+            ("Plat", "#e74c3c"),
+            ("Dessert", "#9b59b6"),
+            ("Collation", "#2ecc71"),
+        ],
+    )
+    for i in range(nb_recettes):
+        cursor.execute(
+            "INSERT INTO repas_types (nom, description, categorie_id) VALUES (?, ?, ?)",
+            (f"Recette {i}", f"Description {i}", rng.choice([1, 2, 3, 4, None])),
+        )
+        repas_type_id = cursor.lastrowid
+        cursor.executemany(
+            """
+            INSERT INTO repas_types_aliments (repas_type_id, aliment_id, quantite)
+            VALUES (?, ?, ?)
+            """,
+            [
+                (repas_type_id, aliment_id, rng.uniform(20, 300))
+                for aliment_id in rng.sample(range(1, nb_aliments + 1), 8)
+            ],
+        )
+
+    conn.commit()
+    conn.close()
+
+
+def mesurer(nom, fonction, repetitions):
+    """Exécute la fonction plusieurs fois et affiche le temps moyen en millisecondes"""
+    fonction()  # Échauffement (caches SQLite et Python)
+    debut = time.perf_counter()
+    for _ in range(repetitions):
+        fonction()
+    moyenne = (time.perf_counter() - debut) / repetitions * 1000
+    print(f"{nom:<45} {moyenne:>10.2f} ms  ({repetitions} exécutions)")
+    return moyenne
+
+
+def mesurer_operations(db_manager):
+    """Mesure les lectures et écritures les plus coûteuses sur la base peuplée"""
+    mesurer(
+        "get_repas_semaine (1 semaine)",
+        lambda: db_manager.get_repas_semaine(26),
+        200,
+    )
+    mesurer(
+        "generer_liste_courses (1 semaine)",
+        lambda: db_manager.generer_liste_courses(26),
+        20,
+    )
+    mesurer(
+        "generer_liste_courses (toutes les semaines)",
+        lambda: db_manager.generer_liste_courses(None),
+        3,
+    )
+    mesurer(
+        "get_aliments (recherche texte)",
+        lambda: db_manager.get_aliments(recherche="marque 1"),
+        50,
+    )
+    positions = iter(range(1, 1000000))
+    mesurer(
+        "changer_jour_repas (glisser-déposer)",
+        lambda: db_manager.changer_jour_repas(1, "Lundi", next(positions) % 7 + 1),
+        50,
+    )
+    semaines_copiees = iter(range(1000, 100000))
+    mesurer(
+        "dupliquer_semaine (semaine complète)",
+        lambda: db_manager.dupliquer_semaine(26, next(semaines_copiees)),
+        20,
+    )
+    mesurer(
+        "get_aliments_composes (200 composés)",
+        db_manager.get_aliments_composes,
+        20,
+    )
+    mesurer(
+        "get_aliments_composes_resume (200 composés)",
+        db_manager.get_aliments_composes_resume,
+        20,
+    )
+    mesurer(
+        "get_repas_types_filtres (500 recettes)",
+        lambda: db_manager.get_repas_types_filtres(None, "Recette"),
+        20,
+    )
+    mesurer(
+        "modifier_nom_repas (1 commit)",
+        lambda: db_manager.modifier_nom_repas(1, "Repas 1"),
+        50,
+    )
+
+
+# Requêtes représentatives dont on affiche le plan d'exécution
+REQUETES_PLANS = {
+    "Repas d'une semaine": (
+        "SELECT id, nom, jour, ordre FROM repas WHERE semaine_id = ? ORDER BY jour, ordre",
+        (26,),
+    ),
+    "Repas d'un jour": (
+        "SELECT id, ordre FROM repas WHERE jour = ? AND semaine_id = ? ORDER BY ordre",
+        ("Lundi", 26),
+    ),
+    "Aliments d'un repas": (
+        """
+        SELECT ra.quantite, a.* FROM repas_aliments ra
+        JOIN aliments a ON ra.aliment_id = a.id
+        WHERE ra.repas_id = ?
+        """,
+        (1,),
+    ),
+    "Repas basés sur une recette": (
+        "SELECT id FROM repas WHERE repas_type_id = ?",
+        (1,),
+    ),
+    "États de la liste de courses": (
+        "SELECT aliment_id, checked FROM courses_etat WHERE semaine_id = ?",
+        ("26",),
+    ),
+}
+
+
+def afficher_plans(db_manager):
+    """Affiche le plan d'exécution SQLite des requêtes représentatives"""
+    for nom, (requete, params) in REQUETES_PLANS.items():
+        print(f"{nom}:")
+        for etape in db_manager.expliquer_requete(requete, params):
+            print(f"    {etape}")
+
+
+def main():
+    """Mesure les opérations de base de données les plus coûteuses sur une grande base"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "benchmark.db")
+
+        db_manager = DatabaseManager(db_path)
+        db_manager.init_db()
+
+        print(
+            "Création de la base de test (52 semaines x 7 jours x 6 repas, "
+            "200 aliments composés)..."
+        )
+        peupler_base(db_path)
+
+        print("\nMigrations appliquées:")
+        for migration in db_manager.get_historique_migrations():
+            print(
+                f"    v{migration['version']} {migration['description']} "
+                f"({migration['duree_ms']:.1f} ms)"
+            )
+
+        print("\nPlans d'exécution:")
+        afficher_plans(db_manager)
+
+        # Comparer les profils SQLite sur les mêmes opérations
+        for nom_profil in PROFILS_PRAGMA:
+            db_manager.force_close_all_connections()
+            db_manager.set_profil_pragma(nom_profil)
+            print(f"\nProfil SQLite: {nom_profil}")
+            mesurer_operations(db_manager)
+
+        db_manager.shutdown()
+
+
+if __name__ == "__main__":
+    main()
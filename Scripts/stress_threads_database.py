@@ -0,0 +1,208 @@
+import os
+import sys
+import time
+import random
+import sqlite3
+import tempfile
+import threading
+
+# Ajouter le chemin parent au path pour importer les modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.db_manager import DatabaseManager  # noqa: E402
+from benchmark_database import peupler_base, JOURS  # noqa: E402
+
+NB_LECTEURS = 4
+NB_ECRIVAINS = 4
+NB_SEMAINES = 8
+DUREE_PAR_DEFAUT = 5.0  # Durée de l'essai en secondes
+SEMAINE_ECRIVAIN = 100  # Chaque écrivain travaille sur sa propre semaine (100 + n)
+
+
+class Compteurs:
+    """Opérations réalisées et erreurs relevées, partagées par les threads"""
+
+    def __init__(self):
+        self.verrou = threading.Lock()
+        self.operations = {}
+        self.erreurs = []
+
+    def operation(self, nom):
+        with self.verrou:
+            self.operations[nom] = self.operations.get(nom, 0) + 1
+
+    def erreur(self, message):
+        with self.verrou:
+            self.erreurs.append(message)
+
+
+def lecteur(db_manager, arret, compteurs, graine):
+    """Lit les semaines, la liste de courses et les aliments en boucle"""
+    rng = random.Random(graine)
+    while not arret.is_set():
+        semaine_id = rng.randint(1, NB_SEMAINES)
+        try:
+            repas_semaine = db_manager.get_repas_semaine(semaine_id)
+            if not any(repas_semaine[jour] for jour in JOURS):
+                compteurs.erreur(f"get_repas_semaine({semaine_id}) vide")
+            compteurs.operation("get_repas_semaine")
+
+            if not db_manager.generer_liste_courses(semaine_id):
+                compteurs.erreur(f"generer_liste_courses({semaine_id}) vide")
+            compteurs.operation("generer_liste_courses")
+
+            if not db_manager.get_aliments(recherche="Aliment 1"):
+                compteurs.erreur("get_aliments sans résultat")
+            compteurs.operation("get_aliments")
+        except Exception as e:  # pylint: disable=broad-except
+            compteurs.erreur(f"lecture: {type(e).__name__}: {e}")
+
+
+def ecrivain(db_manager, numero, arret, compteurs, attendus):
+    """Crée, déplace et supprime des repas dans la semaine de l'écrivain
+
+    Les repas restants sont notés dans attendus pour la vérification finale.
+    """
+    rng = random.Random(numero)
+    semaine_id = SEMAINE_ECRIVAIN + numero
+    iteration = 0
+    while not arret.is_set():
+        iteration += 1
+        try:
+            if iteration % 5 == 0:
+                # Unité de travail : le lot ne doit regrouper que les appels de ce thread
+                with db_manager.batch() as lot:
+                    repas_id = db_manager.ajouter_repas(
+                        f"Lot {iteration}", rng.choice(JOURS), 1, semaine_id
+                    )
+                    for aliment_id in rng.sample(range(1, 101), 3):
+                        db_manager.ajouter_aliment_repas(repas_id, aliment_id, 100)
+                if not lot.reussi:
+                    compteurs.erreur(f"lot annulé (écrivain {numero})")
+                    continue
+                compteurs.operation("batch")
+            else:
+                repas_id = db_manager.ajouter_repas(
+                    f"Repas {iteration}", rng.choice(JOURS), 1, semaine_id
+                )
+                for aliment_id in rng.sample(range(1, 101), 3):
+                    if not db_manager.ajouter_aliment_repas(repas_id, aliment_id, 100):
+                        compteurs.erreur(f"ajouter_aliment_repas (écrivain {numero})")
+                compteurs.operation("ajouter_repas")
+            attendus.add(repas_id)
+
+            if not db_manager.set_repas_multiplicateur(repas_id, 2):
+                compteurs.erreur(f"set_repas_multiplicateur (écrivain {numero})")
+            compteurs.operation("set_repas_multiplicateur")
+
+            if not db_manager.changer_jour_repas(repas_id, rng.choice(JOURS), 1):
+                compteurs.erreur(f"changer_jour_repas (écrivain {numero})")
+            compteurs.operation("changer_jour_repas")
+
+            if iteration % 3 == 0:
+                repas_supprime = rng.choice(sorted(attendus))
+                db_manager.supprimer_repas(repas_supprime)
+                attendus.discard(repas_supprime)
+                compteurs.operation("supprimer_repas")
+        except Exception as e:  # pylint: disable=broad-except
+            compteurs.erreur(f"écriture (écrivain {numero}): {type(e).__name__}: {e}")
+
+
+def verifier_base(db_path, attendus_par_ecrivain, compteurs):
+    """Vérifie l'intégrité de la base et le résultat des écritures de chaque thread"""
+    conn = sqlite3.connect(db_path)
+    try:
+        resultat = conn.execute("PRAGMA integrity_check").fetchone()[0]
+        if resultat != "ok":
+            compteurs.erreur(f"integrity_check: {resultat}")
+        if conn.execute("PRAGMA foreign_key_check").fetchall():
+            compteurs.erreur("foreign_key_check: références orphelines")
+
+        for numero, attendus in attendus_par_ecrivain.items():
+            semaine_id = SEMAINE_ECRIVAIN + numero
+            presents = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT id FROM repas WHERE semaine_id = ?", (semaine_id,)
+                )
+            }
+            if presents != attendus:
+                compteurs.erreur(
+                    f"semaine {semaine_id}: {len(presents)} repas au lieu de {len(attendus)}"
+                )
+            incomplets = conn.execute(
+                """
+                SELECT COUNT(*) FROM repas r
+                WHERE r.semaine_id = ?
+                  AND (SELECT COUNT(*) FROM repas_aliments ra WHERE ra.repas_id = r.id) != 3
+                """,
+                (semaine_id,),
+            ).fetchone()[0]
+            if incomplets:
+                compteurs.erreur(f"semaine {semaine_id}: {incomplets} repas incomplets")
+    finally:
+        conn.close()
+
+
+def main():
+    """Sollicite les gestionnaires depuis plusieurs threads et vérifie la base
+
+    Usage: python Scripts/stress_threads_database.py [durée en s] [profil SQLite]
+    """
+    duree = float(sys.argv[1]) if len(sys.argv) > 1 else DUREE_PAR_DEFAUT
+    nom_profil = sys.argv[2] if len(sys.argv) > 2 else None
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "stress.db")
+
+        db_manager = DatabaseManager(db_path)
+        db_manager.init_db()
+        peupler_base(db_path, nb_aliments=100, nb_semaines=NB_SEMAINES)
+        if nom_profil:
+            db_manager.set_profil_pragma(nom_profil)
+
+        print(
+            f"Profil SQLite: {db_manager.get_profil_pragma()} - "
+            f"{NB_LECTEURS} lecteurs, {NB_ECRIVAINS} écrivains pendant {duree:.0f} s"
+        )
+
+        arret = threading.Event()
+        compteurs = Compteurs()
+        attendus_par_ecrivain = {numero: set() for numero in range(NB_ECRIVAINS)}
+        threads = [
+            threading.Thread(
+                target=lecteur, args=(db_manager, arret, compteurs, numero)
+            )
+            for numero in range(NB_LECTEURS)
+        ] + [
+            threading.Thread(
+                target=ecrivain,
+                args=(db_manager, numero, arret, compteurs, attendus),
+            )
+            for numero, attendus in attendus_par_ecrivain.items()
+        ]
+
+        for thread in threads:
+            thread.start()
+        time.sleep(duree)
+        arret.set()
+        for thread in threads:
+            thread.join()
+
+        db_manager.shutdown()
+        verifier_base(db_path, attendus_par_ecrivain, compteurs)
+
+    print("\nOpérations réalisées:")
+    for nom, nombre in sorted(compteurs.operations.items()):
+        print(f"    {nom:<30} {nombre:>8}")
+
+    if compteurs.erreurs:
+        print(f"\n{len(compteurs.erreurs)} erreur(s):")
+        for message in compteurs.erreurs[:20]:
+            print(f"    {message}")
+        sys.exit(1)
+    print("\nAucune erreur : chaque thread a utilisé sa propre connexion.")
+
+
+if __name__ == "__main__":
+    main()
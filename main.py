@@ -1,11 +1,16 @@
 import sys
 import os
+
+# Importé en premier pour mesurer les imports suivants (si le profil est activé)
+from src.profil_demarrage import PROFIL_DEMARRAGE
+
 from PySide6.QtWidgets import QApplication, QMessageBox
 from PySide6.QtCore import QTimer
 from src.utils.updater import UpdateManager
 from src.utils.app_info import APP_VERSION
 from src.ui.main_window import MainWindow
 from src.database.db_manager import DatabaseManager
+from src.utils.db_executor import DB_EXECUTOR
 from src.utils.theme_manager import ThemeManager
 from src.ui.dialogs.update_dialog import UpdateDialog, UpdateReadyDialog
 from src.utils.ui_helpers import (
@@ -14,6 +19,8 @@ from src.utils.ui_helpers import (
     apply_auto_select_to_widget,
 )
 
+PROFIL_DEMARRAGE.ajouter_phase("Imports des modules", PROFIL_DEMARRAGE.debut)
+
 
 def resource_path(relative_path):
     """Obtient le chemin absolu vers une ressource, compatible dev/PyInstaller"""
@@ -27,7 +34,8 @@ def resource_path(relative_path):
 
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    with PROFIL_DEMARRAGE.phase("Création de QApplication"):
+        app = QApplication(sys.argv)
 
     try:
         # Initialiser le gestionnaire de curseurs pour les boutons
@@ -38,8 +46,9 @@ if __name__ == "__main__":
 
         # Initialiser la base de données avec gestion d'erreur
         print("Initialisation de la base de données...")
-        db_manager = DatabaseManager()
-        db_manager.init_db()
+        with PROFIL_DEMARRAGE.phase("Base de données (init_db)"):
+            db_manager = DatabaseManager()
+            db_manager.init_db()
 
         # Initialiser le gestionnaire de thèmes
         theme_manager = ThemeManager(db_manager)
@@ -54,18 +63,19 @@ if __name__ == "__main__":
             app.setStyleSheet(qss)
 
         # Appliquer le thème initial en utilisant le thème stocké en base de données
-        try:
-            INITIAL_THEME = theme_manager.get_current_theme()
-            if not INITIAL_THEME:
-                INITIAL_THEME = "Vert Nature"  # Thème par défaut
-            apply_theme(INITIAL_THEME)
-        except (
-            FileNotFoundError,
-            ValueError,
-            RuntimeError,
-        ) as e:
-            print(f"Erreur lors de l'application du thème initial: {e}")
-            apply_theme("Vert Nature")  # Fallback au thème par défaut
+        with PROFIL_DEMARRAGE.phase("Thème (generate_stylesheet)"):
+            try:
+                INITIAL_THEME = theme_manager.get_current_theme()
+                if not INITIAL_THEME:
+                    INITIAL_THEME = "Vert Nature"  # Thème par défaut
+                apply_theme(INITIAL_THEME)
+            except (
+                FileNotFoundError,
+                ValueError,
+                RuntimeError,
+            ) as e:
+                print(f"Erreur lors de l'application du thème initial: {e}")
+                apply_theme("Vert Nature")  # Fallback au thème par défaut
 
         # Initialiser le gestionnaire de mises à jour
         update_manager = UpdateManager(app_version=APP_VERSION)
@@ -120,22 +130,49 @@ if __name__ == "__main__":
         )
 
         # Créer et afficher la fenêtre principale
-        window = MainWindow(db_manager)
+        with PROFIL_DEMARRAGE.phase("Fenêtre principale (MainWindow)"):
+            window = MainWindow(db_manager)
 
-        # Connecter le signal de changement de thème à notre fonction
-        window.options_tab.theme_changed.connect(apply_theme)
+        # Les onglets sont construits à leur première ouverture
+        def on_onglet_construit(attribut, onglet):
+            # Appliquer la sélection automatique aux champs de saisie de l'onglet
+            apply_auto_select_to_widget(onglet)
 
-        # Appliquer la sélection automatique à tous les champs de saisie
-        apply_auto_select_to_widget(window)
+            if attribut == "options_tab":
+                # Connecter le signal de changement de thème à notre fonction
+                onglet.theme_changed.connect(apply_theme)
+                # Mettre à jour l'onglet Options pour utiliser le gestionnaire de mises à jour
+                onglet.set_update_manager(update_manager)
 
-        # Mettre à jour l'onglet Options pour utiliser le gestionnaire de mises à jour
-        window.options_tab.set_update_manager(update_manager)
+        window.onglet_construit.connect(on_onglet_construit)
+
+        # Appliquer la sélection automatique aux onglets déjà construits
+        with PROFIL_DEMARRAGE.phase("Sélection automatique (apply_auto_select)"):
+            apply_auto_select_to_widget(window)
 
         # Vérifier les mises à jour au démarrage (silencieusement) après un court délai
         QTimer.singleShot(3000, update_manager.check_for_updates)
 
+        # Terminer les requêtes en arrière-plan, puis optimiser et fermer
+        # proprement la base de données à la fermeture
+        app.aboutToQuit.connect(DB_EXECUTOR.attendre)
+        app.aboutToQuit.connect(db_manager.shutdown)
+
+        debut_affichage = PROFIL_DEMARRAGE.maintenant()
         window.show()
 
+        # Le démarrage se termine à la première itération de la boucle d'événements
+        if PROFIL_DEMARRAGE.actif:
+
+            def fin_demarrage():
+                PROFIL_DEMARRAGE.ajouter_phase("Premier affichage", debut_affichage)
+                PROFIL_DEMARRAGE.ajouter_onglets(window.temps_onglets)
+                PROFIL_DEMARRAGE.terminer(
+                    os.path.dirname(db_manager.db_file), APP_VERSION
+                )
+
+            QTimer.singleShot(0, fin_demarrage)
+
         sys.exit(app.exec())
     except (FileNotFoundError, ValueError, RuntimeError) as e:
         print(f"Erreur critique au démarrage de l'application: {e}")
@@ -1,6 +1,7 @@
 import unicodedata
 import sqlite3
 from .db_connector import DBConnector
+from .db_aliments_composes import actualiser_aplatissement
 
 
 class AlimentsManager(DBConnector):
@@ -67,7 +68,7 @@ class AlimentsManager(DBConnector):
 
         try:
             # Début d'une transaction explicite
-            self.cursor.execute("BEGIN TRANSACTION")
+            self.cursor.execute("BEGIN IMMEDIATE TRANSACTION")
 
             # Afficher des informations pour déboguer le problème
             print(f"Tentative de suppression de l'aliment avec ID: {aliment_id}")
@@ -120,10 +121,23 @@ class AlimentsManager(DBConnector):
                     (aliment_id,),
                 )
 
+            # Aliments composés qui l'utilisent : leurs ingrédients sont supprimés en cascade
+            self.cursor.execute(
+                """
+                SELECT DISTINCT aliment_compose_id FROM aliments_composes_ingredients
+                WHERE aliment_id = ?
+                """,
+                (aliment_id,),
+            )
+            aliments_composes = [row[0] for row in self.cursor.fetchall()]
+
             # Finalement, supprimer l'aliment lui-même
             print(f"Suppression de l'aliment {aliment_id}")
             self.cursor.execute("DELETE FROM aliments WHERE id = ?", (aliment_id,))
 
+            # Recalculer ces aliments composés et ceux qui les contiennent
+            actualiser_aplatissement(self.cursor, aliments_composes)
+
             # Vérifier que l'aliment a bien été supprimé
             self.cursor.execute("SELECT id FROM aliments WHERE id = ?", (aliment_id,))
             if self.cursor.fetchone():
@@ -157,23 +171,39 @@ class AlimentsManager(DBConnector):
         sort_column=None,
         sort_order=None,
     ):
-        """Récupère tous les aliments avec options de filtrage et de tri"""
+        """Récupère tous les aliments avec options de filtrage et de tri
+
+        La recherche texte utilise l'index plein texte aliments_fts (préfixe de
+        chaque mot, sans accents ni casse) sur le nom, la marque, le magasin et
+        la catégorie. Sans tri demandé, les résultats sont classés par pertinence.
+        """
         self.connect()
-        query = "SELECT * FROM aliments"
+        query = "SELECT a.* FROM aliments a"
         params = []
         conditions = []
+        tri_pertinence = False
+
+        # Recherche texte via l'index plein texte, si SQLite le permet
+        recherche_fts = recherche and self.recherche_plein_texte_disponible()
+        if recherche_fts:
+            requete_fts = self.construire_requete_fts(recherche)
+            if requete_fts:
+                query += " JOIN aliments_fts ON aliments_fts.rowid = a.id"
+                conditions.append("aliments_fts MATCH ?")
+                params.append(requete_fts)
+                tri_pertinence = True
 
         # Collecter les conditions de filtrage standard
         if categorie:
-            conditions.append("categorie = ?")
+            conditions.append("a.categorie = ?")
             params.append(categorie)
 
         if marque:
-            conditions.append("marque = ?")
+            conditions.append("a.marque = ?")
             params.append(marque)
 
         if magasin:
-            conditions.append("magasin = ?")
+            conditions.append("a.magasin = ?")
             params.append(magasin)
 
         # Récupérer tous les aliments avec les filtres exacts
@@ -191,16 +221,19 @@ class AlimentsManager(DBConnector):
                 "prix_kg",
             ]
             if sort_column in numeric_columns:
-                query += f' ORDER BY CAST({sort_column} AS REAL) {"ASC" if sort_order else "DESC"}'
+                query += f' ORDER BY CAST(a.{sort_column} AS REAL) {"ASC" if sort_order else "DESC"}'
             else:
-                query += f' ORDER BY {sort_column} COLLATE NOCASE {"ASC" if sort_order else "DESC"}'
+                query += f' ORDER BY a.{sort_column} COLLATE NOCASE {"ASC" if sort_order else "DESC"}'
+        elif tri_pertinence:
+            # Classement bm25, le nom pesant plus que la marque, le magasin et la catégorie
+            query += " ORDER BY bm25(aliments_fts, 10.0, 2.0, 1.0, 1.0)"
 
         # Exécuter la requête
         self.cursor.execute(query, params)
         results = [dict(row) for row in self.cursor.fetchall()]
 
-        # Filtrer par recherche texte en Python
-        if recherche:
+        # Sans index plein texte, filtrer par recherche texte en Python
+        if recherche and not recherche_fts:
             # Normaliser la recherche (supprimer accents et passer en minuscules)
             recherche_norm = self.normalize_text(recherche)
 
@@ -236,6 +269,25 @@ class AlimentsManager(DBConnector):
         self.disconnect()
         return results
 
+    def recherche_plein_texte_disponible(self):
+        """Indique si l'index plein texte aliments_fts existe dans la base"""
+        connexion_active = self.conn is not None
+        if not connexion_active:
+            self.connect()
+        try:
+            self.cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'aliments_fts'"
+            )
+            return self.cursor.fetchone() is not None
+        finally:
+            if not connexion_active:
+                self.disconnect()
+
+    def construire_requete_fts(self, recherche):
+        """Convertit une recherche libre en requête FTS5 : chaque mot est cherché en préfixe"""
+        termes = recherche.split()
+        return " ".join('"' + terme.replace('"', '""') + '"*' for terme in termes)
+
     def normalize_text(self, text):
         """Normalise le texte en enlevant les accents et en convertissant en minuscules"""
         if not text:
@@ -1,6 +1,176 @@
 import sqlite3
-import traceback
 from .db_connector import DBConnector
+from .db_migrations import requete_totaux_aplatis
+
+# Colonnes d'un ingrédient retournées avec un aliment composé
+COLONNES_INGREDIENT = (
+    "aliment_id",
+    "quantite",
+    "nom",
+    "calories",
+    "proteines",
+    "glucides",
+    "lipides",
+    "fibres",
+    "prix_kg",
+    "sous_compose_id",
+)
+
+# Valeurs nutritionnelles et coût d'un aliment composé, pour 100 g, tenus à jour
+# dans la table aliments_composes_totaux
+TOTAUX_NUTRITIONNELS = (
+    "total_calories",
+    "total_proteines",
+    "total_glucides",
+    "total_lipides",
+    "total_fibres",
+    "total_cout",
+)
+
+# Totaux lus dans aliments_composes_totaux (alias t), nuls si la ligne manque
+COLONNES_TOTAUX = ", ".join(
+    f"COALESCE(t.{total}, 0) AS {total}" for total in TOTAUX_NUTRITIONNELS
+)
+
+
+def _marqueurs(valeurs):
+    """Retourne les marqueurs ?, ?, ... d'une liste IN"""
+    return ", ".join("?" for _ in valeurs)
+
+
+def _composes_et_parents(cursor, aliment_compose_ids):
+    """Retourne les aliments composés donnés et tous ceux qui les contiennent"""
+    aliment_compose_ids = list(aliment_compose_ids)
+    if not aliment_compose_ids:
+        return set()
+    cursor.execute(
+        f"""
+        WITH RECURSIVE concernes (id) AS (
+            SELECT id FROM aliments_composes
+            WHERE id IN ({_marqueurs(aliment_compose_ids)})
+            UNION
+            SELECT aci.aliment_compose_id
+            FROM aliments_composes_ingredients aci
+            JOIN concernes c ON aci.sous_compose_id = c.id
+        )
+        SELECT id FROM concernes
+        """,
+        aliment_compose_ids,
+    )
+    return {row[0] for row in cursor.fetchall()}
+
+
+def actualiser_aplatissement(cursor, aliment_compose_ids):
+    """
+    Recalcule l'aplatissement et les totaux des aliments composés donnés et de
+    tous ceux qui les contiennent, directement ou non.
+
+    Chaque aliment composé est développé en aliments de base une seule fois
+    (mémoïsation sur le graphe) ; les sous-composés qui ne sont pas concernés
+    sont lus dans le cache aliments_composes_aplatis.
+
+    Raises:
+        sqlite3.IntegrityError: Si les aliments composés forment un cycle
+    """
+    concernes = _composes_et_parents(cursor, aliment_compose_ids)
+    if not concernes:
+        return
+    concernes = sorted(concernes)
+    marqueurs = _marqueurs(concernes)
+
+    # Ingrédients directs des aliments concernés
+    cursor.execute(
+        f"""
+        SELECT aci.aliment_compose_id, aci.aliment_id, aci.sous_compose_id, aci.quantite
+        FROM aliments_composes_ingredients aci
+        LEFT JOIN aliments a ON a.id = aci.aliment_id
+        WHERE aci.aliment_compose_id IN ({marqueurs})
+          AND (aci.sous_compose_id IS NOT NULL OR a.id IS NOT NULL)
+        ORDER BY aci.id
+        """,
+        concernes,
+    )
+    composition = {aliment_compose_id: [] for aliment_compose_id in concernes}
+    for aliment_compose_id, aliment_id, sous_compose_id, quantite in cursor.fetchall():
+        composition[aliment_compose_id].append(
+            (aliment_id, sous_compose_id, quantite or 0)
+        )
+
+    # Aplatissements déjà à jour des sous-composés non concernés
+    aplatis = {}
+    en_cache = {
+        sous_compose_id
+        for ingredients in composition.values()
+        for _, sous_compose_id, _ in ingredients
+        if sous_compose_id is not None and sous_compose_id not in composition
+    }
+    if en_cache:
+        en_cache = sorted(en_cache)
+        for sous_compose_id in en_cache:
+            aplatis[sous_compose_id] = {}
+        cursor.execute(
+            f"""
+            SELECT aliment_compose_id, aliment_id, quantite
+            FROM aliments_composes_aplatis
+            WHERE aliment_compose_id IN ({_marqueurs(en_cache)})
+            ORDER BY aliment_compose_id, rang
+            """,
+            en_cache,
+        )
+        for sous_compose_id, aliment_id, quantite in cursor.fetchall():
+            aplatis[sous_compose_id][aliment_id] = quantite
+
+    en_cours = set()
+
+    def aplatir(aliment_compose_id):
+        """Quantité de chaque aliment de base dans la recette de l'aliment composé"""
+        if aliment_compose_id in aplatis:
+            return aplatis[aliment_compose_id]
+        if aliment_compose_id in en_cours:
+            raise sqlite3.IntegrityError(
+                f"Cycle dans les aliments composés (aliment composé {aliment_compose_id})"
+            )
+        en_cours.add(aliment_compose_id)
+
+        quantites = {}
+        for aliment_id, sous_compose_id, quantite in composition[aliment_compose_id]:
+            if sous_compose_id is None:
+                quantites[aliment_id] = quantites.get(aliment_id, 0) + quantite
+                continue
+
+            # Un sous-composé apporte ses aliments de base au prorata de sa quantité
+            sous_quantites = aplatir(sous_compose_id)
+            poids_sous_compose = sum(sous_quantites.values())
+            if not poids_sous_compose:
+                continue
+            facteur = quantite / poids_sous_compose
+            for sous_aliment_id, sous_quantite in sous_quantites.items():
+                quantites[sous_aliment_id] = (
+                    quantites.get(sous_aliment_id, 0) + sous_quantite * facteur
+                )
+
+        en_cours.discard(aliment_compose_id)
+        aplatis[aliment_compose_id] = quantites
+        return quantites
+
+    cursor.execute(
+        f"DELETE FROM aliments_composes_aplatis WHERE aliment_compose_id IN ({marqueurs})",
+        concernes,
+    )
+    cursor.executemany(
+        """
+        INSERT INTO aliments_composes_aplatis (aliment_compose_id, aliment_id, quantite, rang)
+        VALUES (?, ?, ?, ?)
+        """,
+        [
+            (aliment_compose_id, aliment_id, quantite, rang)
+            for aliment_compose_id in concernes
+            for rang, (aliment_id, quantite) in enumerate(
+                aplatir(aliment_compose_id).items()
+            )
+        ],
+    )
+    cursor.execute(requete_totaux_aplatis(f"ac.id IN ({marqueurs})"), concernes)
 
 
 class AlimentsComposesManager(DBConnector):
@@ -38,6 +208,7 @@ class AlimentsComposesManager(DBConnector):
                 """,
                 (aliment_compose_id, aliment_id, quantite),
             )
+            actualiser_aplatissement(self.cursor, [aliment_compose_id])
             self.conn.commit()
             return True
         except sqlite3.Error as e:
@@ -58,6 +229,7 @@ class AlimentsComposesManager(DBConnector):
                 """,
                 (aliment_compose_id, aliment_id),
             )
+            actualiser_aplatissement(self.cursor, [aliment_compose_id])
             self.conn.commit()
             return True
         except sqlite3.Error as e:
@@ -67,35 +239,183 @@ class AlimentsComposesManager(DBConnector):
         finally:
             self.disconnect()
 
-    def get_aliments_composes(self, categorie=None):
-        """Récupère tous les aliments composés, éventuellement filtrés par catégorie"""
+    def ajouter_sous_compose_aliment_compose(
+        self, aliment_compose_id, sous_compose_id, quantite
+    ):
+        """Ajoute un aliment composé comme ingrédient d'un autre aliment composé
+
+        Returns:
+            bool: False si l'ajout créerait un cycle (l'aliment composé se
+            contiendrait lui-même) ou en cas d'erreur
+        """
         self.connect()
         try:
-            if categorie:
-                self.cursor.execute(
-                    """
-                    SELECT * FROM aliments_composes WHERE categorie = ?
-                    """,
-                    (categorie,),
+            self.cursor.execute("BEGIN IMMEDIATE TRANSACTION")
+
+            # Cycle si le sous-composé est l'aliment composé ou l'un de ceux qui le contiennent
+            if sous_compose_id in _composes_et_parents(self.cursor, [aliment_compose_id]):
+                print(
+                    f"Impossible d'ajouter l'aliment composé {sous_compose_id} "
+                    f"à l'aliment composé {aliment_compose_id}: cycle"
                 )
-            else:
-                self.cursor.execute("SELECT * FROM aliments_composes")
+                self.conn.rollback()
+                return False
 
-            aliments_composes = []
-            for row in self.cursor.fetchall():
-                aliment_compose = dict(row)
-                # Ajouter les ingrédients
-                aliment_compose["ingredients"] = self.get_ingredients_aliment_compose(
-                    aliment_compose["id"]
+            self.cursor.execute(
+                """
+                INSERT INTO aliments_composes_ingredients (aliment_compose_id, sous_compose_id, quantite)
+                VALUES (?, ?, ?)
+                """,
+                (aliment_compose_id, sous_compose_id, quantite),
+            )
+            actualiser_aplatissement(self.cursor, [aliment_compose_id])
+            self.conn.commit()
+            return True
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            print(f"Erreur lors de l'ajout du sous-composé: {e}")
+            return False
+        finally:
+            self.disconnect()
+
+    def supprimer_sous_compose_aliment_compose(self, aliment_compose_id, sous_compose_id):
+        """Retire un aliment composé des ingrédients d'un autre aliment composé"""
+        self.connect()
+        try:
+            self.cursor.execute(
+                """
+                DELETE FROM aliments_composes_ingredients
+                WHERE aliment_compose_id = ? AND sous_compose_id = ?
+                """,
+                (aliment_compose_id, sous_compose_id),
+            )
+            actualiser_aplatissement(self.cursor, [aliment_compose_id])
+            self.conn.commit()
+            return True
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            print(f"Erreur lors de la suppression du sous-composé: {e}")
+            return False
+        finally:
+            self.disconnect()
+
+    def _charger_aliments_composes(self, filtre="", parametres=()):
+        """
+        Charge des aliments composés avec leurs ingrédients et leurs valeurs pour 100 g
+        en une seule requête.
+
+        Les valeurs pour 100 g sont lues dans aliments_composes_totaux ; les lignes
+        des ingrédients sont regroupées en mémoire. Un sous-composé figure parmi les
+        ingrédients avec son sous_compose_id (aliment_id à None), ses valeurs pour
+        100 g et son prix au kg.
+
+        Args:
+            filtre: Condition SQL sur les colonnes de aliments_composes (alias ac)
+            parametres: Paramètres de la condition
+
+        Returns:
+            list: Les aliments composés, dans l'ordre de leur identifiant
+        """
+        where = f"WHERE {filtre}" if filtre else ""
+        self.cursor.execute(
+            f"""
+            SELECT ac.*,
+                   aci.aliment_id AS ingredient_aliment_id,
+                   aci.quantite AS ingredient_quantite,
+                   COALESCE(a.nom, sc.nom) AS ingredient_nom,
+                   COALESCE(a.calories, st.total_calories) AS ingredient_calories,
+                   COALESCE(a.proteines, st.total_proteines) AS ingredient_proteines,
+                   COALESCE(a.glucides, st.total_glucides) AS ingredient_glucides,
+                   COALESCE(a.lipides, st.total_lipides) AS ingredient_lipides,
+                   COALESCE(a.fibres, st.total_fibres) AS ingredient_fibres,
+                   COALESCE(a.prix_kg, st.total_cout * 10.0) AS ingredient_prix_kg,
+                   aci.sous_compose_id AS ingredient_sous_compose_id,
+                   {COLONNES_TOTAUX}
+            FROM aliments_composes ac
+            LEFT JOIN aliments_composes_totaux t ON t.aliment_compose_id = ac.id
+            LEFT JOIN aliments_composes_ingredients aci ON aci.aliment_compose_id = ac.id
+            LEFT JOIN aliments a ON a.id = aci.aliment_id
+            LEFT JOIN aliments_composes sc ON sc.id = aci.sous_compose_id
+            LEFT JOIN aliments_composes_totaux st ON st.aliment_compose_id = aci.sous_compose_id
+            {where}
+            ORDER BY ac.id, aci.id
+            """,
+            parametres,
+        )
+
+        # Colonnes de aliments_composes (ac.*), puis celles de l'ingrédient et les totaux
+        nb_colonnes_compose = len(self.cursor.description) - len(
+            COLONNES_INGREDIENT
+        ) - len(TOTAUX_NUTRITIONNELS)
+        colonnes_compose = [
+            colonne[0] for colonne in self.cursor.description[:nb_colonnes_compose]
+        ]
+        fin_ingredient = nb_colonnes_compose + len(COLONNES_INGREDIENT)
+
+        aliments_composes = {}
+        for row in self.cursor.fetchall():
+            aliment_compose = aliments_composes.get(row["id"])
+            if aliment_compose is None:
+                aliment_compose = dict(
+                    zip(colonnes_compose, row[:nb_colonnes_compose])
                 )
-                # Calculer les valeurs nutritionnelles totales
-                totals = self.calculer_valeurs_nutritionnelles_aliment_compose(
-                    aliment_compose["id"]
+                aliment_compose["ingredients"] = []
+                aliment_compose.update(
+                    zip(TOTAUX_NUTRITIONNELS, row[fin_ingredient:])
                 )
-                aliment_compose.update(totals)
-                aliments_composes.append(aliment_compose)
+                aliments_composes[row["id"]] = aliment_compose
+
+            # Ingrédient dont l'aliment a été supprimé, ou aliment composé sans ingrédient
+            if row["ingredient_nom"] is not None:
+                aliment_compose["ingredients"].append(
+                    dict(
+                        zip(
+                            COLONNES_INGREDIENT,
+                            row[nb_colonnes_compose:fin_ingredient],
+                        )
+                    )
+                )
+
+        return list(aliments_composes.values())
 
-            return aliments_composes
+    def get_aliments_composes_resume(self, categorie=None):
+        """
+        Récupère les aliments composés avec leurs valeurs pour 100 g, sans leurs
+        ingrédients (listes de sélection)
+
+        Returns:
+            list: Les aliments composés, avec nb_ingredients et poids_total
+        """
+        self.connect()
+        try:
+            where = "WHERE ac.categorie = ?" if categorie else ""
+            self.cursor.execute(
+                f"""
+                SELECT ac.*,
+                       COALESCE(t.nb_ingredients, 0) AS nb_ingredients,
+                       COALESCE(t.poids_total, 0) AS poids_total,
+                       {COLONNES_TOTAUX}
+                FROM aliments_composes ac
+                LEFT JOIN aliments_composes_totaux t ON t.aliment_compose_id = ac.id
+                {where}
+                ORDER BY ac.id
+                """,
+                (categorie,) if categorie else (),
+            )
+            return [dict(row) for row in self.cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la récupération des aliments composés: {e}")
+            return []
+        finally:
+            self.disconnect()
+
+    def get_aliments_composes(self, categorie=None):
+        """Récupère tous les aliments composés, éventuellement filtrés par catégorie"""
+        self.connect()
+        try:
+            if categorie:
+                return self._charger_aliments_composes("ac.categorie = ?", (categorie,))
+            return self._charger_aliments_composes()
         except sqlite3.Error as e:
             print(f"Erreur lors de la récupération des aliments composés: {e}")
             return []
@@ -106,28 +426,10 @@ class AlimentsComposesManager(DBConnector):
         """Récupère un aliment composé spécifique avec tous ses ingrédients"""
         self.connect()
         try:
-            self.cursor.execute(
-                """
-                SELECT * FROM aliments_composes WHERE id = ?
-                """,
-                (aliment_compose_id,),
-            )
-            row = self.cursor.fetchone()
-            if not row:
-                return None
-
-            aliment_compose = dict(row)
-            # Ajouter les ingrédients
-            aliment_compose["ingredients"] = self.get_ingredients_aliment_compose(
-                aliment_compose_id
+            aliments_composes = self._charger_aliments_composes(
+                "ac.id = ?", (aliment_compose_id,)
             )
-            # Calculer les valeurs nutritionnelles totales
-            totals = self.calculer_valeurs_nutritionnelles_aliment_compose(
-                aliment_compose_id
-            )
-            aliment_compose.update(totals)
-
-            return aliment_compose
+            return aliments_composes[0] if aliments_composes else None
         except sqlite3.Error as e:
             print(f"Erreur lors de la récupération de l'aliment composé: {e}")
             return None
@@ -145,6 +447,7 @@ class AlimentsComposesManager(DBConnector):
                 FROM aliments_composes_ingredients aci
                 JOIN aliments a ON aci.aliment_id = a.id
                 WHERE aci.aliment_compose_id = ?
+                ORDER BY aci.id
                 """,
                 (aliment_compose_id,),
             )
@@ -163,64 +466,10 @@ class AlimentsComposesManager(DBConnector):
 
     def calculer_valeurs_nutritionnelles_aliment_compose(self, aliment_compose_id):
         """Calcule les valeurs nutritionnelles totales d'un aliment composé normalisées pour 100g"""
-        ingredients = self.get_ingredients_aliment_compose(aliment_compose_id)
-
-        total_calories = 0
-        total_proteines = 0
-        total_glucides = 0
-        total_lipides = 0
-        total_fibres = 0
-        total_cout = 0
-
-        # Calculer le poids total des ingrédients
-        poids_total = sum(ingredient["quantite"] for ingredient in ingredients)
-
-        # Si le poids total est nul, éviter la division par zéro
-        if poids_total == 0:
-            return {
-                "total_calories": 0,
-                "total_proteines": 0,
-                "total_glucides": 0,
-                "total_lipides": 0,
-                "total_fibres": 0,
-                "total_cout": 0,
-            }
-
-        # Facteur de normalisation pour ramener à 100g
-        facteur_normalisation = 100.0 / poids_total
-
-        for ingredient in ingredients:
-            # Calculer les valeurs pour la quantité spécifiée
-            ratio = ingredient["quantite"] / 100.0
-            total_calories += ingredient["calories"] * ratio
-            total_proteines += ingredient["proteines"] * ratio
-            total_glucides += ingredient["glucides"] * ratio
-            total_lipides += ingredient["lipides"] * ratio
-
-            if "fibres" in ingredient and ingredient["fibres"]:
-                total_fibres += ingredient["fibres"] * ratio
-
-            if "prix_kg" in ingredient and ingredient["prix_kg"]:
-                total_cout += (ingredient["prix_kg"] / 1000) * ingredient["quantite"]
-
-        # Normaliser toutes les valeurs nutritionnelles pour 100g
-        total_calories *= facteur_normalisation
-        total_proteines *= facteur_normalisation
-        total_glucides *= facteur_normalisation
-        total_lipides *= facteur_normalisation
-        total_fibres *= facteur_normalisation
-
-        # Le coût est déjà calculé pour la quantité totale, on le normalise aussi
-        total_cout *= facteur_normalisation
-
-        return {
-            "total_calories": total_calories,
-            "total_proteines": total_proteines,
-            "total_glucides": total_glucides,
-            "total_lipides": total_lipides,
-            "total_fibres": total_fibres,
-            "total_cout": total_cout,
-        }
+        aliment_compose = self.get_aliment_compose(aliment_compose_id)
+        if not aliment_compose:
+            return {total: 0 for total in TOTAUX_NUTRITIONNELS}
+        return {total: aliment_compose[total] for total in TOTAUX_NUTRITIONNELS}
 
     def modifier_aliment_compose(
         self, aliment_compose_id, nom, description, categorie=None
@@ -249,6 +498,18 @@ class AlimentsComposesManager(DBConnector):
         """Supprime un aliment composé et tous ses ingrédients"""
         self.connect()
         try:
+            self.cursor.execute("BEGIN IMMEDIATE TRANSACTION")
+
+            # Aliments composés qui l'utilisent comme sous-composé, à recalculer
+            self.cursor.execute(
+                """
+                SELECT DISTINCT aliment_compose_id FROM aliments_composes_ingredients
+                WHERE sous_compose_id = ?
+                """,
+                (aliment_compose_id,),
+            )
+            parents = [row[0] for row in self.cursor.fetchall()]
+
             # Les ingrédients seront supprimés automatiquement grâce à ON DELETE CASCADE
             self.cursor.execute(
                 """
@@ -257,6 +518,7 @@ class AlimentsComposesManager(DBConnector):
                 """,
                 (aliment_compose_id,),
             )
+            actualiser_aplatissement(self.cursor, parents)
             self.conn.commit()
             return True
         except sqlite3.Error as e:
@@ -272,77 +534,59 @@ class AlimentsComposesManager(DBConnector):
         """Ajoute tous les ingrédients d'un aliment composé à un repas
         Cette méthode ajoute chaque ingrédient de l'aliment composé au repas
         en ajustant les quantités proportionnellement à la quantité totale demandée.
+        Les sous-composés sont développés en aliments de base (aplatissement en cache).
         """
+        self.connect()
         try:
-            # Récupérer l'aliment composé avec ses ingrédients
-            aliment_compose = self.get_aliment_compose(aliment_compose_id)
-            if not aliment_compose:
-                return False
+            self.cursor.execute("BEGIN IMMEDIATE TRANSACTION")
 
-            ingredients = aliment_compose.get("ingredients", [])
-            if not ingredients:
-                return False
+            # Aliments de base de la recette complète, sous-composés développés
+            self.cursor.execute(
+                """
+                SELECT aliment_id, quantite FROM aliments_composes_aplatis
+                WHERE aliment_compose_id = ?
+                ORDER BY rang
+                """,
+                (aliment_compose_id,),
+            )
+            ingredients = self.cursor.fetchall()
 
             # Calculer le poids total actuel de l'aliment composé (somme des ingrédients)
-            poids_total_actuel = sum(
-                ingredient["quantite"] for ingredient in ingredients
-            )
+            poids_total_actuel = sum(ingredient["quantite"] for ingredient in ingredients)
 
             if poids_total_actuel == 0:
-                return False  # Éviter la division par zéro
+                return False  # Aucun ingrédient, éviter la division par zéro
 
             # Facteur d'ajustement pour obtenir la quantité totale souhaitée
             facteur_ajustement = quantite_totale / poids_total_actuel
 
-            # Pour chaque ingrédient, calculer sa nouvelle quantité et l'ajouter au repas
-            for ingredient in ingredients:
-                nouvelle_quantite = ingredient["quantite"] * facteur_ajustement
-
-                # Ajouter cet ingrédient au repas
-                self.connect()
-                try:
-                    # Vérifier si l'aliment existe déjà dans ce repas
-                    self.cursor.execute(
-                        """
-                        SELECT id FROM repas_aliments 
-                        WHERE repas_id = ? AND aliment_id = ?
-                        """,
-                        (repas_id, ingredient["aliment_id"]),
+            # Un seul upsert pour tous les ingrédients : un aliment déjà présent dans
+            # le repas voit sa quantité augmenter
+            self.cursor.executemany(
+                """
+                INSERT INTO repas_aliments (repas_id, aliment_id, quantite)
+                VALUES (?, ?, ?)
+                ON CONFLICT (repas_id, aliment_id) DO UPDATE
+                SET quantite = quantite + excluded.quantite
+                """,
+                [
+                    (
+                        repas_id,
+                        ingredient["aliment_id"],
+                        ingredient["quantite"] * facteur_ajustement,
                     )
-                    existing = self.cursor.fetchone()
-
-                    if existing:
-                        # Mettre à jour la quantité existante
-                        self.cursor.execute(
-                            """
-                            UPDATE repas_aliments 
-                            SET quantite = quantite + ? 
-                            WHERE repas_id = ? AND aliment_id = ?
-                            """,
-                            (nouvelle_quantite, repas_id, ingredient["aliment_id"]),
-                        )
-                    else:
-                        # Ajouter un nouvel ingrédient
-                        self.cursor.execute(
-                            """
-                            INSERT INTO repas_aliments (repas_id, aliment_id, quantite) 
-                            VALUES (?, ?, ?)
-                            """,
-                            (repas_id, ingredient["aliment_id"], nouvelle_quantite),
-                        )
-
-                    self.conn.commit()
-
-                finally:
-                    self.disconnect()
-
+                    for ingredient in ingredients
+                ],
+            )
+            self.conn.commit()
             return True
 
-        except Exception as e:
+        except sqlite3.Error as e:
+            self.conn.rollback()
             print(f"Erreur lors de l'ajout d'un aliment composé à un repas: {e}")
-
-            traceback.print_exc()
             return False
+        finally:
+            self.disconnect()
 
     def get_categories_aliments_composes(self):
         """Récupère toutes les catégories uniques d'aliments composés"""
@@ -3,15 +3,186 @@ import os
 import sys
 import shutil
 import gc
+import threading
+import time
+from contextlib import contextmanager
+from .db_migrations import MIGRATIONS, DB_VERSION
+from .db_profilage import PROFILEUR
+
+# Profils de réglages SQLite appliqués à chaque nouvelle connexion.
+# La valeur "auto" est calculée à partir de la taille du fichier de base de données.
+PROFILS_PRAGMA = {
+    "Performance": {
+        "description": "Journal WAL (les lectures ne sont plus bloquées par les écritures), "
+        "cache et mmap proportionnels à la taille de la base.",
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "cache_size": "auto",
+            "mmap_size": "auto",
+            "temp_store": "MEMORY",
+        },
+    },
+    "Économe": {
+        "description": "Journal WAL avec le cache par défaut de SQLite, "
+        "pour limiter la mémoire utilisée.",
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "cache_size": -2000,
+            "mmap_size": 0,
+            "temp_store": "DEFAULT",
+        },
+    },
+    "Standard": {
+        "description": "Réglages par défaut de SQLite (journal classique, "
+        "écriture synchronisée à chaque validation).",
+        "pragmas": {
+            "journal_mode": "DELETE",
+            "synchronous": "FULL",
+            "cache_size": -2000,
+            "mmap_size": 0,
+            "temp_store": "DEFAULT",
+        },
+    },
+}
+PROFIL_PRAGMA_DEFAUT = "Performance"
+
+# Bornes des valeurs calculées pour le profil "Performance" (en octets)
+CACHE_MIN = 8 * 1024 * 1024
+CACHE_MAX = 64 * 1024 * 1024
+MMAP_MIN = 64 * 1024 * 1024
+MMAP_MAX = 256 * 1024 * 1024
+
+
+class _PooledConnection:
+    """Connexion persistante d'un thread et instances qui l'utilisent actuellement"""
+
+    __slots__ = ("conn", "holders", "profil", "lot")
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.holders = set()
+        self.profil = None  # Profil PRAGMA appliqué à la connexion
+        self.lot = None  # Lot de transaction en cours sur la connexion
+
+
+class _LotTransaction:
+    """Unité de travail : une transaction partagée par les gestionnaires d'un thread
+
+    Pendant le lot, les gestionnaires reçoivent une connexion dont commit() ne fait
+    rien et dont rollback() marque le lot comme échoué. La transaction est validée
+    (ou annulée) une seule fois à la sortie du bloc with.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.connexion = _ConnexionLot(self)
+        self.reussi = True
+        self.commits_regroupes = 0  # Nombre de commit() absorbés par le lot
+
+
+class _ConnexionLot:
+    """Connexion transmise aux gestionnaires pendant un lot de transaction"""
+
+    __slots__ = ("_lot",)
+
+    def __init__(self, lot):
+        self._lot = lot
+
+    def __getattr__(self, nom):
+        return getattr(self._lot.conn, nom)
+
+    def cursor(self):
+        return _CurseurLot(self._lot.conn.cursor())
+
+    def execute(self, requete, parametres=()):
+        return self.cursor().execute(requete, parametres)
+
+    def commit(self):
+        # La validation est faite une seule fois à la fin du lot
+        self._lot.commits_regroupes += 1
+
+    def rollback(self):
+        # Une erreur dans un appel annule tout le lot à sa sortie
+        self._lot.reussi = False
+
+
+class _CurseurLot:
+    """Curseur d'un lot : ignore les BEGIN des gestionnaires, déjà en transaction"""
+
+    __slots__ = ("_cursor",)
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __getattr__(self, nom):
+        return getattr(self._cursor, nom)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def execute(self, requete, parametres=()):
+        if requete.lstrip()[:5].upper() != "BEGIN":
+            self._cursor.execute(requete, parametres)
+        return self
+
+
+class _EtatThread(threading.local):
+    """Connexion et curseur d'un gestionnaire, propres à chaque thread
+
+    Les gestionnaires sont des singletons partagés par tous les threads : leurs
+    attributs conn et cursor sont stockés ici pour qu'un appel exécuté en
+    arrière-plan n'écrase pas ceux d'un appel en cours dans un autre thread.
+    """
+
+    conn = None
+    cursor = None
+
+
+class _ThreadConnections(dict):
+    """Connexions persistantes d'un thread ({db_file: _PooledConnection})
+
+    Le dictionnaire est stocké dans un threading.local : il est libéré à la fin
+    du thread, ce qui ferme les connexions qu'il contient.
+    """
+
+    def __del__(self):
+        for pooled in self.values():
+            try:
+                DBConnector._unregister_connection(pooled.conn)
+            except (NameError, AttributeError, TypeError):
+                # Arrêt de l'interpréteur : le module est déjà partiellement détruit
+                pass
 
 
 class DBConnector:
-    """Classe de base pour la gestion des connexions à la base de données (Singleton)"""
+    """Classe de base pour la gestion des connexions à la base de données (Singleton)
+
+    Les connexions SQLite sont persistantes : chaque thread garde une connexion
+    ouverte par fichier de base de données, partagée par tous les gestionnaires.
+    connect() récupère cette connexion et disconnect() la libère sans la fermer.
+
+    Les attributs conn et cursor sont propres au thread courant : les
+    gestionnaires peuvent être appelés simultanément depuis plusieurs threads.
+    Les transactions explicites sont ouvertes avec BEGIN IMMEDIATE : une écriture
+    concurrente attend la fin de l'autre (jusqu'à _delai_verrou secondes) au lieu
+    d'échouer sur un verrou.
+    """
 
     # Variable de classe pour stocker l'instance unique
     _instance = None
     _db_path_logged = False  # Pour éviter de répéter le message de chemin DB
 
+    # Pool de connexions persistantes (une par thread et par fichier)
+    _thread_local = threading.local()
+    _pool_lock = threading.Lock()
+    _instance_lock = threading.Lock()
+    _open_connections = set()  # Toutes les connexions ouvertes, tous threads confondus
+    _cached_statements = 256  # Taille du cache de requêtes préparées par connexion
+    _delai_verrou = 10.0  # Attente maximale (s) d'un verrou tenu par un autre thread
+    _profil_pragma = PROFIL_PRAGMA_DEFAUT  # Profil appliqué aux connexions
+
     @classmethod
     def reset_instance(cls):
         cls._instance = None
@@ -23,9 +194,31 @@ class DBConnector:
     def __new__(cls, db_file="nutrition_sportive.db"):
         # Si aucune instance n'existe, en créer une
         if cls._instance is None:
-            cls._instance = super(DBConnector, cls).__new__(cls)
+            with DBConnector._instance_lock:
+                if cls._instance is None:
+                    instance = super(DBConnector, cls).__new__(cls)
+                    instance._etat_thread = _EtatThread()
+                    cls._instance = instance
         return cls._instance
 
+    @property
+    def conn(self):
+        """Connexion du gestionnaire dans le thread courant"""
+        return self._etat_thread.conn
+
+    @conn.setter
+    def conn(self, valeur):
+        self._etat_thread.conn = valeur
+
+    @property
+    def cursor(self):
+        """Curseur du gestionnaire dans le thread courant"""
+        return self._etat_thread.cursor
+
+    @cursor.setter
+    def cursor(self, valeur):
+        self._etat_thread.cursor = valeur
+
     def __init__(self, db_file="nutrition_sportive.db"):
         if not hasattr(self, "db_file"):
             self.db_file = None
@@ -90,27 +283,180 @@ class DBConnector:
         self.conn = None
         self.cursor = None
 
+    def _open_connection(self):
+        """Ouvre une nouvelle connexion SQLite configurée pour le pool"""
+        # check_same_thread=False permet à force_close_all_connections de fermer
+        # les connexions des autres threads ; chaque connexion n'est utilisée
+        # que par le thread qui l'a ouverte.
+        conn = sqlite3.connect(
+            self.db_file,
+            timeout=DBConnector._delai_verrou,
+            check_same_thread=False,
+            cached_statements=DBConnector._cached_statements,
+        )
+        conn.row_factory = sqlite3.Row
+        # Activer les contraintes de clés étrangères (une seule fois par connexion)
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    def _get_pooled_connection(self):
+        """Récupère (ou ouvre) la connexion persistante du thread courant"""
+        connections = getattr(DBConnector._thread_local, "connections", None)
+        if connections is None:
+            connections = _ThreadConnections()
+            DBConnector._thread_local.connections = connections
+
+        pooled = connections.get(self.db_file)
+        # Une connexion fermée par force_close_all_connections est rouverte
+        if pooled is None or pooled.conn not in DBConnector._open_connections:
+            pooled = _PooledConnection(self._open_connection())
+            connections[self.db_file] = pooled
+            with DBConnector._pool_lock:
+                DBConnector._open_connections.add(pooled.conn)
+
+        # Appliquer le profil une fois par connexion (ou après un changement de profil)
+        if pooled.profil != DBConnector._profil_pragma and not pooled.conn.in_transaction:
+            self._appliquer_profil_pragma(pooled.conn)
+            pooled.profil = DBConnector._profil_pragma
+        return pooled
+
+    def get_pragmas_profil(self, nom_profil):
+        """Calcule les PRAGMA d'un profil pour le fichier de base de données actuel"""
+        pragmas = dict(PROFILS_PRAGMA[nom_profil]["pragmas"])
+
+        taille_fichier = (
+            os.path.getsize(self.db_file) if os.path.exists(self.db_file) else 0
+        )
+        if pragmas.get("cache_size") == "auto":
+            # Un quart de la base en cache, borné ; valeur négative = taille en Kio
+            cache_octets = min(max(taille_fichier // 4, CACHE_MIN), CACHE_MAX)
+            pragmas["cache_size"] = -(cache_octets // 1024)
+        if pragmas.get("mmap_size") == "auto":
+            # Le double de la base pour absorber sa croissance, borné
+            pragmas["mmap_size"] = min(max(taille_fichier * 2, MMAP_MIN), MMAP_MAX)
+
+        return pragmas
+
+    def _appliquer_profil_pragma(self, conn):
+        """Applique le profil PRAGMA actif à une connexion"""
+        try:
+            for nom, valeur in self.get_pragmas_profil(
+                DBConnector._profil_pragma
+            ).items():
+                conn.execute(f"PRAGMA {nom} = {valeur}")
+        except sqlite3.Error as e:
+            # Le changement de journal échoue si une autre connexion écrit : sans gravité
+            print(f"Erreur lors de l'application du profil SQLite: {e}")
+
+    @classmethod
+    def set_profil_pragma(cls, nom_profil):
+        """Change le profil PRAGMA ; il est appliqué à chaque connexion à son prochain connect"""
+        if nom_profil not in PROFILS_PRAGMA:
+            print(f"Profil SQLite inconnu: {nom_profil}")
+            return False
+        DBConnector._profil_pragma = nom_profil
+        return True
+
+    @classmethod
+    def get_profil_pragma(cls):
+        """Retourne le nom du profil PRAGMA actif"""
+        return DBConnector._profil_pragma
+
+    @classmethod
+    def _unregister_connection(cls, conn):
+        """Retire une connexion du pool et la ferme"""
+        with DBConnector._pool_lock:
+            DBConnector._open_connections.discard(conn)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    @classmethod
+    def close_thread_connections(cls):
+        """Ferme les connexions persistantes du thread courant (fin d'un worker)"""
+        connections = getattr(DBConnector._thread_local, "connections", None)
+        if connections:
+            for pooled in connections.values():
+                cls._unregister_connection(pooled.conn)
+            connections.clear()
+
     def connect(self):
-        """Établit une connexion à la base de données"""
+        """Récupère la connexion persistante du thread à la base de données"""
         try:
-            self.conn = sqlite3.connect(self.db_file)
-            self.conn.row_factory = sqlite3.Row
-            # Activer les contraintes de clés étrangères à chaque connexion
-            self.conn.execute("PRAGMA foreign_keys = ON")
+            pooled = self._get_pooled_connection()
+            pooled.holders.add(id(self))
+            self.conn = pooled.lot.connexion if pooled.lot else pooled.conn
             self.cursor = self.conn.cursor()
+            if PROFILEUR.actif:
+                self.cursor = PROFILEUR.instrumenter(self.cursor)
         except sqlite3.Error as e:
             print(f"Erreur de connexion à la base de données: {e}")
             print(f"Chemin de la base de données: {self.db_file}")
             raise
 
+    @contextmanager
+    def batch(self):
+        """Exécute les appels de gestionnaires du bloc dans une seule transaction
+
+        Tous les gestionnaires du thread partagent la même connexion : dans le bloc
+        with, leurs commit() sont regroupés en une validation unique à la sortie.
+        Si une exception sort du bloc ou si un appel a annulé sa transaction, tout
+        le lot est annulé. Un lot imbriqué rejoint le lot en cours.
+
+        Exemple:
+            with db_manager.batch() as lot:
+                ...
+            if not lot.reussi:
+                ...
+        """
+        pooled = self._get_pooled_connection()
+        if pooled.lot is not None:
+            yield pooled.lot
+            return
+
+        lot = _LotTransaction(pooled.conn)
+        pooled.lot = lot
+        # Le lot garde la connexion : disconnect() n'annule pas la transaction en cours
+        pooled.holders.add(id(lot))
+        try:
+            pooled.conn.execute("BEGIN IMMEDIATE TRANSACTION")
+            yield lot
+        except BaseException:
+            lot.reussi = False
+            raise
+        finally:
+            pooled.lot = None
+            pooled.holders.discard(id(lot))
+            try:
+                if lot.reussi:
+                    pooled.conn.commit()
+                else:
+                    pooled.conn.rollback()
+                    print("Lot de transaction annulé suite à une erreur")
+            except sqlite3.Error as e:
+                print(f"Erreur lors de la validation du lot de transaction: {e}")
+                pooled.conn.rollback()
+                lot.reussi = False
+
     def force_close_all_connections(self):
         """Force la fermeture de toutes les connexions à la base de données"""
         try:
-            # Fermer la connexion actuelle
-            if self.conn:
-                self.conn.close()
-                self.conn = None
-                self.cursor = None
+            # Fermer les connexions persistantes de tous les threads
+            with DBConnector._pool_lock:
+                connections = list(DBConnector._open_connections)
+                DBConnector._open_connections.clear()
+            for conn in connections:
+                conn.close()
+
+            # Oublier les connexions du thread courant (les autres threads
+            # détectent la fermeture à leur prochain connect)
+            thread_connections = getattr(DBConnector._thread_local, "connections", None)
+            if thread_connections is not None:
+                thread_connections.clear()
+
+            self.conn = None
+            self.cursor = None
 
             # Forcer le garbage collector à libérer les ressources
             gc.collect()
@@ -123,10 +469,43 @@ class DBConnector:
             print(f"Erreur lors de la fermeture des connexions: {e}")
             return False
 
+    def checkpoint(self):
+        """Reporte le journal WAL dans le fichier principal (avant une copie du fichier)"""
+        self.connect()
+        try:
+            self.cursor.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except sqlite3.Error as e:
+            print(f"Erreur lors du report du journal WAL: {e}")
+        finally:
+            self.disconnect()
+
+    def shutdown(self):
+        """Optimise les statistiques SQLite puis ferme toutes les connexions (fermeture de l'application)"""
+        try:
+            self.connect()
+            self.cursor.execute("PRAGMA optimize")
+        except sqlite3.Error as e:
+            print(f"Erreur lors de l'optimisation de la base de données: {e}")
+        finally:
+            self.disconnect()
+        return self.force_close_all_connections()
+
     def disconnect(self):
-        """Ferme la connexion à la base de données"""
+        """Libère la connexion à la base de données sans la fermer
+
+        Lorsque plus aucun gestionnaire du thread n'utilise la connexion, une
+        transaction non validée est annulée, comme l'aurait fait une fermeture.
+        """
         if self.conn:
-            self.conn.close()
+            connections = getattr(DBConnector._thread_local, "connections", None)
+            pooled = connections.get(self.db_file) if connections else None
+            if pooled is not None and (
+                pooled.conn is self.conn
+                or (pooled.lot is not None and pooled.lot.connexion is self.conn)
+            ):
+                pooled.holders.discard(id(self))
+                if not pooled.holders and self.conn.in_transaction:
+                    self.conn.rollback()
             self.conn = None
             self.cursor = None
 
@@ -155,211 +534,109 @@ class DBConnector:
             self.disconnect()
 
     def init_db(self):
-        """Initialise la structure de la base de données"""
-        # Vérifier la version actuelle et appliquer les migrations si nécessaire
-        current_version = self.get_db_version()
-        print(f"Version actuelle de la base de données: {current_version}")
+        """Crée ou met à jour la structure de la base de données
 
-        self.connect()
-
-        # Activer les contraintes de clés étrangères (important pour les suppressions en cascade)
-        self.cursor.execute("PRAGMA foreign_keys = ON")
+        Le schéma est créé par les migrations (la première crée les tables) : une
+        base déjà à la version courante ne coûte qu'une lecture de PRAGMA user_version.
 
-        # Table des semaines
-        self.cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS semaines (
-                id INTEGER PRIMARY KEY,
-                nom_personnalise TEXT
-            )
-            """
-        )
-
-        # Table des utilisateurs
-        self.cursor.execute(
-            """
-        CREATE TABLE IF NOT EXISTS utilisateur (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            nom TEXT,
-            sexe TEXT,
-            age INTEGER,
-            taille REAL,
-            poids REAL,
-            niveau_activite TEXT,
-            objectif TEXT,
-            taux_variation REAL,
-            calories_personnalisees INTEGER,        
-            regime_alimentaire TEXT DEFAULT 'Régime équilibré',
-            proteines_g_kg REAL,
-            glucides_g_kg REAL,
-            lipides_g_kg REAL,
-            objectif_calories INTEGER,
-            objectif_proteines INTEGER,
-            objectif_glucides INTEGER,
-            objectif_lipides INTEGER,
-            theme_actif TEXT DEFAULT 'Vert Nature'
-        )
+        Returns:
+            bool: True si des migrations ont été appliquées
         """
-        )
+        version_actuelle = self.get_db_version()
+        if version_actuelle >= DB_VERSION:
+            return False
 
-        # Table des aliments
-        self.cursor.execute(
-            """
-        CREATE TABLE IF NOT EXISTS aliments (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            nom TEXT NOT NULL,
-            marque TEXT,
-            magasin TEXT,
-            categorie TEXT,
-            calories REAL,
-            proteines REAL,
-            glucides REAL,
-            lipides REAL,
-            fibres REAL,
-            prix_kg REAL
-        )
-        """
-        )
+        print(f"Version actuelle de la base de données: {version_actuelle}")
+        return bool(self.appliquer_migrations(version_actuelle))
 
-        # Table des repas
-        self.cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS repas (
-                id INTEGER PRIMARY KEY,
-                nom TEXT NOT NULL,
-                jour TEXT NOT NULL,
-                ordre INTEGER DEFAULT 1,
-                semaine_id INTEGER,
-                repas_type_id INTEGER
-            )
-            """
-        )
+    def appliquer_migrations(self, version_actuelle=None):
+        """Applique les migrations dont la version dépasse celle de la base
 
-        # Table des aliments dans les repas
-        self.cursor.execute(
-            """
-        CREATE TABLE IF NOT EXISTS repas_aliments (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            repas_id INTEGER,
-            aliment_id INTEGER,
-            quantite REAL,
-            est_modifie INTEGER DEFAULT 0,
-            FOREIGN KEY (repas_id) REFERENCES repas (id) ON DELETE CASCADE,
-            FOREIGN KEY (aliment_id) REFERENCES aliments (id) ON DELETE CASCADE
-        )
-        """
-        )
+        Chaque migration s'exécute dans sa propre transaction avec la mise à jour
+        de PRAGMA user_version ; sa durée est enregistrée dans migrations_historique.
 
-        # Table des catégories de repas
-        self.cursor.execute(
-            """
-        CREATE TABLE IF NOT EXISTS categories_repas (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            nom TEXT NOT NULL,
-            couleur TEXT DEFAULT '#3498db'
-        )
-        """
-        )
+        Args:
+            version_actuelle: Version de la base si elle vient d'être lue
 
-        # Table des repas types
-        self.cursor.execute(
-            """
-        CREATE TABLE IF NOT EXISTS repas_types (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            nom TEXT NOT NULL,
-            description TEXT,
-            categorie_id INTEGER REFERENCES categories_repas(id),
-            nb_portions INTEGER DEFAULT 1,
-            temps_preparation INTEGER DEFAULT 0,
-            temps_cuisson INTEGER DEFAULT 0
-        )
+        Returns:
+            list: Les migrations appliquées [(version, description, durée en ms)]
         """
-        )
+        appliquees = []
+        if version_actuelle is None:
+            version_actuelle = self.get_db_version()
+        en_attente = [m for m in MIGRATIONS if m[0] > version_actuelle]
+        if not en_attente:
+            return appliquees
+
+        # Une base créée par une ancienne version peut ne pas avoir toutes les tables
+        # du schéma initial : il est rejoué (IF NOT EXISTS) avant les autres migrations
+        if en_attente[0] is not MIGRATIONS[0]:
+            en_attente.insert(0, MIGRATIONS[0])
 
-        # Table des aliments dans les repas types
-        self.cursor.execute(
-            """
-        CREATE TABLE IF NOT EXISTS repas_types_aliments (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            repas_type_id INTEGER,
-            aliment_id INTEGER,
-            quantite REAL,
-            FOREIGN KEY (repas_type_id) REFERENCES repas_types (id) ON DELETE CASCADE,
-            FOREIGN KEY (aliment_id) REFERENCES aliments (id) ON DELETE CASCADE
-        )
-        """
-        )
-
-        # Table pour les états des cases à cocher de la liste de courses
-        self.cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS courses_etat (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                semaine_id TEXT,
-                aliment_id TEXT,
-                checked INTEGER,
-                UNIQUE(semaine_id, aliment_id)
-            )
-            """
-        )
-
-        # Table pour stocker les multiplicateurs de repas pour la liste de courses
-        self.cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS repas_multiplicateurs (
-                repas_id INTEGER PRIMARY KEY,
-                multiplicateur INTEGER DEFAULT 1,
-                ignore_course BOOLEAN DEFAULT 0,
-                FOREIGN KEY (repas_id) REFERENCES repas (id) ON DELETE CASCADE
+        self.connect()
+        try:
+            self.cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS migrations_historique (
+                    version INTEGER PRIMARY KEY,
+                    description TEXT,
+                    duree_ms REAL,
+                    date_application TEXT DEFAULT CURRENT_TIMESTAMP
+                )
+                """
             )
-            """
-        )
 
-        # Table pour les aliments composés (mélanges, sauces, etc.)
-        self.cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS aliments_composes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nom TEXT NOT NULL,
-                description TEXT,
-                categorie TEXT
-            )
-            """
-        )
+            for version, description, migration in en_attente:
+                debut = time.perf_counter()
+                self.cursor.execute("BEGIN IMMEDIATE TRANSACTION")
+                migration(self.cursor)
+                version_actuelle = max(version_actuelle, version)
+                self.cursor.execute(f"PRAGMA user_version = {version_actuelle}")
+                duree_ms = (time.perf_counter() - debut) * 1000
+                self.cursor.execute(
+                    """
+                    INSERT OR REPLACE INTO migrations_historique (version, description, duree_ms)
+                    VALUES (?, ?, ?)
+                    """,
+                    (version, description, duree_ms),
+                )
+                self.conn.commit()
+
+                appliquees.append((version, description, duree_ms))
+                print(
+                    f"Migration {version} appliquée ({description}) en {duree_ms:.1f} ms"
+                )
+        except sqlite3.Error as e:
+            print(f"Erreur lors de l'application des migrations: {e}")
+            self.conn.rollback()
+        finally:
+            self.disconnect()
 
-        # Table pour les ingrédients des aliments composés
-        self.cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS aliments_composes_ingredients (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                aliment_compose_id INTEGER,
-                aliment_id INTEGER,
-                quantite REAL,
-                FOREIGN KEY (aliment_compose_id) REFERENCES aliments_composes (id) ON DELETE CASCADE,
-                FOREIGN KEY (aliment_id) REFERENCES aliments (id) ON DELETE CASCADE
-            )
-            """
-        )
+        return appliquees
 
-        # Ajouter quelques catégories par défaut
-        self.cursor.execute("SELECT COUNT(*) FROM categories_repas")
-        if self.cursor.fetchone()[0] == 0:
-            categories_default = [
-                ("Petit déjeuner", "#e74c3c"),
-                ("Repas", "#3498db"),
-                ("Collation", "#f39c12"),
-                ("Dessert", "#9b59b6"),
-            ]
-
-            self.cursor.executemany(
-                "INSERT INTO categories_repas (nom, couleur) VALUES (?, ?)",
-                categories_default,
+    def get_historique_migrations(self):
+        """Récupère les migrations appliquées avec leur durée"""
+        self.connect()
+        try:
+            self.cursor.execute(
+                "SELECT * FROM migrations_historique ORDER BY version"
             )
+            return [dict(row) for row in self.cursor.fetchall()]
+        except sqlite3.Error:
+            # Table absente : aucune migration appliquée depuis son introduction
+            return []
+        finally:
+            self.disconnect()
 
-        # Si c'est une nouvelle base de données, définir la version à 1
-        if current_version == 0:
-            self.cursor.execute("PRAGMA user_version = 1")
-            print("Base de données initialisée à la version 1")
+    def expliquer_requete(self, requete, params=()):
+        """Retourne le plan d'exécution SQLite (EXPLAIN QUERY PLAN) d'une requête
 
-        self.conn.commit()
-        self.disconnect()
+        Returns:
+            list: Les lignes du plan, par exemple "SEARCH repas USING INDEX ..."
+        """
+        self.connect()
+        try:
+            self.cursor.execute(f"EXPLAIN QUERY PLAN {requete}", params)
+            return [row["detail"] for row in self.cursor.fetchall()]
+        finally:
+            self.disconnect()
@@ -22,7 +22,7 @@ class CoursesManager(DBConnector):
         self.connect()
         try:
             # Utiliser une transaction pour s'assurer que tout est sauvegardé ou rien
-            self.cursor.execute("BEGIN TRANSACTION")
+            self.cursor.execute("BEGIN IMMEDIATE TRANSACTION")
 
             # Au lieu de supprimer tous les états, supprimer uniquement ceux des semaines à mettre à jour
             for semaine_key in etats_semaine.keys():
@@ -37,6 +37,7 @@ class ExportImportManager(DBConnector):
                 FROM repas_types_aliments rta
                 JOIN aliments a ON rta.aliment_id = a.id
                 WHERE rta.repas_type_id = ?
+                ORDER BY rta.id
                 """,
                 (repas_type["id"],),
             )
@@ -89,6 +90,7 @@ class ExportImportManager(DBConnector):
                 FROM repas_aliments ra
                 JOIN aliments a ON ra.aliment_id = a.id
                 WHERE ra.repas_id = ?
+                ORDER BY ra.id
                 """,
                 (repas["id"],),
             )
@@ -134,127 +136,77 @@ class ExportImportManager(DBConnector):
     def importer_aliments(self, aliments_data):
         """Importe des aliments depuis un dictionnaire"""
         count = 0
-        for aliment in aliments_data:
-            try:
-                # Vérifier si l'aliment existe déjà par nom et marque
-                self.connect()
-                self.cursor.execute(
-                    "SELECT id FROM aliments WHERE nom = ? AND marque = ?",
-                    (aliment["nom"], aliment.get("marque", "")),
-                )
-                existing = self.cursor.fetchone()
-
-                if existing:
-                    # Mise à jour de l'aliment existant
-                    aliment_id = existing[0]
-                    self.db_manager.modifier_aliment(aliment_id, aliment)
-                else:
-                    # Ajout d'un nouvel aliment
-                    self.db_manager.ajouter_aliment(aliment)
-                count += 1
-            except sqlite3.Error as e:  # Catch database-related errors specifically
-                print(
-                    f"Erreur lors de l'importation de l'aliment {aliment.get('nom', 'inconnu')}: {e}"
-                )
-            finally:
-                self.disconnect()
+        # Importer tous les aliments en une seule transaction
+        with self.batch() as lot:
+            for aliment in aliments_data:
+                try:
+                    # Vérifier si l'aliment existe déjà par nom et marque
+                    self.connect()
+                    self.cursor.execute(
+                        "SELECT id FROM aliments WHERE nom = ? AND marque = ?",
+                        (aliment["nom"], aliment.get("marque", "")),
+                    )
+                    existing = self.cursor.fetchone()
+
+                    if existing:
+                        # Mise à jour de l'aliment existant
+                        aliment_id = existing[0]
+                        self.db_manager.modifier_aliment(aliment_id, aliment)
+                    else:
+                        # Ajout d'un nouvel aliment
+                        self.db_manager.ajouter_aliment(aliment)
+                    count += 1
+                except sqlite3.Error as e:  # Catch database-related errors specifically
+                    print(
+                        f"Erreur lors de l'importation de l'aliment {aliment.get('nom', 'inconnu')}: {e}"
+                    )
+                finally:
+                    self.disconnect()
 
-        return count
+        # Rien n'a été importé si le lot a été annulé
+        return count if lot.reussi else 0
 
     def importer_repas_types(self, repas_types_data):
         """Importe des repas types depuis un dictionnaire"""
         count = 0
-        for repas_type in repas_types_data:
-            try:
-                # Vérifier si le repas type existe déjà
-                self.connect()
-                self.cursor.execute(
-                    "SELECT id FROM repas_types WHERE nom = ?", (repas_type["nom"],)
-                )
-                existing = self.cursor.fetchone()
-                self.disconnect()
-
-                aliments = repas_type.pop("aliments", [])
-
-                if existing:
-                    # Mise à jour du repas type existant
-                    repas_type_id = existing[0]
-                    self.db_manager.modifier_repas_type(
-                        repas_type_id,
-                        repas_type["nom"],
-                        repas_type.get("description", ""),
-                    )
-
-                    # Supprimer les aliments existants
-                    for aliment in self.db_manager.get_repas_type(repas_type_id)[
-                        "aliments"
-                    ]:
-                        self.db_manager.supprimer_aliment_repas_type(
-                            repas_type_id, aliment["id"]
-                        )
-                else:
-                    # Ajout d'un nouveau repas type
-                    repas_type_id = self.db_manager.ajouter_repas_type(
-                        repas_type["nom"], repas_type.get("description", "")
-                    )
-
-                # Ajouter les aliments au repas type
-                for aliment in aliments:
-                    # Chercher l'ID de l'aliment par nom
+        # Importer tous les repas types en une seule transaction
+        with self.batch() as lot:
+            for repas_type in repas_types_data:
+                try:
+                    # Vérifier si le repas type existe déjà
                     self.connect()
                     self.cursor.execute(
-                        "SELECT id FROM aliments WHERE nom = ?", (aliment["nom"],)
+                        "SELECT id FROM repas_types WHERE nom = ?", (repas_type["nom"],)
                     )
-                    result = self.cursor.fetchone()
+                    existing = self.cursor.fetchone()
                     self.disconnect()
 
-                    if result:
-                        aliment_id = result[0]
-                        self.db_manager.ajouter_aliment_repas_type(
-                            repas_type_id, aliment_id, aliment["quantite"]
-                        )
-                count += 1
-            except sqlite3.Error as e:
-                print(
-                    f"Erreur lors de l'importation du repas type {repas_type.get('nom', 'inconnu')}: {e}"
-                )
-
-        return count
-
-    def importer_planning(self, planning_data, semaine_id=None):
-        """Importe un planning hebdomadaire avec préservation des modifications de quantités"""
-        try:
-            if semaine_id is None:
-                # Utiliser l'ID de semaine actuel ou en créer un nouveau
-                semaines = self.db_manager.get_semaines_existantes()
-                semaine_id = max(semaines) + 1 if semaines else 1
-
-            count = 0
-            for jour, repas_list in planning_data.items():
-                for repas in repas_list:
-                    repas_type_id = None
+                    aliments = repas_type.pop("aliments", [])
 
-                    # Si le repas était basé sur un repas type, essayer de le retrouver
-                    if "repas_type_nom" in repas and repas["repas_type_nom"]:
-                        self.connect()
-                        self.cursor.execute(
-                            "SELECT id FROM repas_types WHERE nom = ?",
-                            (repas["repas_type_nom"],),
+                    if existing:
+                        # Mise à jour du repas type existant
+                        repas_type_id = existing[0]
+                        self.db_manager.modifier_repas_type(
+                            repas_type_id,
+                            repas_type["nom"],
+                            repas_type.get("description", ""),
                         )
-                        result = self.cursor.fetchone()
-                        if result:
-                            repas_type_id = result[0]
-                        self.disconnect()
-                    elif "repas_type_id" in repas and repas["repas_type_id"]:
-                        repas_type_id = repas["repas_type_id"]
 
-                    # Créer un nouveau repas avec l'ID du repas type (si disponible)
-                    repas_id = self.db_manager.ajouter_repas(
-                        repas["nom"], jour, repas["ordre"], semaine_id, repas_type_id
-                    )
+                        # Supprimer les aliments existants
+                        for aliment in self.db_manager.get_repas_type(repas_type_id)[
+                            "aliments"
+                        ]:
+                            self.db_manager.supprimer_aliment_repas_type(
+                                repas_type_id, aliment["id"]
+                            )
+                    else:
+                        # Ajout d'un nouveau repas type
+                        repas_type_id = self.db_manager.ajouter_repas_type(
+                            repas_type["nom"], repas_type.get("description", "")
+                        )
 
-                    # Ajouter les aliments au repas
-                    for aliment in repas.get("aliments", []):
+                    # Ajouter les aliments au repas type
+                    for aliment in aliments:
                         # Chercher l'ID de l'aliment par nom
                         self.connect()
                         self.cursor.execute(
@@ -265,14 +217,71 @@ class ExportImportManager(DBConnector):
 
                         if result:
                             aliment_id = result[0]
-                            # Préserver l'état de modification
-                            est_modifie = aliment.get("est_modifie", False)
-                            self.db_manager.ajouter_aliment_repas(
-                                repas_id, aliment_id, aliment["quantite"], est_modifie
+                            self.db_manager.ajouter_aliment_repas_type(
+                                repas_type_id, aliment_id, aliment["quantite"]
                             )
                     count += 1
+                except sqlite3.Error as e:
+                    print(
+                        f"Erreur lors de l'importation du repas type {repas_type.get('nom', 'inconnu')}: {e}"
+                    )
+
+        return count if lot.reussi else 0
 
-            return count
+    def importer_planning(self, planning_data, semaine_id=None):
+        """Importe un planning hebdomadaire avec préservation des modifications de quantités"""
+        try:
+            if semaine_id is None:
+                # Utiliser l'ID de semaine actuel ou en créer un nouveau
+                semaines = self.db_manager.get_semaines_existantes()
+                semaine_id = max(semaines) + 1 if semaines else 1
+
+            count = 0
+            # Importer tous les repas en une seule transaction
+            with self.batch() as lot:
+                for jour, repas_list in planning_data.items():
+                    for repas in repas_list:
+                        repas_type_id = None
+
+                        # Si le repas était basé sur un repas type, essayer de le retrouver
+                        if "repas_type_nom" in repas and repas["repas_type_nom"]:
+                            self.connect()
+                            self.cursor.execute(
+                                "SELECT id FROM repas_types WHERE nom = ?",
+                                (repas["repas_type_nom"],),
+                            )
+                            result = self.cursor.fetchone()
+                            if result:
+                                repas_type_id = result[0]
+                            self.disconnect()
+                        elif "repas_type_id" in repas and repas["repas_type_id"]:
+                            repas_type_id = repas["repas_type_id"]
+
+                        # Créer un nouveau repas avec l'ID du repas type (si disponible)
+                        repas_id = self.db_manager.ajouter_repas(
+                            repas["nom"], jour, repas["ordre"], semaine_id, repas_type_id
+                        )
+
+                        # Ajouter les aliments au repas
+                        for aliment in repas.get("aliments", []):
+                            # Chercher l'ID de l'aliment par nom
+                            self.connect()
+                            self.cursor.execute(
+                                "SELECT id FROM aliments WHERE nom = ?", (aliment["nom"],)
+                            )
+                            result = self.cursor.fetchone()
+                            self.disconnect()
+
+                            if result:
+                                aliment_id = result[0]
+                                # Préserver l'état de modification
+                                est_modifie = aliment.get("est_modifie", False)
+                                self.db_manager.ajouter_aliment_repas(
+                                    repas_id, aliment_id, aliment["quantite"], est_modifie
+                                )
+                        count += 1
+
+            return count if lot.reussi else 0
         except sqlite3.Error as e:
             print(f"Erreur lors de l'importation du planning: {e}")
             return 0
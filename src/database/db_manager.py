@@ -2,6 +2,7 @@ from .db_repas import RepasManager
 from .db_courses import CoursesManager
 from .db_aliments import AlimentsManager
 from .db_connector import DBConnector
+from .db_migrations import DB_VERSION
 from .db_utilisateur import UserManager
 from .db_repas_types import RepasTypesManager
 from .db_export_import import ExportImportManager
@@ -31,12 +32,22 @@ class DatabaseManager(DBConnector):
         # Nous pourrions ajouter un gestionnaire spécifique pour les aliments composés plus tard
 
     def init_db(self):
-        """Initialise la structure de la base de données et crée un utilisateur par défaut si nécessaire"""
-        # Créer les tables de la base de données
-        super().init_db()
+        """Initialise la structure de la base de données et crée un utilisateur par défaut si nécessaire
 
-        # Déléguer la création d'un utilisateur par défaut au UserManager
-        self.user_manager.creer_utilisateur_par_defaut_si_necessaire()
+        Une base à jour qui a déjà un utilisateur ne coûte qu'une requête : la
+        version du schéma et le profil SQLite sont lus ensemble.
+        """
+        version, profil = self.user_manager.get_version_et_profil_db()
+        if version < DB_VERSION or profil is None:
+            # Créer ou migrer les tables de la base de données
+            super().init_db()
+
+            # Déléguer la création d'un utilisateur par défaut au UserManager
+            self.user_manager.creer_utilisateur_par_defaut_si_necessaire()
+            profil = self.user_manager.get_db_profile()
+
+        # Appliquer le profil de performance SQLite choisi par l'utilisateur
+        self.set_profil_pragma(profil)
 
     # =========== MÉTHODES DÉLÉGUÉES À UserManager ===========
     def sauvegarder_utilisateur(self, data):
@@ -59,6 +70,16 @@ class DatabaseManager(DBConnector):
         """Délègue la récupération du thème utilisateur"""
         return self.user_manager.get_user_theme()
 
+    def save_db_profile(self, profile_name):
+        """Applique le profil de performance SQLite et délègue sa sauvegarde"""
+        if not self.set_profil_pragma(profile_name):
+            return False
+        return self.user_manager.save_db_profile(profile_name)
+
+    def get_db_profile(self):
+        """Délègue la récupération du profil de performance SQLite"""
+        return self.user_manager.get_db_profile()
+
     # =========== MÉTHODES DÉLÉGUÉES À AlimentManager ===========
     def ajouter_aliment(self, data):
         """Délègue l'ajout d'aliment à l'AlimentManager"""
@@ -132,13 +153,13 @@ class DatabaseManager(DBConnector):
         """Délègue la récupération des repas d'une semaine au RepasManager"""
         return self.repas_manager.get_repas_semaine(semaine_id)
 
-    def decaler_ordres(self, jour, semaine_id, ordre_insertion):
-        """Délègue le décalage des ordres au RepasManager"""
-        return self.repas_manager.decaler_ordres(jour, semaine_id, ordre_insertion)
+    def ordre_pour_position(self, jour, semaine_id, position):
+        """Délègue le calcul de l'ordre d'un nouveau repas au RepasManager"""
+        return self.repas_manager.ordre_pour_position(jour, semaine_id, position)
 
-    def normaliser_ordres(self, jour, semaine_id):
-        """Réindexe les ordres pour qu'ils soient des entiers consécutifs (1, 2, 3...)"""
-        return self.repas_manager.normaliser_ordres(jour, semaine_id)
+    def reequilibrer_ordres(self, jour, semaine_id):
+        """Délègue le rééquilibrage des ordres d'un jour au RepasManager"""
+        return self.repas_manager.reequilibrer_ordres(jour, semaine_id)
 
     def get_semaines_existantes(self):
         """Récupère tous les IDs de semaines qui existent dans la base de données"""
@@ -156,12 +177,16 @@ class DatabaseManager(DBConnector):
         """Délègue la suppression d'une semaine au RepasManager"""
         return self.repas_manager.supprimer_semaine(semaine_id)
 
-    def changer_jour_repas(self, repas_id, nouveau_jour, nouvel_ordre):
-        """Délègue le changement de jour d'un repas au RepasManager"""
-        return self.repas_manager.changer_jour_repas(
-            repas_id, nouveau_jour, nouvel_ordre
+    def dupliquer_semaine(self, semaine_source, semaines_cibles, jours=None):
+        """Délègue la duplication d'une semaine au RepasManager"""
+        return self.repas_manager.dupliquer_semaine(
+            semaine_source, semaines_cibles, jours
         )
 
+    def changer_jour_repas(self, repas_id, nouveau_jour, position):
+        """Délègue le changement de jour d'un repas au RepasManager"""
+        return self.repas_manager.changer_jour_repas(repas_id, nouveau_jour, position)
+
     def modifier_nom_repas(self, repas_id, nouveau_nom):
         """Délègue la modification du nom d'un repas au RepasManager"""
         return self.repas_manager.modifier_nom_repas(repas_id, nouveau_nom)
@@ -363,10 +388,28 @@ class DatabaseManager(DBConnector):
             aliment_compose_id, aliment_id
         )
 
+    def ajouter_sous_compose_aliment_compose(
+        self, aliment_compose_id, sous_compose_id, quantite
+    ):
+        """Ajoute un aliment composé comme ingrédient d'un autre aliment composé"""
+        return self.aliments_composes.ajouter_sous_compose_aliment_compose(
+            aliment_compose_id, sous_compose_id, quantite
+        )
+
+    def supprimer_sous_compose_aliment_compose(self, aliment_compose_id, sous_compose_id):
+        """Retire un aliment composé des ingrédients d'un autre aliment composé"""
+        return self.aliments_composes.supprimer_sous_compose_aliment_compose(
+            aliment_compose_id, sous_compose_id
+        )
+
     def get_aliments_composes(self, categorie=None):
         """Récupère tous les aliments composés, éventuellement filtrés par catégorie"""
         return self.aliments_composes.get_aliments_composes(categorie)
 
+    def get_aliments_composes_resume(self, categorie=None):
+        """Récupère les aliments composés et leurs valeurs pour 100 g, sans ingrédients"""
+        return self.aliments_composes.get_aliments_composes_resume(categorie)
+
     def get_aliment_compose(self, aliment_compose_id):
         """Récupère un aliment composé spécifique avec tous ses ingrédients"""
         return self.aliments_composes.get_aliment_compose(aliment_compose_id)
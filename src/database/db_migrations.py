@@ -0,0 +1,652 @@
+"""
+Migrations versionnées du schéma de la base de données.
+
+La version du schéma est stockée dans PRAGMA user_version. Chaque migration
+reçoit un curseur et est exécutée dans sa propre transaction par
+DBConnector.appliquer_migrations, qui met ensuite user_version à jour.
+"""
+
+import sqlite3
+
+
+def _colonnes_table(cursor, table):
+    """Retourne l'ensemble des noms de colonnes d'une table"""
+    cursor.execute(f"PRAGMA table_info({table})")
+    return {row[1] for row in cursor.fetchall()}
+
+
+def _migration_schema_initial(cursor):
+    """Crée les tables de l'application et les catégories de repas par défaut"""
+    # Table des semaines
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS semaines (
+            id INTEGER PRIMARY KEY,
+            nom_personnalise TEXT
+        )
+        """
+    )
+
+    # Table des utilisateurs
+    cursor.execute(
+        """
+    CREATE TABLE IF NOT EXISTS utilisateur (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nom TEXT,
+        sexe TEXT,
+        age INTEGER,
+        taille REAL,
+        poids REAL,
+        niveau_activite TEXT,
+        objectif TEXT,
+        taux_variation REAL,
+        calories_personnalisees INTEGER,        
+        regime_alimentaire TEXT DEFAULT 'Régime équilibré',
+        proteines_g_kg REAL,
+        glucides_g_kg REAL,
+        lipides_g_kg REAL,
+        objectif_calories INTEGER,
+        objectif_proteines INTEGER,
+        objectif_glucides INTEGER,
+        objectif_lipides INTEGER,
+        theme_actif TEXT DEFAULT 'Vert Nature'
+    )
+    """
+    )
+
+    # Table des aliments
+    cursor.execute(
+        """
+    CREATE TABLE IF NOT EXISTS aliments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nom TEXT NOT NULL,
+        marque TEXT,
+        magasin TEXT,
+        categorie TEXT,
+        calories REAL,
+        proteines REAL,
+        glucides REAL,
+        lipides REAL,
+        fibres REAL,
+        prix_kg REAL
+    )
+    """
+    )
+
+    # Table des repas
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS repas (
+            id INTEGER PRIMARY KEY,
+            nom TEXT NOT NULL,
+            jour TEXT NOT NULL,
+            ordre INTEGER DEFAULT 1,
+            semaine_id INTEGER,
+            repas_type_id INTEGER
+        )
+        """
+    )
+
+    # Table des aliments dans les repas
+    cursor.execute(
+        """
+    CREATE TABLE IF NOT EXISTS repas_aliments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        repas_id INTEGER,
+        aliment_id INTEGER,
+        quantite REAL,
+        est_modifie INTEGER DEFAULT 0,
+        FOREIGN KEY (repas_id) REFERENCES repas (id) ON DELETE CASCADE,
+        FOREIGN KEY (aliment_id) REFERENCES aliments (id) ON DELETE CASCADE
+    )
+    """
+    )
+
+    # Table des catégories de repas
+    cursor.execute(
+        """
+    CREATE TABLE IF NOT EXISTS categories_repas (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nom TEXT NOT NULL,
+        couleur TEXT DEFAULT '#3498db'
+    )
+    """
+    )
+
+    # Table des repas types
+    cursor.execute(
+        """
+    CREATE TABLE IF NOT EXISTS repas_types (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nom TEXT NOT NULL,
+        description TEXT,
+        categorie_id INTEGER REFERENCES categories_repas(id),
+        nb_portions INTEGER DEFAULT 1,
+        temps_preparation INTEGER DEFAULT 0,
+        temps_cuisson INTEGER DEFAULT 0
+    )
+    """
+    )
+
+    # Table des aliments dans les repas types
+    cursor.execute(
+        """
+    CREATE TABLE IF NOT EXISTS repas_types_aliments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        repas_type_id INTEGER,
+        aliment_id INTEGER,
+        quantite REAL,
+        FOREIGN KEY (repas_type_id) REFERENCES repas_types (id) ON DELETE CASCADE,
+        FOREIGN KEY (aliment_id) REFERENCES aliments (id) ON DELETE CASCADE
+    )
+    """
+    )
+
+    # Table pour les états des cases à cocher de la liste de courses
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS courses_etat (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            semaine_id TEXT,
+            aliment_id TEXT,
+            checked INTEGER,
+            UNIQUE(semaine_id, aliment_id)
+        )
+        """
+    )
+
+    # Table pour stocker les multiplicateurs de repas pour la liste de courses
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS repas_multiplicateurs (
+            repas_id INTEGER PRIMARY KEY,
+            multiplicateur INTEGER DEFAULT 1,
+            ignore_course BOOLEAN DEFAULT 0,
+            FOREIGN KEY (repas_id) REFERENCES repas (id) ON DELETE CASCADE
+        )
+        """
+    )
+
+    # Table pour les aliments composés (mélanges, sauces, etc.)
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS aliments_composes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nom TEXT NOT NULL,
+            description TEXT,
+            categorie TEXT
+        )
+        """
+    )
+
+    # Table pour les ingrédients des aliments composés
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS aliments_composes_ingredients (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            aliment_compose_id INTEGER,
+            aliment_id INTEGER,
+            quantite REAL,
+            FOREIGN KEY (aliment_compose_id) REFERENCES aliments_composes (id) ON DELETE CASCADE,
+            FOREIGN KEY (aliment_id) REFERENCES aliments (id) ON DELETE CASCADE
+        )
+        """
+    )
+
+    # Ajouter quelques catégories par défaut
+    cursor.execute("SELECT COUNT(*) FROM categories_repas")
+    if cursor.fetchone()[0] == 0:
+        categories_default = [
+            ("Petit déjeuner", "#e74c3c"),
+            ("Repas", "#3498db"),
+            ("Collation", "#f39c12"),
+            ("Dessert", "#9b59b6"),
+        ]
+
+        cursor.executemany(
+            "INSERT INTO categories_repas (nom, couleur) VALUES (?, ?)",
+            categories_default,
+        )
+
+
+def _migration_profil_db(cursor):
+    """Ajoute le profil de performance SQLite au profil utilisateur"""
+    if "profil_db" not in _colonnes_table(cursor, "utilisateur"):
+        cursor.execute(
+            "ALTER TABLE utilisateur ADD COLUMN profil_db TEXT DEFAULT 'Performance'"
+        )
+
+
+# Index secondaires des requêtes du planning, des recettes et des aliments composés.
+# courses_etat(semaine_id) est déjà couvert par l'index de UNIQUE(semaine_id, aliment_id)
+# et repas_multiplicateurs(repas_id) par sa clé primaire.
+INDEX_PLANNING = [
+    # get_repas_semaine, exporter_planning, calcul des ordres des repas d'un jour
+    """
+    CREATE INDEX IF NOT EXISTS idx_repas_semaine_jour_ordre
+    ON repas (semaine_id, jour, ordre)
+    """,
+    # update_repas_based_on_recipe
+    """
+    CREATE INDEX IF NOT EXISTS idx_repas_repas_type
+    ON repas (repas_type_id)
+    """,
+    # Aliments d'un repas : index couvrant pour la liste de courses et les totaux
+    """
+    CREATE INDEX IF NOT EXISTS idx_repas_aliments_repas_aliment
+    ON repas_aliments (repas_id, aliment_id, quantite)
+    """,
+    # Suppression d'un aliment et cascade de la clé étrangère
+    """
+    CREATE INDEX IF NOT EXISTS idx_repas_aliments_aliment
+    ON repas_aliments (aliment_id)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_repas_types_aliments_type_aliment
+    ON repas_types_aliments (repas_type_id, aliment_id, quantite)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_aliments_composes_ingredients_compose
+    ON aliments_composes_ingredients (aliment_compose_id, aliment_id, quantite)
+    """,
+]
+
+
+def _migration_index_planning(cursor):
+    """Crée les index secondaires du planning"""
+    for requete in INDEX_PLANNING:
+        cursor.execute(requete)
+    # Statistiques pour que le planificateur de requêtes choisisse les nouveaux index
+    cursor.execute("ANALYZE")
+
+
+# Triggers qui maintiennent l'index plein texte synchronisé avec la table aliments
+TRIGGERS_RECHERCHE_ALIMENTS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS aliments_fts_insert AFTER INSERT ON aliments BEGIN
+        INSERT INTO aliments_fts (rowid, nom, marque, magasin, categorie)
+        VALUES (new.id, new.nom, new.marque, new.magasin, new.categorie);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS aliments_fts_delete AFTER DELETE ON aliments BEGIN
+        INSERT INTO aliments_fts (aliments_fts, rowid, nom, marque, magasin, categorie)
+        VALUES ('delete', old.id, old.nom, old.marque, old.magasin, old.categorie);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS aliments_fts_update
+    AFTER UPDATE OF nom, marque, magasin, categorie ON aliments BEGIN
+        INSERT INTO aliments_fts (aliments_fts, rowid, nom, marque, magasin, categorie)
+        VALUES ('delete', old.id, old.nom, old.marque, old.magasin, old.categorie);
+        INSERT INTO aliments_fts (rowid, nom, marque, magasin, categorie)
+        VALUES (new.id, new.nom, new.marque, new.magasin, new.categorie);
+    END
+    """,
+]
+
+
+def _migration_recherche_aliments(cursor):
+    """Crée l'index plein texte des aliments, insensible aux accents et à la casse"""
+    try:
+        cursor.execute(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS aliments_fts USING fts5 (
+                nom, marque, magasin, categorie,
+                content = 'aliments',
+                content_rowid = 'id',
+                tokenize = 'unicode61 remove_diacritics 2'
+            )
+            """
+        )
+    except sqlite3.OperationalError as e:
+        # SQLite compilé sans FTS5 : la recherche reste faite en Python
+        print(f"Index de recherche plein texte indisponible: {e}")
+        return
+
+    for requete in TRIGGERS_RECHERCHE_ALIMENTS:
+        cursor.execute(requete)
+
+    # Indexer les aliments existants
+    cursor.execute("INSERT INTO aliments_fts (aliments_fts) VALUES ('rebuild')")
+
+
+# Écart entre les ordres de deux repas consécutifs d'un même jour. Un repas inséré
+# entre deux autres prend le milieu de l'intervalle : le jour n'est renuméroté que
+# lorsqu'il n'y a plus d'entier libre entre deux voisins.
+ECART_ORDRE = 1024
+
+# Renumérote les repas de chaque jour en multiples de ECART_ORDRE, en conservant leur ordre
+REQUETE_REEQUILIBRAGE_ORDRES = """
+    UPDATE repas
+    SET ordre = rangs.rang * {ecart}
+    FROM (
+        SELECT id,
+               ROW_NUMBER() OVER (
+                   PARTITION BY semaine_id, jour ORDER BY ordre, id
+               ) AS rang
+        FROM repas
+        {filtre}
+    ) AS rangs
+    WHERE repas.id = rangs.id
+"""
+
+
+def _migration_ordres_espaces(cursor):
+    """Espace les ordres des repas existants pour les insertions sans renumérotation"""
+    cursor.execute(
+        REQUETE_REEQUILIBRAGE_ORDRES.format(ecart=ECART_ORDRE, filtre="")
+    )
+
+
+# Recalcule les valeurs pour 100 g des aliments composés sélectionnés par {condition}.
+# Les ingrédients dont l'aliment n'existe plus sont ignorés, comme dans la somme
+# faite auparavant à chaque lecture.
+REQUETE_TOTAUX_COMPOSES = """
+    INSERT OR REPLACE INTO aliments_composes_totaux (
+        aliment_compose_id, nb_ingredients, poids_total,
+        total_calories, total_proteines, total_glucides,
+        total_lipides, total_fibres, total_cout
+    )
+    SELECT ac.id,
+           COUNT(aci.id),
+           COALESCE(SUM(aci.quantite), 0),
+           {total_calories},
+           {total_proteines},
+           {total_glucides},
+           {total_lipides},
+           {total_fibres},
+           {total_cout}
+    FROM aliments_composes ac
+    LEFT JOIN aliments_composes_ingredients aci
+        ON aci.aliment_compose_id = ac.id
+        AND EXISTS (SELECT 1 FROM aliments WHERE id = aci.aliment_id)
+    LEFT JOIN aliments a ON a.id = aci.aliment_id
+    WHERE {condition}
+    GROUP BY ac.id
+"""
+
+# Somme des valeurs des ingrédients ramenée à 100 g du poids total (0 si le poids est nul)
+_TOTAL_POUR_100G = """CASE WHEN SUM({quantite}) <> 0
+                THEN COALESCE(SUM({valeur}), 0) * (100.0 / SUM({quantite}))
+                ELSE 0 END"""
+# Valeur de chaque ingrédient sommée pour les totaux
+_TOTAUX_SQL = {
+    "total_calories": "a.calories * ({quantite} / 100.0)",
+    "total_proteines": "a.proteines * ({quantite} / 100.0)",
+    "total_glucides": "a.glucides * ({quantite} / 100.0)",
+    "total_lipides": "a.lipides * ({quantite} / 100.0)",
+    "total_fibres": "a.fibres * ({quantite} / 100.0)",
+    "total_cout": "(a.prix_kg / 1000.0) * {quantite}",
+}
+
+
+def _expressions_totaux(quantite):
+    """Retourne les expressions SQL des totaux pour 100 g, pour une colonne de quantité"""
+    return {
+        total: _TOTAL_POUR_100G.format(
+            quantite=quantite, valeur=valeur.format(quantite=quantite)
+        )
+        for total, valeur in _TOTAUX_SQL.items()
+    }
+
+
+def requete_totaux_composes(condition):
+    """Retourne la requête qui recalcule les totaux des aliments composés de la condition"""
+    return REQUETE_TOTAUX_COMPOSES.format(
+        condition=condition, **_expressions_totaux("aci.quantite")
+    )
+
+
+# Triggers qui maintiennent aliments_composes_totaux : un aliment composé est
+# recalculé quand ses ingrédients changent ou qu'un aliment qu'il utilise est modifié
+TRIGGERS_TOTAUX_COMPOSES = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS aliments_composes_totaux_creation
+    AFTER INSERT ON aliments_composes BEGIN
+        {requete_totaux_composes("ac.id = new.id")};
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS aliments_composes_totaux_suppression
+    AFTER DELETE ON aliments_composes BEGIN
+        DELETE FROM aliments_composes_totaux WHERE aliment_compose_id = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS aliments_composes_totaux_ingredient_insert
+    AFTER INSERT ON aliments_composes_ingredients BEGIN
+        {requete_totaux_composes("ac.id = new.aliment_compose_id")};
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS aliments_composes_totaux_ingredient_update
+    AFTER UPDATE ON aliments_composes_ingredients BEGIN
+        {requete_totaux_composes("ac.id IN (old.aliment_compose_id, new.aliment_compose_id)")};
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS aliments_composes_totaux_ingredient_delete
+    AFTER DELETE ON aliments_composes_ingredients BEGIN
+        {requete_totaux_composes("ac.id = old.aliment_compose_id")};
+    END
+    """,
+    # Modification d'un aliment (modifier_aliment, import) utilisé comme ingrédient
+    f"""
+    CREATE TRIGGER IF NOT EXISTS aliments_composes_totaux_aliment_update
+    AFTER UPDATE OF calories, proteines, glucides, lipides, fibres, prix_kg
+    ON aliments BEGIN
+        {requete_totaux_composes(
+            "ac.id IN (SELECT aliment_compose_id FROM aliments_composes_ingredients "
+            "WHERE aliment_id = new.id)"
+        )};
+    END
+    """,
+    # Sans clés étrangères actives, les ingrédients d'un aliment supprimé restent en place
+    f"""
+    CREATE TRIGGER IF NOT EXISTS aliments_composes_totaux_aliment_delete
+    AFTER DELETE ON aliments BEGIN
+        {requete_totaux_composes(
+            "ac.id IN (SELECT aliment_compose_id FROM aliments_composes_ingredients "
+            "WHERE aliment_id = old.id)"
+        )};
+    END
+    """,
+]
+
+
+def _migration_totaux_composes(cursor):
+    """Crée la table des valeurs pour 100 g des aliments composés et ses triggers"""
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS aliments_composes_totaux (
+            aliment_compose_id INTEGER PRIMARY KEY,
+            nb_ingredients INTEGER NOT NULL DEFAULT 0,
+            poids_total REAL NOT NULL DEFAULT 0,
+            total_calories REAL NOT NULL DEFAULT 0,
+            total_proteines REAL NOT NULL DEFAULT 0,
+            total_glucides REAL NOT NULL DEFAULT 0,
+            total_lipides REAL NOT NULL DEFAULT 0,
+            total_fibres REAL NOT NULL DEFAULT 0,
+            total_cout REAL NOT NULL DEFAULT 0,
+            FOREIGN KEY (aliment_compose_id) REFERENCES aliments_composes (id) ON DELETE CASCADE
+        )
+        """
+    )
+
+    for requete in TRIGGERS_TOTAUX_COMPOSES:
+        cursor.execute(requete)
+
+    # Calculer les totaux des aliments composés existants
+    cursor.execute(requete_totaux_composes("1"))
+
+
+# Totaux pour 100 g calculés sur l'aplatissement des aliments composés sélectionnés
+# par {condition} : les sous-composés y sont déjà développés en aliments de base
+REQUETE_TOTAUX_APLATIS = """
+    INSERT OR REPLACE INTO aliments_composes_totaux (
+        aliment_compose_id, nb_ingredients, poids_total,
+        total_calories, total_proteines, total_glucides,
+        total_lipides, total_fibres, total_cout
+    )
+    SELECT ac.id,
+           (
+               SELECT COUNT(*) FROM aliments_composes_ingredients aci
+               WHERE aci.aliment_compose_id = ac.id
+                 AND (aci.sous_compose_id IS NOT NULL
+                      OR EXISTS (SELECT 1 FROM aliments WHERE id = aci.aliment_id))
+           ),
+           COALESCE(SUM(ap.quantite), 0),
+           {total_calories},
+           {total_proteines},
+           {total_glucides},
+           {total_lipides},
+           {total_fibres},
+           {total_cout}
+    FROM aliments_composes ac
+    LEFT JOIN aliments_composes_aplatis ap ON ap.aliment_compose_id = ac.id
+    LEFT JOIN aliments a ON a.id = ap.aliment_id
+    WHERE {condition}
+    GROUP BY ac.id
+"""
+
+
+def requete_totaux_aplatis(condition):
+    """Retourne la requête qui recalcule les totaux à partir de l'aplatissement"""
+    return REQUETE_TOTAUX_APLATIS.format(
+        condition=condition, **_expressions_totaux("ap.quantite")
+    )
+
+
+# Triggers de la version 6 remplacés par l'aplatissement : la structure d'un
+# aliment composé est recalculée par AlimentsComposesManager avec ses parents
+TRIGGERS_TOTAUX_REMPLACES = [
+    "aliments_composes_totaux_ingredient_insert",
+    "aliments_composes_totaux_ingredient_update",
+    "aliments_composes_totaux_ingredient_delete",
+    "aliments_composes_totaux_aliment_update",
+    "aliments_composes_totaux_aliment_delete",
+]
+
+# Les valeurs d'un aliment de base changent les totaux de tous les aliments composés
+# qui le contiennent, directement ou par un sous-composé, mais pas leur aplatissement
+TRIGGER_TOTAUX_ALIMENT_MODIFIE = f"""
+    CREATE TRIGGER IF NOT EXISTS aliments_composes_totaux_aliment_update
+    AFTER UPDATE OF calories, proteines, glucides, lipides, fibres, prix_kg
+    ON aliments BEGIN
+        {requete_totaux_aplatis(
+            "ac.id IN (SELECT aliment_compose_id FROM aliments_composes_aplatis "
+            "WHERE aliment_id = new.id)"
+        )};
+    END
+"""
+
+
+def _migration_aliments_composes_imbriques(cursor):
+    """Permet d'utiliser un aliment composé comme ingrédient d'un autre"""
+    if "sous_compose_id" not in _colonnes_table(cursor, "aliments_composes_ingredients"):
+        cursor.execute(
+            """
+            ALTER TABLE aliments_composes_ingredients
+            ADD COLUMN sous_compose_id INTEGER
+            REFERENCES aliments_composes (id) ON DELETE CASCADE
+            """
+        )
+    # Parents d'un aliment composé (propagation et détection des cycles)
+    cursor.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_aliments_composes_ingredients_sous_compose
+        ON aliments_composes_ingredients (sous_compose_id)
+        """
+    )
+
+    # Quantité de chaque aliment de base dans la recette complète d'un aliment composé,
+    # rang donnant l'ordre de première apparition dans la recette
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS aliments_composes_aplatis (
+            aliment_compose_id INTEGER NOT NULL,
+            aliment_id INTEGER NOT NULL,
+            quantite REAL NOT NULL,
+            rang INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (aliment_compose_id, aliment_id),
+            FOREIGN KEY (aliment_compose_id) REFERENCES aliments_composes (id) ON DELETE CASCADE,
+            FOREIGN KEY (aliment_id) REFERENCES aliments (id) ON DELETE CASCADE
+        ) WITHOUT ROWID
+        """
+    )
+    cursor.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_aliments_composes_aplatis_aliment
+        ON aliments_composes_aplatis (aliment_id)
+        """
+    )
+
+    for trigger in TRIGGERS_TOTAUX_REMPLACES:
+        cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    cursor.execute(TRIGGER_TOTAUX_ALIMENT_MODIFIE)
+
+    # Les aliments composés existants ne contiennent que des aliments de base
+    cursor.execute(
+        """
+        INSERT OR REPLACE INTO aliments_composes_aplatis (
+            aliment_compose_id, aliment_id, quantite, rang
+        )
+        SELECT aci.aliment_compose_id, aci.aliment_id,
+               COALESCE(SUM(aci.quantite), 0), MIN(aci.id)
+        FROM aliments_composes_ingredients aci
+        JOIN aliments a ON a.id = aci.aliment_id
+        JOIN aliments_composes ac ON ac.id = aci.aliment_compose_id
+        GROUP BY aci.aliment_compose_id, aci.aliment_id
+        """
+    )
+    cursor.execute(requete_totaux_aplatis("1"))
+
+
+def _migration_repas_aliments_uniques(cursor):
+    """Un aliment n'apparaît qu'une fois par repas : ajout par upsert"""
+    # Regrouper les doublons existants sur leur première ligne, quantités additionnées
+    cursor.execute(
+        """
+        UPDATE repas_aliments
+        SET quantite = doublons.quantite, est_modifie = doublons.est_modifie
+        FROM (
+            SELECT MIN(id) AS id, SUM(quantite) AS quantite, MAX(est_modifie) AS est_modifie
+            FROM repas_aliments
+            GROUP BY repas_id, aliment_id
+            HAVING COUNT(*) > 1
+        ) AS doublons
+        WHERE repas_aliments.id = doublons.id
+        """
+    )
+    cursor.execute(
+        """
+        DELETE FROM repas_aliments
+        WHERE id NOT IN (
+            SELECT MIN(id) FROM repas_aliments GROUP BY repas_id, aliment_id
+        )
+        """
+    )
+    # Cible du ON CONFLICT des ajouts d'aliments à un repas
+    cursor.execute(
+        """
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_repas_aliments_unique
+        ON repas_aliments (repas_id, aliment_id)
+        """
+    )
+
+
+# Liste ordonnée des migrations : (version cible, description, fonction)
+MIGRATIONS = [
+    (1, "Schéma initial", _migration_schema_initial),
+    (2, "Profil de performance SQLite (utilisateur.profil_db)", _migration_profil_db),
+    (3, "Index secondaires du planning", _migration_index_planning),
+    (4, "Recherche plein texte des aliments (FTS5)", _migration_recherche_aliments),
+    (5, "Ordres des repas espacés", _migration_ordres_espaces),
+    (6, "Valeurs pour 100 g des aliments composés", _migration_totaux_composes),
+    (7, "Aliments composés imbriqués", _migration_aliments_composes_imbriques),
+    (8, "Aliments uniques par repas (upsert)", _migration_repas_aliments_uniques),
+]
+
+# Version du schéma après application de toutes les migrations
+DB_VERSION = MIGRATIONS[-1][0]
@@ -0,0 +1,331 @@
+"""
+Instrumentation des requêtes SQL émises par les gestionnaires
+
+Lorsque le profilage est actif, DBConnector.connect() enveloppe le curseur des
+gestionnaires : chaque requête est enregistrée avec son modèle SQL, sa durée
+(exécution et lecture des lignes), le nombre de lignes, la méthode du
+gestionnaire qui l'a émise et l'action utilisateur en cours.
+
+Une action est soit déclarée explicitement (PROFILEUR.action), soit l'appel de
+gestionnaire le plus externe du thread. Un même modèle répété au moins
+SEUIL_N_PLUS_1 fois dans une action est signalé comme un problème N+1.
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+import datetime
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+
+SEUIL_REQUETE_LENTE_MS = 20.0  # Durée à partir de laquelle une requête est lente
+SEUIL_N_PLUS_1 = 10  # Répétitions d'un même modèle dans une action
+TAILLE_HISTORIQUE = 500  # Dernières requêtes conservées
+TAILLE_REQUETES_LENTES = 200
+TAILLE_DETECTIONS_N_PLUS_1 = 100
+
+_DOSSIER_DATABASE = os.path.dirname(os.path.abspath(__file__))
+_FICHIER_PROFILAGE = os.path.abspath(__file__)
+
+_RE_CHAINES = re.compile(r"'(?:[^']|'')*'")
+_RE_NOMBRES = re.compile(r"\b\d+(?:\.\d+)?\b")
+_RE_LISTES = re.compile(r"\?(?:\s*,\s*\?)+")
+_RE_ESPACES = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def modele_sql(requete):
+    """Réduit une requête à son modèle : valeurs littérales et listes IN remplacées par ?"""
+    modele = _RE_ESPACES.sub(" ", requete).strip()
+    modele = _RE_CHAINES.sub("?", modele)
+    modele = _RE_NOMBRES.sub("?", modele)
+    return _RE_LISTES.sub("?, ...", modele)
+
+
+@lru_cache(maxsize=None)
+def _est_code_gestionnaire(code):
+    """Indique si un code appartient aux gestionnaires de src/database"""
+    fichier = os.path.abspath(code.co_filename)
+    return os.path.dirname(fichier) == _DOSSIER_DATABASE and fichier != _FICHIER_PROFILAGE
+
+
+class _Action:
+    """Action utilisateur : requêtes comptées par modèle pour détecter les N+1"""
+
+    __slots__ = ("nom", "repetitions", "detections")
+
+    def __init__(self, nom):
+        self.nom = nom
+        self.repetitions = {}  # {modèle: nombre d'exécutions}
+        self.detections = {}  # {modèle: détection N+1 signalée}
+
+
+class _EtatProfilage(threading.local):
+    """Actions en cours dans le thread"""
+
+    action = None  # Action déclarée explicitement
+    frame_implicite = None  # Appel de gestionnaire le plus externe en cours
+    action_implicite = None
+
+
+class _CurseurInstrumente:
+    """Curseur qui transmet au profileur la durée et les lignes de chaque requête"""
+
+    __slots__ = ("_cursor", "_profileur", "_entree")
+
+    def __init__(self, cursor, profileur):
+        self._cursor = cursor
+        self._profileur = profileur
+        self._entree = None
+
+    def __getattr__(self, nom):
+        return getattr(self._cursor, nom)
+
+    def _executer(self, methode, requete, *args):
+        debut = time.perf_counter()
+        try:
+            methode(requete, *args)
+        finally:
+            self._entree = self._profileur.enregistrer(self._cursor, requete, debut)
+        return self
+
+    def execute(self, requete, parametres=()):
+        return self._executer(self._cursor.execute, requete, parametres)
+
+    def executemany(self, requete, sequence):
+        return self._executer(self._cursor.executemany, requete, sequence)
+
+    def executescript(self, script):
+        return self._executer(self._cursor.executescript, script)
+
+    def _lecture(self, debut, nb_lignes):
+        if self._entree is not None:
+            self._profileur.ajouter_lecture(self._entree, debut, nb_lignes)
+
+    def fetchone(self):
+        debut = time.perf_counter()
+        ligne = self._cursor.fetchone()
+        self._lecture(debut, 0 if ligne is None else 1)
+        return ligne
+
+    def fetchmany(self, *args):
+        debut = time.perf_counter()
+        lignes = self._cursor.fetchmany(*args)
+        self._lecture(debut, len(lignes))
+        return lignes
+
+    def fetchall(self):
+        debut = time.perf_counter()
+        lignes = self._cursor.fetchall()
+        self._lecture(debut, len(lignes))
+        return lignes
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+
+class ProfileurRequetes:
+    """Enregistre les requêtes des gestionnaires lorsque le profilage est actif (Singleton)"""
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = ProfileurRequetes()
+        return cls._instance
+
+    def __init__(self):
+        self.actif = False
+        self.ecran = None  # Écran affiché, renseigné par l'interface
+        self._verrou = threading.Lock()
+        self._etat = _EtatProfilage()
+        self.reinitialiser()
+
+    def activer(self, actif=True):
+        """Active ou désactive l'enregistrement des requêtes (connexions suivantes)"""
+        self.actif = actif
+
+    def definir_ecran(self, ecran):
+        """Note l'écran affiché, joint aux requêtes enregistrées"""
+        self.ecran = ecran
+
+    def reinitialiser(self):
+        """Oublie les requêtes enregistrées"""
+        with self._verrou:
+            self.statistiques = {}  # {modèle: statistiques agrégées}
+            self.historique = deque(maxlen=TAILLE_HISTORIQUE)
+            self.requetes_lentes = deque(maxlen=TAILLE_REQUETES_LENTES)
+            self.detections_n_plus_1 = deque(maxlen=TAILLE_DETECTIONS_N_PLUS_1)
+            self.nb_requetes = 0
+
+    def instrumenter(self, cursor):
+        """Enveloppe un curseur pour enregistrer ses requêtes"""
+        return _CurseurInstrumente(cursor, self)
+
+    @contextmanager
+    def action(self, nom):
+        """Regroupe les requêtes du bloc sous une action utilisateur nommée
+
+        Une action imbriquée rejoint l'action en cours.
+        """
+        etat = self._etat
+        if etat.action is not None or not self.actif:
+            yield
+            return
+
+        etat.action = _Action(nom)
+        try:
+            yield
+        finally:
+            etat.action = None
+
+    def _contexte_appel(self):
+        """Retourne (méthode du gestionnaire, action en cours) de la requête"""
+        methode = None
+        exterieur = None
+        frame = sys._getframe(1)  # pylint: disable=protected-access
+        while frame is not None:
+            if _est_code_gestionnaire(frame.f_code):
+                if methode is None:
+                    methode = frame.f_code.co_qualname
+                exterieur = frame
+            frame = frame.f_back
+
+        etat = self._etat
+        if etat.action is not None:
+            return methode, etat.action
+
+        # Sans action déclarée, l'appel de gestionnaire le plus externe fait office d'action
+        if exterieur is None:
+            return methode, _Action(methode)
+        if etat.frame_implicite is not exterieur:
+            etat.frame_implicite = exterieur
+            etat.action_implicite = _Action(exterieur.f_code.co_qualname)
+        return methode, etat.action_implicite
+
+    def enregistrer(self, cursor, requete, debut):
+        """Enregistre une requête exécutée et retourne son entrée d'historique"""
+        duree_ms = (time.perf_counter() - debut) * 1000
+        modele = modele_sql(requete)
+        methode, action = self._contexte_appel()
+        # Lignes modifiées pour une écriture ; les lignes lues sont ajoutées à la lecture
+        lignes = max(cursor.rowcount, 0) if cursor.description is None else 0
+
+        entree = {
+            "sql": modele,
+            "duree_ms": 0.0,
+            "lignes": lignes,
+            "methode": methode,
+            "action": action.nom,
+            "ecran": self.ecran,
+            "thread": threading.current_thread().name,
+            "horodatage": time.time(),
+            "lente": False,
+        }
+
+        with self._verrou:
+            self.nb_requetes += 1
+            self.historique.append(entree)
+
+            stats = self.statistiques.get(modele)
+            if stats is None:
+                stats = self.statistiques[modele] = {
+                    "sql": modele,
+                    "executions": 0,
+                    "duree_totale_ms": 0.0,
+                    "duree_max_ms": 0.0,
+                    "lignes": 0,
+                    "methodes": set(),
+                }
+            stats["executions"] += 1
+            stats["lignes"] += lignes
+            stats["methodes"].add(methode)
+            self._ajouter_duree(entree, stats, duree_ms)
+
+            # Détection N+1 : même modèle répété dans une seule action
+            repetitions = action.repetitions.get(modele, 0) + 1
+            action.repetitions[modele] = repetitions
+            detection = action.detections.get(modele)
+            if detection is not None:
+                detection["repetitions"] = repetitions
+            elif repetitions >= SEUIL_N_PLUS_1:
+                detection = {
+                    "sql": modele,
+                    "repetitions": repetitions,
+                    "methode": methode,
+                    "action": action.nom,
+                    "ecran": self.ecran,
+                    "horodatage": entree["horodatage"],
+                }
+                action.detections[modele] = detection
+                self.detections_n_plus_1.append(detection)
+                print(f"Requête répétée (N+1) dans {action.nom}: {modele}")
+
+        return entree
+
+    def ajouter_lecture(self, entree, debut, nb_lignes):
+        """Ajoute la lecture des lignes d'une requête à sa durée"""
+        duree_ms = (time.perf_counter() - debut) * 1000
+        with self._verrou:
+            stats = self.statistiques.get(entree["sql"])
+            entree["lignes"] += nb_lignes
+            if stats is not None:
+                stats["lignes"] += nb_lignes
+                self._ajouter_duree(entree, stats, duree_ms)
+
+    def _ajouter_duree(self, entree, stats, duree_ms):
+        """Ajoute une durée à une requête (appelé sous le verrou)"""
+        entree["duree_ms"] += duree_ms
+        stats["duree_totale_ms"] += duree_ms
+        stats["duree_max_ms"] = max(stats["duree_max_ms"], entree["duree_ms"])
+        if not entree["lente"] and entree["duree_ms"] >= SEUIL_REQUETE_LENTE_MS:
+            entree["lente"] = True
+            self.requetes_lentes.append(entree)
+
+    def resume(self):
+        """Retourne un résumé court des requêtes enregistrées"""
+        with self._verrou:
+            return {
+                "requetes": self.nb_requetes,
+                "modeles": len(self.statistiques),
+                "lentes": len(self.requetes_lentes),
+                "n_plus_1": len(self.detections_n_plus_1),
+            }
+
+    def rapport(self):
+        """Retourne l'ensemble des mesures sous forme sérialisable en JSON"""
+        with self._verrou:
+            statistiques = sorted(
+                (
+                    dict(stats, methodes=sorted(m for m in stats["methodes"] if m))
+                    for stats in self.statistiques.values()
+                ),
+                key=lambda stats: stats["duree_totale_ms"],
+                reverse=True,
+            )
+            return {
+                "genere_le": datetime.datetime.now().isoformat(timespec="seconds"),
+                "seuils": {
+                    "requete_lente_ms": SEUIL_REQUETE_LENTE_MS,
+                    "n_plus_1": SEUIL_N_PLUS_1,
+                },
+                "nb_requetes": self.nb_requetes,
+                "statistiques": statistiques,
+                "requetes_lentes": [dict(e) for e in self.requetes_lentes],
+                "n_plus_1": [dict(d) for d in self.detections_n_plus_1],
+                "dernieres_requetes": [dict(e) for e in self.historique],
+            }
+
+    def exporter_json(self, chemin):
+        """Écrit le rapport dans un fichier JSON"""
+        with open(chemin, "w", encoding="utf-8") as fichier:
+            json.dump(self.rapport(), fichier, ensure_ascii=False, indent=2)
+
+
+# Créer l'instance unique accessible globalement
+PROFILEUR = ProfileurRequetes.instance()
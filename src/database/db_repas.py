@@ -1,7 +1,7 @@
 import traceback
 import sqlite3
 from .db_connector import DBConnector
-from .db_repas_types import RepasTypesManager
+from .db_migrations import ECART_ORDRE, REQUETE_REEQUILIBRAGE_ORDRES
 
 
 class RepasManager(DBConnector):
@@ -27,47 +27,28 @@ class RepasManager(DBConnector):
         """Ajoute un aliment à un repas avec sa quantité"""
         self.connect()
         try:
-            # Vérifier si l'aliment existe déjà dans ce repas
+            # Un aliment déjà présent dans le repas prend la nouvelle quantité
             self.cursor.execute(
                 """
-                SELECT id FROM repas_aliments 
-                WHERE repas_id = ? AND aliment_id = ?
+                INSERT INTO repas_aliments (repas_id, aliment_id, quantite, est_modifie)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (repas_id, aliment_id) DO UPDATE
+                SET quantite = excluded.quantite, est_modifie = excluded.est_modifie
+                RETURNING id
                 """,
-                (repas_id, aliment_id),
+                (repas_id, aliment_id, quantite, 1 if est_modifie else 0),
             )
-            existing = self.cursor.fetchone()
-
-            if existing:
-                # Mise à jour de la quantité
-                self.cursor.execute(
-                    """
-                    UPDATE repas_aliments 
-                    SET quantite = ?, est_modifie = ? 
-                    WHERE repas_id = ? AND aliment_id = ?
-                    """,
-                    (quantite, 1 if est_modifie else 0, repas_id, aliment_id),
-                )
-            else:
-                # Ajout d'un nouvel aliment
-                self.cursor.execute(
-                    """
-                    INSERT INTO repas_aliments (repas_id, aliment_id, quantite, est_modifie) 
-                    VALUES (?, ?, ?, ?)
-                    """,
-                    (repas_id, aliment_id, quantite, 1 if est_modifie else 0),
-                )
-
-            last_id = self.cursor.lastrowid
+            ligne_id = self.cursor.fetchone()[0]
             self.conn.commit()
-            self.disconnect()
-            return last_id
+            return ligne_id
         except sqlite3.Error as e:
             print(
                 f"Erreur lors de l'ajout de l'aliment {aliment_id} au repas {repas_id}: {e}"
             )
             self.conn.rollback()
-            self.disconnect()
             return 0
+        finally:
+            self.disconnect()
 
     def modifier_quantite_aliment_repas(self, repas_id, aliment_id, nouvelle_quantite):
         """Modifie la quantité d'un aliment dans un repas et marque comme personnalisé"""
@@ -119,7 +100,12 @@ class RepasManager(DBConnector):
         return result
 
     def get_repas_semaine(self, semaine_id=None):
-        """Récupère tous les repas d'une semaine spécifique avec leurs aliments"""
+        """Récupère tous les repas d'une semaine spécifique avec leurs aliments
+
+        La semaine est chargée en deux requêtes, quel que soit le nombre de repas :
+        les repas avec leurs totaux (GROUP BY) et leur multiplicateur de liste de
+        courses, puis tous leurs aliments.
+        """
         self.connect()
         jours = [
             "Lundi",
@@ -132,126 +118,143 @@ class RepasManager(DBConnector):
         ]
         result = {jour: [] for jour in jours}
 
-        # Récupérer tous les repas de la semaine spécifiée (ou sans numéro de semaine si None)
+        # Repas de la semaine spécifiée (ou sans numéro de semaine si None,
+        # comportement historique)
         if semaine_id is not None:
-            # Récupérer les repas pour la semaine spécifique
-            self.cursor.execute(
-                """
-                SELECT id, nom, jour, ordre, repas_type_id FROM repas 
-                WHERE semaine_id = ? 
-                ORDER BY jour, ordre
-                """,
-                (semaine_id,),
-            )
+            condition = "r.semaine_id = ?"
+            params = (semaine_id,)
         else:
-            # Récupérer les repas sans numéro de semaine (comportement historique)
-            self.cursor.execute(
-                """
-                SELECT id, nom, jour, ordre, repas_type_id FROM repas 
-                WHERE semaine_id IS NULL 
-                ORDER BY jour, ordre
-                """
-            )
+            condition = "r.semaine_id IS NULL"
+            params = ()
 
+        # Récupérer les repas avec leurs totaux calculés par SQLite
+        self.cursor.execute(
+            f"""
+            SELECT r.id, r.nom, r.jour, r.ordre, r.repas_type_id,
+                   COALESCE(rm.multiplicateur, 1) AS multiplicateur,
+                   COALESCE(rm.ignore_course, 0) AS ignore_course,
+                   COALESCE(SUM(a.calories * ra.quantite / 100.0), 0) AS total_calories,
+                   COALESCE(SUM(a.proteines * ra.quantite / 100.0), 0) AS total_proteines,
+                   COALESCE(SUM(a.glucides * ra.quantite / 100.0), 0) AS total_glucides,
+                   COALESCE(SUM(a.lipides * ra.quantite / 100.0), 0) AS total_lipides,
+                   COALESCE(SUM(COALESCE(a.prix_kg, 0) / 1000.0 * ra.quantite), 0) AS total_cout
+            FROM repas r
+            LEFT JOIN repas_aliments ra ON ra.repas_id = r.id
+            LEFT JOIN aliments a ON a.id = ra.aliment_id
+            LEFT JOIN repas_multiplicateurs rm ON rm.repas_id = r.id
+            WHERE {condition}
+            GROUP BY r.id
+            ORDER BY r.jour, r.ordre, r.id
+            """,
+            params,
+        )
         repas_list = [dict(row) for row in self.cursor.fetchall()]
 
-        for repas in repas_list:
-            # Récupérer les aliments pour ce repas
-            self.cursor.execute(
-                """
-            SELECT ra.quantite, a.* 
-            FROM repas_aliments ra
-            JOIN aliments a ON ra.aliment_id = a.id
-            WHERE ra.repas_id = ?
+        # Récupérer les aliments de tous les repas de la semaine en une fois
+        self.cursor.execute(
+            f"""
+            SELECT ra.repas_id, ra.quantite, a.*
+            FROM repas r
+            JOIN repas_aliments ra ON ra.repas_id = r.id
+            JOIN aliments a ON a.id = ra.aliment_id
+            WHERE {condition}
+            ORDER BY ra.repas_id, ra.id
             """,
-                (repas["id"],),
-            )
-
-            aliments = [dict(row) for row in self.cursor.fetchall()]
-            repas["aliments"] = aliments
-
-            # Calculer les totaux du repas
-            repas["total_calories"] = sum(
-                a["calories"] * a["quantite"] / 100 for a in aliments
-            )
-            repas["total_proteines"] = sum(
-                a["proteines"] * a["quantite"] / 100 for a in aliments
-            )
-            repas["total_glucides"] = sum(
-                a["glucides"] * a["quantite"] / 100 for a in aliments
-            )
-            repas["total_lipides"] = sum(
-                a["lipides"] * a["quantite"] / 100 for a in aliments
-            )
-            repas["total_cout"] = sum(
-                ((a.get("prix_kg", 0) or 0) / 1000) * a["quantite"] for a in aliments
-            )
+            params,
+        )
+        aliments_par_repas = {}
+        for row in self.cursor.fetchall():
+            aliment = dict(row)
+            aliments_par_repas.setdefault(aliment.pop("repas_id"), []).append(aliment)
 
+        # Les repas arrivent déjà triés par ordre dans chaque jour
+        for repas in repas_list:
+            repas["ignore_course"] = bool(repas["ignore_course"])
+            repas["aliments"] = aliments_par_repas.get(repas["id"], [])
             result[repas["jour"]].append(repas)
 
-        # Modifier le tri pour garantir le bon ordre
-        for jour in jours:
-            # Trier les repas explicitement par ordre
-            result[jour] = sorted(result[jour], key=lambda repas: repas["ordre"])
-
         self.disconnect()
         return result
 
-    def decaler_ordres(self, jour, semaine_id, ordre_insertion):
+    def _reequilibrer_jour(self, jour, semaine_id):
+        """Renumérote les ordres d'un jour en multiples de ECART_ORDRE (sans commit)"""
+        self.cursor.execute(
+            REQUETE_REEQUILIBRAGE_ORDRES.format(
+                ecart=ECART_ORDRE, filtre="WHERE jour = ? AND semaine_id = ?"
+            ),
+            (jour, semaine_id),
+        )
+
+    def _calculer_ordre(self, jour, semaine_id, position, repas_exclu=None):
         """
-        Décale les ordres des repas pour faire de la place à un nouveau repas
+        Calcule l'ordre d'un repas placé à une position dans un jour (sans commit)
 
         Args:
             jour: Le jour concerné
             semaine_id: ID de la semaine
-            ordre_insertion: L'ordre où le nouveau repas sera inséré
+            position: Position du repas dans la journée (1 pour le premier)
+            repas_exclu: ID du repas déplacé, ignoré parmi les repas du jour
 
-        Cette méthode augmente de 1 l'ordre de tous les repas dont l'ordre est >= ordre_insertion
+        L'ordre est pris au milieu de l'intervalle entre les deux voisins. Le jour
+        n'est rééquilibré, en une seule requête, que si l'intervalle est épuisé.
         """
-        self.connect()
-        self.cursor.execute(
-            """
-            UPDATE repas 
-            SET ordre = ordre + 1
-            WHERE jour = ? AND semaine_id = ? AND ordre >= ?
-            """,
-            (jour, semaine_id, ordre_insertion),
-        )
-        self.conn.commit()
-        self.disconnect()
+        for _ in range(2):
+            self.cursor.execute(
+                """
+                SELECT ordre FROM repas
+                WHERE jour = ? AND semaine_id = ? AND id IS NOT ?
+                ORDER BY ordre, id
+                """,
+                (jour, semaine_id, repas_exclu),
+            )
+            ordres = [row[0] for row in self.cursor.fetchall()]
 
-    def normaliser_ordres(self, jour, semaine_id):
-        """Réindexe les ordres pour qu'ils soient des entiers consécutifs (1, 2, 3...)"""
-        self.connect()
+            index = min(max(position, 1), len(ordres) + 1) - 1
+            avant = ordres[index - 1] if index > 0 else None
+            apres = ordres[index] if index < len(ordres) else None
 
-        # Récupérer tous les repas du jour, triés par ordre
-        self.cursor.execute(
-            """
-            SELECT id, ordre FROM repas 
-            WHERE jour = ? AND semaine_id = ?
-            ORDER BY ordre
-            """,
-            (jour, semaine_id),
-        )
+            if avant is None and apres is None:
+                return ECART_ORDRE
+            if apres is None:
+                return avant + ECART_ORDRE
+            if avant is None:
+                return apres - ECART_ORDRE
+            if apres - avant > 1:
+                return (avant + apres) // 2
 
-        repas_list = self.cursor.fetchall()
+            # Plus de place entre les deux voisins : rééquilibrer le jour
+            self._reequilibrer_jour(jour, semaine_id)
 
-        # Mettre à jour les ordres pour qu'ils soient consécutifs
-        for i, repas in enumerate(repas_list):
-            repas_id = repas[0]
-            nouvel_ordre = i + 1  # Commencer à 1
+        return ECART_ORDRE * (index + 1)
 
-            # Mettre à jour l'ordre seulement s'il est différent
-            if repas[1] != nouvel_ordre:
-                self.cursor.execute(
-                    """
-                    UPDATE repas SET ordre = ? WHERE id = ?
-                    """,
-                    (nouvel_ordre, repas_id),
-                )
+    def ordre_pour_position(self, jour, semaine_id, position):
+        """Retourne l'ordre à donner à un nouveau repas placé à une position du jour"""
+        self.connect()
+        try:
+            self.cursor.execute("BEGIN IMMEDIATE TRANSACTION")
+            ordre = self._calculer_ordre(jour, semaine_id, position)
+            self.conn.commit()
+            return ordre
+        except sqlite3.Error as e:
+            print(f"Erreur lors du calcul de l'ordre du repas: {e}")
+            self.conn.rollback()
+            return None
+        finally:
+            self.disconnect()
 
-        self.conn.commit()
-        self.disconnect()
+    def reequilibrer_ordres(self, jour, semaine_id):
+        """Renumérote les ordres d'un jour en multiples de ECART_ORDRE"""
+        self.connect()
+        try:
+            self._reequilibrer_jour(jour, semaine_id)
+            self.conn.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"Erreur lors du rééquilibrage des ordres du {jour}: {e}")
+            self.conn.rollback()
+            return False
+        finally:
+            self.disconnect()
 
     def get_semaines_existantes(self):
         """Récupère tous les IDs de semaines qui existent dans la base de données"""
@@ -268,154 +271,119 @@ class RepasManager(DBConnector):
         return semaines
 
     def generer_liste_courses(self, semaine_id=None):
-        """Génère une liste de courses organisée par magasin et catégorie pour une semaine donnée"""
+        """Génère une liste de courses organisée par magasin et catégorie pour une semaine donnée
+
+        Les quantités sont agrégées par SQLite en une seule requête : les repas
+        marqués "déjà préparés" (ignore_course) sont exclus et le multiplicateur
+        de chaque repas est appliqué à ses aliments.
+        """
         try:
-            # S'assurer que la connexion est bien établie avant d'exécuter des requêtes
             self.connect()
 
-            # Vérifier que la connexion et le curseur sont valides
-            if not self.conn or not self.cursor:
-                print("Erreur: Impossible d'établir une connexion à la base de données")
-                return {}
-
-            # Récupérer tous les repas pour la semaine choisie
+            # Filtrer sur la semaine choisie (toutes les semaines si None)
+            condition_semaine = ""
+            params = []
             if semaine_id is not None:
-                query = """
-                SELECT r.id, r.nom, r.jour 
-                FROM repas r
-                WHERE r.semaine_id = ?
-                """
-                params = [semaine_id]
-            else:
-                query = """
-                SELECT r.id, r.nom, r.jour 
-                FROM repas r
-                """
-                params = []
+                condition_semaine = "AND r.semaine_id = ?"
+                params.append(semaine_id)
 
-            self.cursor.execute(query, params)
-            repas_list = [dict(row) for row in self.cursor.fetchall()]
+            self.cursor.execute(
+                f"""
+                SELECT a.id, a.nom, a.marque, a.prix_kg,
+                       COALESCE(NULLIF(a.magasin, ''), 'Non spécifié') AS magasin,
+                       COALESCE(NULLIF(a.categorie, ''), 'Non catégorisé') AS categorie,
+                       SUM(ra.quantite * COALESCE(rm.multiplicateur, 1)) AS quantite
+                FROM repas r
+                JOIN repas_aliments ra ON ra.repas_id = r.id
+                JOIN aliments a ON a.id = ra.aliment_id
+                LEFT JOIN repas_multiplicateurs rm ON rm.repas_id = r.id
+                WHERE COALESCE(rm.ignore_course, 0) = 0 {condition_semaine}
+                GROUP BY a.id
+                ORDER BY MIN(ra.repas_id), MIN(ra.id)
+                """,
+                params,
+            )
 
-            # Organiser par magasin et catégorie
+            # Organiser par magasin et catégorie (ordre de première apparition)
             liste_courses = {}
-
-            # Pour chaque repas, récupérer et ajuster les aliments
-            for repas in repas_list:
-                repas_id = repas["id"]
-
-                # Obtenir les informations sur le multiplicateur du repas
-                multi_info = self.get_repas_multiplicateur(repas_id)
-
-                # Sauter ce repas s'il est marqué comme "déjà préparé"
-                if multi_info.get("ignore_course", False):
-                    continue
-
-                # Facteur multiplicateur
-                multiplicateur = multi_info.get("multiplicateur", 1)
-
-                # Récupérer les aliments du repas
-                self.connect()  # S'assurer que la connexion est active
-                self.cursor.execute(
-                    """
-                    SELECT a.id, a.nom, a.marque, a.categorie, a.magasin, a.prix_kg, ra.quantite
-                    FROM repas_aliments ra
-                    JOIN aliments a ON ra.aliment_id = a.id
-                    WHERE ra.repas_id = ?
-                    """,
-                    (repas_id,),
+            for row in self.cursor.fetchall():
+                aliment = dict(row)
+                magasin = aliment.pop("magasin")
+                categorie = aliment.pop("categorie")
+                liste_courses.setdefault(magasin, {}).setdefault(categorie, []).append(
+                    aliment
                 )
 
-                aliments = self.cursor.fetchall()
-
-                # Ajouter les aliments à la liste de courses
-                for aliment in aliments:
-                    id_aliment, nom, marque, categorie, magasin, prix_kg, quantite = (
-                        aliment
-                    )
-
-                    # Ajuster la quantité selon le multiplicateur
-                    quantite_ajustee = quantite * multiplicateur
-
-                    # Utiliser "Non spécifié" si le magasin est null
-                    magasin = magasin or "Non spécifié"
-                    categorie = categorie or "Non catégorisé"
-
-                    if magasin not in liste_courses:
-                        liste_courses[magasin] = {}
-
-                    if categorie not in liste_courses[magasin]:
-                        liste_courses[magasin][categorie] = []
-
-                    # Vérifier si l'aliment existe déjà dans la liste
-                    aliment_existe = False
-                    for item in liste_courses[magasin][categorie]:
-                        if item["id"] == id_aliment:
-                            item["quantite"] += quantite_ajustee
-                            aliment_existe = True
-                            break
-
-                    if not aliment_existe:
-                        liste_courses[magasin][categorie].append(
-                            {
-                                "id": id_aliment,
-                                "nom": nom,
-                                "marque": marque,
-                                "prix_kg": prix_kg,
-                                "quantite": quantite_ajustee,
-                            }
-                        )
-
             return liste_courses
         except sqlite3.Error as e:
             print(f"Erreur lors de la génération de la liste de courses: {e}")
             traceback.print_exc()
             return {}
         finally:
-            # S'assurer de fermer proprement la connexion
-            if hasattr(self, "conn") and self.conn:
-                self.disconnect()
+            self.disconnect()
 
     def update_repas_based_on_recipe(self, repas_type_id):
-        """Met à jour tous les repas basés sur la recette spécifiée"""
-        self.connect()
-
-        repas_types_manager = RepasTypesManager(self.db_file)
-        recette = repas_types_manager.get_repas_type(repas_type_id)
-
-        self.cursor.execute(
-            """
-            SELECT id, nom, jour, ordre, semaine_id
-            FROM repas
-            WHERE repas_type_id = ?
-            """,
-            (repas_type_id,),
-        )
+        """
+        Met à jour tous les repas basés sur la recette spécifiée
 
-        repas_list = [dict(row) for row in self.cursor.fetchall()]
+        Les ingrédients de tous les repas de la recette sont remplacés en une
+        transaction : un DELETE pour l'ensemble des repas, puis un INSERT ... SELECT
+        depuis les ingrédients de la recette (un aliment présent plusieurs fois dans
+        la recette n'occupe qu'une ligne du repas).
 
-        for repas in repas_list:
-            repas_id = repas["id"]
+        Returns:
+            list: IDs des semaines dont des repas ont été mis à jour, ou False en cas d'erreur
+        """
+        self.connect()
+        try:
+            self.cursor.execute("BEGIN IMMEDIATE TRANSACTION")
 
-            # Supprimer tous les ingrédients existants
             self.cursor.execute(
-                "DELETE FROM repas_aliments WHERE repas_id = ?", (repas_id,)
+                """
+                SELECT DISTINCT semaine_id FROM repas
+                WHERE repas_type_id = ?
+                ORDER BY semaine_id
+                """,
+                (repas_type_id,),
             )
+            semaines = [row[0] for row in self.cursor.fetchall()]
 
-            # Ajouter les ingrédients de la recette mise à jour
-            for aliment in recette["aliments"]:
+            if semaines:
+                # Supprimer les ingrédients existants de tous les repas de la recette
+                self.cursor.execute(
+                    """
+                    DELETE FROM repas_aliments
+                    WHERE repas_id IN (SELECT id FROM repas WHERE repas_type_id = ?)
+                    """,
+                    (repas_type_id,),
+                )
+
+                # Ajouter les ingrédients de la recette mise à jour à chaque repas
                 self.cursor.execute(
                     """
                     INSERT INTO repas_aliments (repas_id, aliment_id, quantite)
-                    VALUES (?, ?, ?)
+                    SELECT r.id, rta.aliment_id, SUM(rta.quantite)
+                    FROM repas r
+                    JOIN repas_types_aliments rta ON rta.repas_type_id = r.repas_type_id
+                    WHERE r.repas_type_id = ?
+                    GROUP BY r.id, rta.aliment_id
+                    ORDER BY r.id, MIN(rta.id)
                     """,
-                    (repas_id, aliment["id"], aliment["quantite"]),
+                    (repas_type_id,),
                 )
 
-        self.conn.commit()
-        self.disconnect()
+            self.conn.commit()
+            return semaines
+
+        except sqlite3.Error as e:
+            print(
+                f"Erreur lors de la mise à jour des repas de la recette {repas_type_id}: {e}"
+            )
+            self.conn.rollback()
+            return False
 
-        # Retourner le nombre de repas mis à jour
-        return len(repas_list)
+        finally:
+            self.disconnect()
 
     def supprimer_repas(self, repas_id):
         """Supprime un repas et ses aliments associés"""
@@ -439,26 +407,134 @@ class RepasManager(DBConnector):
 
         return rows_affected
 
-    def changer_jour_repas(self, repas_id, nouveau_jour, nouvel_ordre):
-        """Change le jour et l'ordre d'un repas"""
+    def dupliquer_semaine(self, semaine_source, semaines_cibles, jours=None):
+        """
+        Copie les repas d'une semaine vers une ou plusieurs semaines en une transaction
+
+        Les repas, leurs aliments et leurs multiplicateurs sont copiés par des
+        INSERT ... SELECT. Les nouveaux ID de repas sont attribués à la suite du
+        plus grand ID existant, dans l'ordre des repas source, ce qui permet de
+        retrouver la correspondance ancien/nouvel ID sans relire les repas.
+
+        Args:
+            semaine_source: ID de la semaine à copier
+            semaines_cibles: ID de la semaine cible ou liste d'ID de semaines cibles
+                (les doublons sont ignorés)
+            jours: Liste des jours à copier (tous les jours si None)
+
+        Returns:
+            int: Nombre de repas créés, ou False en cas d'erreur
+        """
+        if isinstance(semaines_cibles, int):
+            semaines_cibles = [semaines_cibles]
+        # Une semaine cible répétée ne doit être remplie qu'une fois
+        semaines_cibles = list(dict.fromkeys(semaines_cibles))
+
+        filtre_jours = ""
+        params_jours = []
+        if jours is not None:
+            if not jours:
+                return 0
+            filtre_jours = f"AND jour IN ({', '.join('?' for _ in jours)})"
+            params_jours = list(jours)
+
+        # Correspondance entre les repas source et les ID qu'ils auront dans la cible
+        correspondance = f"""
+            WITH correspondance AS (
+                SELECT id AS ancien_id,
+                       ? + ROW_NUMBER() OVER (ORDER BY id) AS nouvel_id
+                FROM repas
+                WHERE semaine_id = ? {filtre_jours}
+            )
+        """
+
+        self.connect()
+        try:
+            self.cursor.execute("BEGIN IMMEDIATE TRANSACTION")
+            nb_repas = 0
+
+            for semaine_cible in semaines_cibles:
+                if semaine_cible == semaine_source:
+                    continue
+
+                self.cursor.execute("SELECT COALESCE(MAX(id), 0) FROM repas")
+                base_id = self.cursor.fetchone()[0]
+                params = [base_id, semaine_source] + params_jours
+
+                self.cursor.execute(
+                    correspondance
+                    + """
+                    INSERT INTO repas (id, nom, jour, ordre, semaine_id, repas_type_id)
+                    SELECT c.nouvel_id, r.nom, r.jour, r.ordre, ?, r.repas_type_id
+                    FROM correspondance c
+                    JOIN repas r ON r.id = c.ancien_id
+                    ORDER BY c.nouvel_id
+                    """,
+                    params + [semaine_cible],
+                )
+                # rowcount n'est pas renseigné pour une requête commençant par WITH
+                self.cursor.execute("SELECT changes()")
+                nb_repas += self.cursor.fetchone()[0]
+
+                self.cursor.execute(
+                    correspondance
+                    + """
+                    INSERT INTO repas_aliments (repas_id, aliment_id, quantite, est_modifie)
+                    SELECT c.nouvel_id, ra.aliment_id, ra.quantite, ra.est_modifie
+                    FROM correspondance c
+                    JOIN repas_aliments ra ON ra.repas_id = c.ancien_id
+                    ORDER BY ra.id
+                    """,
+                    params,
+                )
+
+                self.cursor.execute(
+                    correspondance
+                    + """
+                    INSERT INTO repas_multiplicateurs (repas_id, multiplicateur, ignore_course)
+                    SELECT c.nouvel_id, rm.multiplicateur, rm.ignore_course
+                    FROM correspondance c
+                    JOIN repas_multiplicateurs rm ON rm.repas_id = c.ancien_id
+                    """,
+                    params,
+                )
+
+            self.conn.commit()
+            return nb_repas
+
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la duplication de la semaine {semaine_source}: {e}")
+            self.conn.rollback()
+            return False
+
+        finally:
+            self.disconnect()
+
+    def changer_jour_repas(self, repas_id, nouveau_jour, position):
+        """
+        Déplace un repas à une position d'un jour de sa semaine
+
+        Dans le cas courant, seule la ligne du repas déplacé est modifiée :
+        les autres repas gardent leur ordre.
+        """
         self.connect()
         try:
             # Lancer une transaction pour optimiser les performances
-            self.cursor.execute("BEGIN TRANSACTION")
+            self.cursor.execute("BEGIN IMMEDIATE TRANSACTION")
 
-            # Obtenir le jour et l'ordre actuels du repas
+            # Obtenir la semaine du repas
             self.cursor.execute(
-                "SELECT jour, ordre FROM repas WHERE id = ?", (repas_id,)
+                "SELECT semaine_id FROM repas WHERE id = ?", (repas_id,)
             )
             result = self.cursor.fetchone()
 
             if not result:
                 self.conn.rollback()
-                self.disconnect()
                 return False
 
-            jour_origine = result["jour"]
-            ordre_origine = result["ordre"]
+            nouvel_ordre = self._calculer_ordre(
+                nouveau_jour, result["semaine_id"], position, repas_exclu=repas_id
+            )
 
             # Mettre à jour le repas
             self.cursor.execute(
@@ -470,17 +546,6 @@ class RepasManager(DBConnector):
                 (nouveau_jour, nouvel_ordre, repas_id),
             )
 
-            # Réorganiser les ordres dans le jour d'origine
-            if jour_origine != nouveau_jour:
-                self.cursor.execute(
-                    """
-                    UPDATE repas
-                    SET ordre = ordre - 1
-                    WHERE jour = ? AND ordre > ?
-                    """,
-                    (jour_origine, ordre_origine),
-                )
-
             # Valider la transaction
             self.conn.commit()
             return True
@@ -514,8 +579,18 @@ class RepasManager(DBConnector):
         """Récupère un repas par son ID avec ses informations et aliments"""
         self.connect()
 
-        # Récupérer les informations de base du repas
-        self.cursor.execute("SELECT * FROM repas WHERE id = ?", (repas_id,))
+        # Récupérer les informations de base du repas et son multiplicateur
+        self.cursor.execute(
+            """
+            SELECT r.*,
+                   COALESCE(rm.multiplicateur, 1) AS multiplicateur,
+                   COALESCE(rm.ignore_course, 0) AS ignore_course
+            FROM repas r
+            LEFT JOIN repas_multiplicateurs rm ON rm.repas_id = r.id
+            WHERE r.id = ?
+            """,
+            (repas_id,),
+        )
         result = self.cursor.fetchone()
 
         if not result:
@@ -523,6 +598,7 @@ class RepasManager(DBConnector):
             return None
 
         repas = dict(result)
+        repas["ignore_course"] = bool(repas["ignore_course"])
 
         # Récupérer les aliments pour ce repas
         self.cursor.execute(
@@ -531,6 +607,7 @@ class RepasManager(DBConnector):
             FROM repas_aliments ra
             JOIN aliments a ON ra.aliment_id = a.id
             WHERE ra.repas_id = ?
+            ORDER BY ra.id
             """,
             (repas_id,),
         )
@@ -2,6 +2,31 @@ import traceback
 import sqlite3
 from .db_connector import DBConnector
 
+# Totaux nutritionnels d'un repas type, calculés par la requête de liste
+_TOTAUX_REPAS_TYPE = ", ".join(
+    f"COALESCE(SUM(a.{nutriment} * rta.quantite / 100.0), 0) AS total_{nutriment}"
+    for nutriment in ("calories", "proteines", "glucides", "lipides")
+)
+
+
+def requete_liste_repas_types(conditions=()):
+    """Requête des repas types avec leurs totaux et le nom et la couleur de leur catégorie
+
+    Une seule requête agrégée remplace la lecture des aliments de chaque recette.
+    """
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return f"""
+        SELECT rt.*, cr.nom AS categorie_nom, cr.couleur AS categorie_couleur,
+               {_TOTAUX_REPAS_TYPE}
+        FROM repas_types rt
+        LEFT JOIN categories_repas cr ON cr.id = rt.categorie_id
+        LEFT JOIN repas_types_aliments rta ON rta.repas_type_id = rt.id
+        LEFT JOIN aliments a ON a.id = rta.aliment_id
+        {where}
+        GROUP BY rt.id
+        ORDER BY rt.nom
+    """
+
 
 class RepasTypesManager(DBConnector):
     """Gestion des repas types (recettes) dans la base de données"""
@@ -86,40 +111,13 @@ class RepasTypesManager(DBConnector):
         self.disconnect()
 
     def get_repas_types(self):
-        """Récupère tous les repas types"""
+        """Récupère tous les repas types avec leurs totaux et leur catégorie
+
+        Les aliments ne sont pas chargés : voir get_repas_type pour le détail d'une recette.
+        """
         self.connect()
-        self.cursor.execute("SELECT * FROM repas_types ORDER BY nom")
+        self.cursor.execute(requete_liste_repas_types())
         result = [dict(row) for row in self.cursor.fetchall()]
-
-        # Récupérer les aliments et calculer les totaux pour chaque repas type
-        for repas_type in result:
-            self.cursor.execute(
-                """
-            SELECT rta.quantite, a.* 
-            FROM repas_types_aliments rta
-            JOIN aliments a ON rta.aliment_id = a.id
-            WHERE rta.repas_type_id = ?
-            """,
-                (repas_type["id"],),
-            )
-
-            aliments = [dict(row) for row in self.cursor.fetchall()]
-            repas_type["aliments"] = aliments
-
-            # Calculer les totaux du repas
-            repas_type["total_calories"] = sum(
-                a["calories"] * a["quantite"] / 100 for a in aliments
-            )
-            repas_type["total_proteines"] = sum(
-                a["proteines"] * a["quantite"] / 100 for a in aliments
-            )
-            repas_type["total_glucides"] = sum(
-                a["glucides"] * a["quantite"] / 100 for a in aliments
-            )
-            repas_type["total_lipides"] = sum(
-                a["lipides"] * a["quantite"] / 100 for a in aliments
-            )
-
         self.disconnect()
         return result
 
@@ -136,6 +134,7 @@ class RepasTypesManager(DBConnector):
         FROM repas_types_aliments rta
         JOIN aliments a ON rta.aliment_id = a.id
         WHERE rta.repas_type_id = ?
+        ORDER BY rta.id
         """,
             (repas_type_id,),
         )
@@ -218,22 +217,24 @@ class RepasTypesManager(DBConnector):
         # Utiliser le nom personnalisé s'il est fourni, sinon utiliser le nom de la recette
         nom_repas = nom_personnalise if nom_personnalise else repas_type["nom"]
 
-        # Créer le repas avec le numéro de semaine et le nom approprié
-        # Important : ajouter aussi l'ID de la recette pour pouvoir suivre les modifications
-        repas_id = repas_manager.ajouter_repas(
-            nom_repas,
-            jour,
-            ordre,
-            semaine_id,
-            repas_type_id,  # Stocker l'ID de la recette dans le repas
-        )
-
-        # Ajouter tous les aliments du repas type au nouveau repas
-        for aliment in repas_type["aliments"]:
-            repas_manager.ajouter_aliment_repas(
-                repas_id, aliment["id"], aliment["quantite"]
+        # Créer le repas et ses aliments en une seule transaction
+        with self.batch():
+            # Créer le repas avec le numéro de semaine et le nom approprié
+            # Important : ajouter aussi l'ID de la recette pour pouvoir suivre les modifications
+            repas_id = repas_manager.ajouter_repas(
+                nom_repas,
+                jour,
+                ordre,
+                semaine_id,
+                repas_type_id,  # Stocker l'ID de la recette dans le repas
             )
 
+            # Ajouter tous les aliments du repas type au nouveau repas
+            for aliment in repas_type["aliments"]:
+                repas_manager.ajouter_aliment_repas(
+                    repas_id, aliment["id"], aliment["quantite"]
+                )
+
         return repas_id
 
     def appliquer_repas_type_au_jour_avec_facteurs(
@@ -249,21 +250,22 @@ class RepasTypesManager(DBConnector):
 
         repas_type = self.get_repas_type(repas_type_id)
 
-        # Créer le repas avec le numéro de semaine
-        repas_id = repas_manager.ajouter_repas(
-            repas_type["nom"], jour, ordre, semaine_id
-        )
-
-        # Ajouter tous les aliments du repas type au nouveau repas avec les quantités ajustées
-        for aliment in repas_type["aliments"]:
-            facteur = facteurs_quantite.get(
-                aliment["id"], 1.0
-            )  # 1.0 par défaut si pas de facteur
-            quantite_ajustee = aliment["quantite"] * facteur
-            repas_manager.ajouter_aliment_repas(
-                repas_id, aliment["id"], quantite_ajustee
+        with self.batch():
+            # Créer le repas avec le numéro de semaine
+            repas_id = repas_manager.ajouter_repas(
+                repas_type["nom"], jour, ordre, semaine_id
             )
 
+            # Ajouter tous les aliments du repas type au nouveau repas avec les quantités ajustées
+            for aliment in repas_type["aliments"]:
+                facteur = facteurs_quantite.get(
+                    aliment["id"], 1.0
+                )  # 1.0 par défaut si pas de facteur
+                quantite_ajustee = aliment["quantite"] * facteur
+                repas_manager.ajouter_aliment_repas(
+                    repas_id, aliment["id"], quantite_ajustee
+                )
+
         return repas_id
 
     def appliquer_recette_modifiee_au_jour(
@@ -277,17 +279,18 @@ class RepasTypesManager(DBConnector):
         # Récupérer la recette de base pour avoir son nom
         recette_base = self.get_repas_type(recette_base_id)
 
-        # Créer le repas avec le numéro de semaine
-        repas_id = repas_manager.ajouter_repas(
-            recette_base["nom"], jour, ordre, semaine_id
-        )
-
-        # Ajouter tous les ingrédients avec les bonnes quantités
-        for ingredient in liste_ingredients:
-            repas_manager.ajouter_aliment_repas(
-                repas_id, ingredient["id"], ingredient["quantite"]
+        with self.batch():
+            # Créer le repas avec le numéro de semaine
+            repas_id = repas_manager.ajouter_repas(
+                recette_base["nom"], jour, ordre, semaine_id
             )
 
+            # Ajouter tous les ingrédients avec les bonnes quantités
+            for ingredient in liste_ingredients:
+                repas_manager.ajouter_aliment_repas(
+                    repas_id, ingredient["id"], ingredient["quantite"]
+                )
+
         return repas_id
 
     def set_categorie_repas_type(self, repas_type_id, categorie_id):
@@ -321,54 +324,26 @@ class RepasTypesManager(DBConnector):
         return rows_affected
 
     def get_repas_types_filtres(self, categorie_id=None, recherche=None):
-        """Récupère les repas types filtrés par catégorie et/ou terme de recherche"""
+        """Récupère les repas types filtrés par catégorie et/ou terme de recherche
+
+        Comme get_repas_types, une seule requête retourne les totaux et la catégorie
+        de chaque repas type, sans ses aliments.
+        """
         self.connect()
 
-        query = "SELECT * FROM repas_types WHERE 1=1"
+        conditions = []
         params = []
 
         if categorie_id is not None:
-            query += " AND categorie_id = ? "
+            conditions.append("rt.categorie_id = ?")
             params.append(categorie_id)
 
         if recherche:
-            query += " AND (nom LIKE ? OR description LIKE ?)"
+            conditions.append("(rt.nom LIKE ? OR rt.description LIKE ?)")
             recherche_param = f"%{recherche}%"
             params.extend([recherche_param, recherche_param])
 
-        query += " ORDER BY nom"
-
-        self.cursor.execute(query, params)
+        self.cursor.execute(requete_liste_repas_types(conditions), params)
         result = [dict(row) for row in self.cursor.fetchall()]
-
-        # Récupérer les aliments et calculer les totaux pour chaque repas type
-        for repas_type in result:
-            self.cursor.execute(
-                """
-                SELECT rta.quantite, a.* 
-                FROM repas_types_aliments rta
-                JOIN aliments a ON rta.aliment_id = a.id
-                WHERE rta.repas_type_id = ?
-                """,
-                (repas_type["id"],),
-            )
-
-            aliments = [dict(row) for row in self.cursor.fetchall()]
-            repas_type["aliments"] = aliments
-
-            # Calculer les totaux du repas
-            repas_type["total_calories"] = sum(
-                a["calories"] * a["quantite"] / 100 for a in aliments
-            )
-            repas_type["total_proteines"] = sum(
-                a["proteines"] * a["quantite"] / 100 for a in aliments
-            )
-            repas_type["total_glucides"] = sum(
-                a["glucides"] * a["quantite"] / 100 for a in aliments
-            )
-            repas_type["total_lipides"] = sum(
-                a["lipides"] * a["quantite"] / 100 for a in aliments
-            )
-
         self.disconnect()
         return result
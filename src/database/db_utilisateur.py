@@ -1,5 +1,5 @@
 import sqlite3
-from .db_connector import DBConnector
+from .db_connector import DBConnector, PROFIL_PRAGMA_DEFAUT
 
 
 class UserManager(DBConnector):
@@ -353,3 +353,59 @@ class UserManager(DBConnector):
         if result and result["theme_actif"]:
             return result["theme_actif"]
         return "Vert Nature"  # Thème par défaut
+
+    def save_db_profile(self, profile_name):
+        """Sauvegarde le profil de performance SQLite choisi par l'utilisateur"""
+        self.connect()
+
+        # Vérifier s'il existe un utilisateur
+        self.cursor.execute("SELECT id FROM utilisateur LIMIT 1")
+        user = self.cursor.fetchone()
+
+        if user:
+            self.cursor.execute(
+                "UPDATE utilisateur SET profil_db = ? WHERE id = ?",
+                (profile_name, user["id"]),
+            )
+        else:
+            self.cursor.execute(
+                "INSERT INTO utilisateur (profil_db) VALUES (?)", (profile_name,)
+            )
+
+        self.conn.commit()
+        self.disconnect()
+        return True
+
+    def get_db_profile(self):
+        """Récupère le profil de performance SQLite de l'utilisateur"""
+        self.connect()
+        self.cursor.execute("SELECT profil_db FROM utilisateur LIMIT 1")
+        result = self.cursor.fetchone()
+        self.disconnect()
+
+        if result and result["profil_db"]:
+            return result["profil_db"]
+        return PROFIL_PRAGMA_DEFAUT
+
+    def get_version_et_profil_db(self):
+        """Lit en une seule requête la version du schéma et le profil SQLite
+
+        Returns:
+            tuple: (version, profil) ; profil vaut None tant qu'aucun utilisateur n'existe
+        """
+        self.connect()
+        try:
+            self.cursor.execute(
+                """
+                SELECT (SELECT user_version FROM pragma_user_version),
+                       (SELECT COALESCE(NULLIF(profil_db, ''), ?) FROM utilisateur LIMIT 1)
+                """,
+                (PROFIL_PRAGMA_DEFAUT,),
+            )
+            version, profil = self.cursor.fetchone()
+            return version, profil
+        except sqlite3.Error:
+            # Base vide ou antérieure à la colonne profil_db : elle doit être migrée
+            return 0, None
+        finally:
+            self.disconnect()
@@ -0,0 +1,226 @@
+"""
+Profil du démarrage de l'application
+
+Activé par la variable d'environnement HEALTHFOOD_PROFIL_DEMARRAGE ou l'option
+--profil-demarrage, il mesure :
+- la durée de chaque phase du démarrage (imports, base de données, thème, fenêtre...)
+- le temps de construction de chaque onglet
+- le temps d'import de chaque module (cumulé et propre, comme python -X importtime)
+
+Le rapport est écrit dans un fichier JSON pour comparer les versions entre elles.
+
+Ce module n'utilise que la bibliothèque standard et se trouve hors de src.utils
+(dont l'import charge PySide6) : main.py l'importe en premier pour que les
+imports suivants soient mesurés.
+"""
+
+import os
+import sys
+import json
+import time
+import datetime
+from contextlib import contextmanager
+
+VARIABLE_ENVIRONNEMENT = "HEALTHFOOD_PROFIL_DEMARRAGE"
+OPTION_LIGNE_COMMANDE = "--profil-demarrage"
+NB_IMPORTS_AFFICHES = 15  # Modules les plus lents affichés dans la console
+
+
+def _lire_activation():
+    """Retourne (actif, chemin du rapport ou None) selon l'option ou la variable d'environnement"""
+    for argument in sys.argv[1:]:
+        if argument == OPTION_LIGNE_COMMANDE:
+            return True, None
+        if argument.startswith(OPTION_LIGNE_COMMANDE + "="):
+            return True, argument.split("=", 1)[1] or None
+
+    valeur = os.environ.get(VARIABLE_ENVIRONNEMENT, "").strip()
+    if not valeur or valeur.lower() in ("0", "false", "non"):
+        return False, None
+    if valeur.lower() in ("1", "true", "oui"):
+        return True, None
+    return True, valeur
+
+
+class _ChargeurMesure:
+    """Chargeur de module qui mesure la création et l'exécution du module"""
+
+    def __init__(self, chargeur, profil):
+        self._chargeur = chargeur
+        self._profil = profil
+
+    def __getattr__(self, nom):
+        return getattr(self._chargeur, nom)
+
+    def create_module(self, spec):
+        # Le chargement d'une extension compilée a lieu ici : il est compté dans l'import
+        self._profil.debut_import(spec.name)
+        return self._chargeur.create_module(spec)
+
+    def exec_module(self, module):
+        try:
+            self._chargeur.exec_module(module)
+        finally:
+            self._profil.fin_import(module.__name__)
+
+
+class _ChercheurMesure:
+    """Chercheur placé en tête de sys.meta_path qui enveloppe les chargeurs"""
+
+    def __init__(self, profil):
+        self._profil = profil
+
+    def find_spec(self, fullname, path=None, target=None):
+        for chercheur in sys.meta_path:
+            if chercheur is self or not hasattr(chercheur, "find_spec"):
+                continue
+            spec = chercheur.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _ChargeurMesure(spec.loader, self._profil)
+            return spec
+        return None
+
+
+class ProfilDemarrage:
+    """Mesures du démarrage de l'application (Singleton)"""
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = ProfilDemarrage()
+        return cls._instance
+
+    def __init__(self):
+        self.actif, self.chemin_rapport = _lire_activation()
+        self.debut = time.perf_counter()
+        self.phases = []  # [(nom, début en ms depuis self.debut, durée en ms)]
+        self.onglets = {}  # {attribut: durée de construction en ms}
+        self.imports = {}  # {module: {"cumule_ms", "propre_ms"}}
+        self._pile_imports = []  # [nom, début, durée des imports imbriqués]
+        self._chercheur = None
+
+        if self.actif:
+            self._chercheur = _ChercheurMesure(self)
+            sys.meta_path.insert(0, self._chercheur)
+
+    def maintenant(self):
+        return time.perf_counter()
+
+    def debut_import(self, nom):
+        self._pile_imports.append([nom, time.perf_counter(), 0.0])
+
+    def fin_import(self, nom):
+        # Un module sans create_module mesuré (chargeur particulier) n'est pas empilé
+        if not self._pile_imports or self._pile_imports[-1][0] != nom:
+            return
+        _, debut, imbriques = self._pile_imports.pop()
+        cumule = (time.perf_counter() - debut) * 1000
+        self.imports[nom] = {"cumule_ms": cumule, "propre_ms": cumule - imbriques}
+        if self._pile_imports:
+            self._pile_imports[-1][2] += cumule
+
+    def ajouter_phase(self, nom, debut, fin=None):
+        """Enregistre une phase à partir de ses instants perf_counter"""
+        if not self.actif:
+            return
+        fin = time.perf_counter() if fin is None else fin
+        self.phases.append(
+            (nom, (debut - self.debut) * 1000, (fin - debut) * 1000)
+        )
+
+    @contextmanager
+    def phase(self, nom):
+        """Mesure la durée du bloc with comme une phase du démarrage"""
+        debut = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.ajouter_phase(nom, debut)
+
+    def ajouter_onglets(self, temps_onglets):
+        """Enregistre les temps de construction des onglets (MainWindow.temps_onglets)"""
+        if self.actif:
+            self.onglets.update(temps_onglets)
+
+    def rapport(self, version=None):
+        """Retourne les mesures sous forme sérialisable en JSON"""
+        imports = sorted(
+            (
+                {"module": nom, **mesures}
+                for nom, mesures in self.imports.items()
+            ),
+            key=lambda mesure: mesure["cumule_ms"],
+            reverse=True,
+        )
+        return {
+            "version": version,
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "plateforme": sys.platform,
+            "total_ms": (time.perf_counter() - self.debut) * 1000,
+            "phases": [
+                {"nom": nom, "debut_ms": debut, "duree_ms": duree}
+                for nom, debut, duree in self.phases
+            ],
+            "onglets_ms": self.onglets,
+            "imports": imports,
+        }
+
+    def terminer(self, dossier_defaut, version=None):
+        """Arrête la mesure des imports, affiche le résumé et écrit le rapport
+
+        Returns:
+            str: Chemin du rapport écrit, ou None
+        """
+        if not self.actif:
+            return None
+
+        if self._chercheur in sys.meta_path:
+            sys.meta_path.remove(self._chercheur)
+
+        rapport = self.rapport(version)
+        print(self.resume(rapport))
+
+        chemin = self.chemin_rapport
+        if chemin is None:
+            horodatage = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            chemin = os.path.join(
+                dossier_defaut, f"profil_demarrage_{version or 'dev'}_{horodatage}.json"
+            )
+        try:
+            with open(chemin, "w", encoding="utf-8") as fichier:
+                json.dump(rapport, fichier, ensure_ascii=False, indent=2)
+            print(f"Rapport de démarrage écrit dans {chemin}")
+            return chemin
+        except OSError as e:
+            print(f"Impossible d'écrire le rapport de démarrage: {e}")
+            return None
+
+    def resume(self, rapport):
+        """Retourne le résumé lisible d'un rapport"""
+        lignes = [f"Profil du démarrage ({rapport['total_ms']:.0f} ms au total):"]
+        for phase in rapport["phases"]:
+            lignes.append(
+                f"    {phase['nom']:<40} {phase['duree_ms']:>8.0f} ms "
+                f"(à {phase['debut_ms']:.0f} ms)"
+            )
+        if rapport["onglets_ms"]:
+            lignes.append("  Onglets construits:")
+            for attribut, duree in rapport["onglets_ms"].items():
+                lignes.append(f"    {attribut:<40} {duree:>8.0f} ms")
+        if rapport["imports"]:
+            lignes.append(f"  Imports les plus longs ({len(rapport['imports'])} modules):")
+            for mesure in rapport["imports"][:NB_IMPORTS_AFFICHES]:
+                lignes.append(
+                    f"    {mesure['module']:<40} {mesure['cumule_ms']:>8.1f} ms "
+                    f"(propre {mesure['propre_ms']:.1f} ms)"
+                )
+        return "\n".join(lignes)
+
+
+# Créer l'instance unique accessible globalement
+PROFIL_DEMARRAGE = ProfilDemarrage.instance()
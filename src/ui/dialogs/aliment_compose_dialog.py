@@ -231,6 +231,8 @@ class AlimentComposeDialog(QDialog):
         btn_layout = QHBoxLayout()
         btn_add = QPushButton("Ajouter un ingrédient")
         btn_add.clicked.connect(self.ajouter_ingredient)
+        btn_add_compose = QPushButton("Ajouter un aliment composé")
+        btn_add_compose.clicked.connect(self.ajouter_sous_compose)
         btn_remove = QPushButton("Supprimer")
         btn_remove.clicked.connect(self.supprimer_ingredient)
 
@@ -239,6 +241,7 @@ class AlimentComposeDialog(QDialog):
         btn_edit.clicked.connect(self.modifier_quantite_ingredient)
 
         btn_layout.addWidget(btn_add)
+        btn_layout.addWidget(btn_add_compose)
         btn_layout.addWidget(btn_edit)
         btn_layout.addWidget(btn_remove)
 
@@ -316,8 +319,9 @@ class AlimentComposeDialog(QDialog):
 
             # Nom
             nom_item = QTableWidgetItem(ingredient["nom"])
-            # Stocker l'ID comme donnée utilisateur
+            # Stocker l'ID comme donnée utilisateur (aliment ou sous-composé)
             nom_item.setData(Qt.UserRole + 1, ingredient["aliment_id"])
+            nom_item.setData(Qt.UserRole + 2, ingredient.get("sous_compose_id"))
             self.ingredients_table.setItem(i, 0, nom_item)
 
             # Quantité
@@ -472,6 +476,54 @@ class AlimentComposeDialog(QDialog):
                 self.actualiser_tableau_ingredients()
                 self.actualiser_valeurs_nutritionnelles()
 
+    def ajouter_sous_compose(self):
+        """Ouvre un dialogue pour ajouter un aliment composé comme ingrédient"""
+        dialog = AlimentComposeSelectionDialog(self, self.db_manager)
+        if not dialog.exec():
+            return
+
+        sous_compose_id, quantite = dialog.get_data()
+        if not sous_compose_id:
+            return
+
+        if self.mode_edition and sous_compose_id == self.aliment_compose["id"]:
+            QMessageBox.warning(
+                self,
+                "Ajout impossible",
+                "Un aliment composé ne peut pas se contenir lui-même.",
+            )
+            return
+
+        for ingredient in self.ingredients:
+            if ingredient.get("sous_compose_id") == sous_compose_id:
+                QMessageBox.warning(
+                    self,
+                    "Ingrédient déjà présent",
+                    "Cet aliment composé est déjà dans la liste. Veuillez modifier sa quantité si nécessaire.",
+                )
+                return
+
+        sous_compose = self.db_manager.get_aliment_compose(sous_compose_id)
+        if sous_compose:
+            # Un sous-composé est affiché comme un ingrédient avec ses valeurs pour 100 g
+            self.ingredients.append(
+                {
+                    "aliment_id": None,
+                    "sous_compose_id": sous_compose_id,
+                    "nom": sous_compose["nom"],
+                    "quantite": quantite,
+                    "calories": sous_compose["total_calories"],
+                    "proteines": sous_compose["total_proteines"],
+                    "glucides": sous_compose["total_glucides"],
+                    "lipides": sous_compose["total_lipides"],
+                    "fibres": sous_compose["total_fibres"],
+                    "prix_kg": sous_compose["total_cout"] * 10,
+                }
+            )
+
+            self.actualiser_tableau_ingredients()
+            self.actualiser_valeurs_nutritionnelles()
+
     def supprimer_ingredient(self):
         """Supprime l'ingrédient sélectionné"""
         selected_rows = self.ingredients_table.selectedIndexes()
@@ -488,12 +540,16 @@ class AlimentComposeDialog(QDialog):
 
         # Récupérer l'ID de l'aliment et le nom depuis l'item
         aliment_id = self.ingredients_table.item(row, 0).data(Qt.UserRole + 1)
+        sous_compose_id = self.ingredients_table.item(row, 0).data(Qt.UserRole + 2)
         nom_ingredient = self.ingredients_table.item(row, 0).text()
 
         # Trouver l'index correspondant dans la liste des ingrédients
         index_to_remove = None
         for i, ingredient in enumerate(self.ingredients):
-            if ingredient["aliment_id"] == aliment_id:
+            if (
+                ingredient["aliment_id"] == aliment_id
+                and ingredient.get("sous_compose_id") == sous_compose_id
+            ):
                 index_to_remove = i
                 break
 
@@ -578,6 +634,17 @@ class AlimentComposeDialog(QDialog):
             self.actualiser_tableau_ingredients()
             self.actualiser_valeurs_nutritionnelles()
 
+    def enregistrer_ingredient(self, aliment_compose_id, ingredient):
+        """Enregistre un ingrédient (aliment ou sous-composé) de l'aliment composé"""
+        if ingredient.get("sous_compose_id"):
+            # Refusé si le sous-composé contient déjà cet aliment composé (cycle)
+            return self.db_manager.ajouter_sous_compose_aliment_compose(
+                aliment_compose_id, ingredient["sous_compose_id"], ingredient["quantite"]
+            )
+        return self.db_manager.ajouter_ingredient_aliment_compose(
+            aliment_compose_id, ingredient["aliment_id"], ingredient["quantite"]
+        )
+
     def validate_and_save(self):
         """Valide les données et sauvegarde l'aliment composé"""
         # Vérifications de base
@@ -619,17 +686,18 @@ class AlimentComposeDialog(QDialog):
                 # Supprimer tous les ingrédients existants
                 # (normalement ils sont supprimés automatiquement avec ON DELETE CASCADE)
                 for ingredient in self.aliment_compose["ingredients"]:
-                    self.db_manager.supprimer_ingredient_aliment_compose(
-                        aliment_compose_id, ingredient["aliment_id"]
-                    )
+                    if ingredient.get("sous_compose_id"):
+                        self.db_manager.supprimer_sous_compose_aliment_compose(
+                            aliment_compose_id, ingredient["sous_compose_id"]
+                        )
+                    else:
+                        self.db_manager.supprimer_ingredient_aliment_compose(
+                            aliment_compose_id, ingredient["aliment_id"]
+                        )
 
                 # Ajouter les nouveaux ingrédients
                 for ingredient in self.ingredients:
-                    success = self.db_manager.ajouter_ingredient_aliment_compose(
-                        aliment_compose_id,
-                        ingredient["aliment_id"],
-                        ingredient["quantite"],
-                    )
+                    success = self.enregistrer_ingredient(aliment_compose_id, ingredient)
                     if not success:
                         raise Exception(
                             f"Erreur lors de l'ajout de l'ingrédient {ingredient['nom']}"
@@ -649,11 +717,7 @@ class AlimentComposeDialog(QDialog):
 
                 # Ajouter les ingrédients
                 for ingredient in self.ingredients:
-                    success = self.db_manager.ajouter_ingredient_aliment_compose(
-                        aliment_compose_id,
-                        ingredient["aliment_id"],
-                        ingredient["quantite"],
-                    )
+                    success = self.enregistrer_ingredient(aliment_compose_id, ingredient)
                     if not success:
                         raise Exception(
                             f"Erreur lors de l'ajout de l'ingrédient {ingredient['nom']}"
@@ -763,7 +827,7 @@ class AlimentComposeSelectionDialog(QDialog):
         """Charge la liste des aliments composés"""
         self.aliments_combo.clear()
 
-        aliments_composes = self.db_manager.get_aliments_composes(categorie)
+        aliments_composes = self.db_manager.get_aliments_composes_resume(categorie)
 
         if not aliments_composes:
             self.aliments_combo.addItem("Aucun aliment composé disponible", None)
@@ -958,7 +1022,7 @@ class AlimentsComposesManagerDialog(QDialog):
 
         self.table.setRowCount(0)
 
-        aliments = self.db_manager.get_aliments_composes(categorie)
+        aliments = self.db_manager.get_aliments_composes_resume(categorie)
         self.table.setRowCount(len(aliments))
 
         for i, aliment in enumerate(aliments):
@@ -984,7 +1048,7 @@ class AlimentsComposesManagerDialog(QDialog):
             self.table.setItem(i, 3, proteines_item)
 
             # Nombre d'ingrédients (avec tri numérique)
-            nb_ingredients = len(aliment["ingredients"])
+            nb_ingredients = aliment["nb_ingredients"]
             nb_ing_item = NumericTableItem(nb_ingredients, str(nb_ingredients))
             self.table.setItem(i, 4, nb_ing_item)
 
@@ -17,6 +17,8 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt, Signal
 from src.utils import AutoSelectDoubleSpinBox
+from src.utils.db_executor import DB_EXECUTOR
+from src.ui.widgets.indicateur_chargement import IndicateurChargement
 
 
 # Classe pour les items du tableau avec tri numérique correct
@@ -219,6 +221,9 @@ class AlimentRepasDialog(QDialog):
 
         simple_layout.addWidget(self.aliments_table)
 
+        # Indicateur affiché pendant la recherche des aliments
+        self.indicateur_chargement = IndicateurChargement(self.aliments_table)
+
         # Tab pour les aliments composés
         self.compose_tab = QWidget()
         compose_layout = QVBoxLayout(self.compose_tab)
@@ -529,43 +534,12 @@ class AlimentRepasDialog(QDialog):
 
     def load_aliments(self):
         """Charge tous les aliments dans le tableau"""
-        aliments = self.db_manager.get_aliments(sort_column="nom")
-
-        # Désactiver le tri pendant le chargement
-        self.aliments_table.setSortingEnabled(False)
-        self.aliments_table.setRowCount(len(aliments))
-
-        for i, aliment in enumerate(aliments):
-            # Nom
-            nom_item = QTableWidgetItem(aliment["nom"])
-            self.aliments_table.setItem(i, 0, nom_item)
-
-            # Marque
-            marque_item = QTableWidgetItem(aliment.get("marque", ""))
-            self.aliments_table.setItem(i, 1, marque_item)
-
-            # Calories
-            calories_item = NumericTableItem(
-                aliment["calories"], f"{aliment['calories']:.0f}"
-            )
-            self.aliments_table.setItem(i, 2, calories_item)
-
-            # Protéines
-            proteines_item = NumericTableItem(
-                aliment["proteines"], f"{aliment['proteines']:.1f}"
-            )
-            self.aliments_table.setItem(i, 3, proteines_item)
-
-            # Stocker l'ID comme donnée utilisateur dans toutes les cellules
-            for col in range(4):
-                self.aliments_table.item(i, col).setData(Qt.UserRole + 1, aliment["id"])
-
-        # Réactiver le tri
-        self.aliments_table.setSortingEnabled(True)
+        # Sans filtre, la recherche filtrée retourne tous les aliments triés par nom
+        self.apply_filters()
 
     def load_aliments_composes(self):
         """Charge les aliments composés dans le tableau"""
-        aliments = self.db_manager.get_aliments_composes()
+        aliments = self.db_manager.get_aliments_composes_resume()
 
         # Désactiver le tri pendant le chargement
         self.compose_table.setSortingEnabled(False)
@@ -599,13 +573,20 @@ class AlimentRepasDialog(QDialog):
         brand = self.brand_filter.currentData()
         search = self.search_input.text().strip()
 
-        aliments = self.db_manager.get_aliments(
+        # Rechercher en arrière-plan ; une saisie plus récente remplace la recherche en cours
+        requete = DB_EXECUTOR.executer(
+            self.db_manager.get_aliments,
             categorie=category if category else None,
             marque=brand if brand else None,
             recherche=search if search else None,
             sort_column="nom",
+            cle=("aliments_dialogue", id(self)),
         )
+        requete.termine.connect(self.afficher_aliments)
+        self.indicateur_chargement.suivre(requete)
 
+    def afficher_aliments(self, aliments):
+        """Remplit le tableau des aliments simples"""
         # Désactiver le tri pendant le chargement
         self.aliments_table.setSortingEnabled(False)
 
@@ -650,7 +631,7 @@ class AlimentRepasDialog(QDialog):
         search = self.comp_search_input.text().strip()
 
         # Récupérer les aliments composés filtrés par catégorie
-        aliments = self.db_manager.get_aliments_composes(category)
+        aliments = self.db_manager.get_aliments_composes_resume(category)
 
         # Filtrer manuellement par recherche
         if search:
@@ -1,6 +1,9 @@
-from PySide6.QtWidgets import QMainWindow, QTabWidget
-from PySide6.QtCore import QTimer
+import time
+from PySide6.QtWidgets import QMainWindow, QTabWidget, QWidget, QVBoxLayout
+from PySide6.QtCore import QTimer, Signal
 from src.utils.events import EVENT_BUS
+from src.database.db_profilage import PROFILEUR
+from src.utils.propagation_recettes import PropagationRecettes
 from .tabs.aliments_tab import AlimentsTab
 from .tabs.planning_tab import PlanningTab
 from .tabs.courses_tab import CoursesTab
@@ -9,15 +12,52 @@ from .tabs.utilisateur_tab import UtilisateurTab
 from .tabs.options_tab import OptionsTab
 from .tabs.aliments_composes_tab import AlimentsComposesTab
 
+# Onglets de la fenêtre principale : (attribut, classe, titre)
+ONGLETS = [
+    ("planning_tab", PlanningTab, "Planning des repas"),
+    ("aliments_tab", AlimentsTab, "Mes aliments"),
+    ("aliments_composes_tab", AlimentsComposesTab, "Mes Aliments Composés"),
+    ("recettes_tab", RecettesTab, "Mes recettes"),
+    ("courses_tab", CoursesTab, "Ma liste de courses"),
+    ("utilisateur_tab", UtilisateurTab, "Mon profil"),
+    ("options_tab", OptionsTab, "Options"),
+]
+
+# Délai avant de construire les onglets restants pendant que l'application est inactive
+DELAI_PRECHARGEMENT_MS = 1000
+
 
 class MainWindow(QMainWindow):
-    def __init__(self, db_manager):
+    # Émis quand un onglet est construit : (attribut, onglet)
+    onglet_construit = Signal(str, object)
+
+    def __init__(self, db_manager, prechargement=True):
         super().__init__()
         self.db_manager = db_manager
+
+        # Temps de construction de chaque onglet, en millisecondes
+        self.temps_onglets = {}
+        self.temps_demarrage_ms = 0
+        self.onglets_demarrage = set()
+
+        debut = time.perf_counter()
         self.setup_ui()
+        self.temps_demarrage_ms = (time.perf_counter() - debut) * 1000
+        self.onglets_demarrage = set(self.temps_onglets)
+        print(
+            f"Fenêtre principale prête en {self.temps_demarrage_ms:.0f} ms "
+            f"({len(self.temps_onglets)}/{len(ONGLETS)} onglets construits)"
+        )
 
         EVENT_BUS.donnees_importees.connect(self.refresh_all_tabs)
 
+        # Répercuter les modifications de recettes même si le planning n'est pas construit
+        self.propagation_recettes = PropagationRecettes(db_manager, self)
+
+        # Construire les autres onglets un par un quand l'application est inactive
+        if prechargement:
+            QTimer.singleShot(DELAI_PRECHARGEMENT_MS, self.precharger_onglet_suivant)
+
     def setup_ui(self):
         self.setWindowTitle("Nutrition Sportive - Planificateur de Repas")
         self.setMinimumSize(1280, 720)
@@ -25,87 +65,123 @@ class MainWindow(QMainWindow):
         # Widget central avec onglets
         self.tabs = QTabWidget()
 
-        # Connecter le changement d'onglet pour actualiser la liste des courses
+        # Chaque onglet est d'abord un conteneur vide, rempli à sa première ouverture
+        self.conteneurs_onglets = []
+        for attribut, _, titre in ONGLETS:
+            setattr(self, attribut, None)
+            conteneur = QWidget()
+            layout = QVBoxLayout(conteneur)
+            layout.setContentsMargins(0, 0, 0, 0)
+            self.conteneurs_onglets.append(conteneur)
+            self.tabs.addTab(conteneur, titre)
+
+        # Construire l'onglet affiché au démarrage
+        self.construire_onglet(self.tabs.currentIndex())
+        PROFILEUR.definir_ecran(ONGLETS[self.tabs.currentIndex()][2])
+
+        # Connecter le changement d'onglet pour construire l'onglet et actualiser les courses
         self.tabs.currentChanged.connect(self.on_tab_changed)
 
-        # Onglet de planification des repas
-        self.planning_tab = PlanningTab(self.db_manager)
-        self.tabs.addTab(self.planning_tab, "Planning des repas")
-
-        # Onglet de gestion des aliments
-        self.aliments_tab = AlimentsTab(self.db_manager)
-        self.tabs.addTab(self.aliments_tab, "Mes aliments")
-
-        # Onglet Aliments Composés
-        self.aliments_composes_tab = AlimentsComposesTab(self.db_manager)
-        self.tabs.addTab(self.aliments_composes_tab, "Mes Aliments Composés")
-
-        # Onglet des recettes (repas types)
-        self.recettes_tab = RecettesTab(self.db_manager)
-        self.tabs.addTab(self.recettes_tab, "Mes recettes")
-
-        # Onglet de liste de courses
-        self.courses_tab = CoursesTab(self.db_manager)
-        self.tabs.addTab(self.courses_tab, "Ma liste de courses")
-
-        # Onglet utilisateur avec calculs de calories
-        self.utilisateur_tab = UtilisateurTab(self.db_manager)
-        self.tabs.addTab(self.utilisateur_tab, "Mon profil")
-
-        # Onglet options
-        self.options_tab = OptionsTab(self.db_manager)
-        self.tabs.addTab(self.options_tab, "Options")
-
         # Définir comme widget central
         self.setCentralWidget(self.tabs)
 
-        # Connexion aux signaux du PlanningTab pour la mise à jour des courses
-        self.planning_tab.semaine_supprimee.connect(self.on_semaine_supprimee)
-        self.planning_tab.semaine_ajoutee.connect(self.on_semaine_ajoutee)
-
         # Connexion aux signaux du bus d'événements (redondant mais pour sécurité)
         EVENT_BUS.semaine_ajoutee.connect(self.on_semaine_ajoutee)
         EVENT_BUS.semaine_supprimee.connect(self.on_semaine_supprimee)
-        EVENT_BUS.aliments_modifies.connect(self.aliments_composes_tab.refresh_data)
+
+    def construire_onglet(self, index):
+        """Construit l'onglet à l'index donné s'il ne l'est pas encore et le retourne"""
+        attribut, classe, _ = ONGLETS[index]
+        onglet = getattr(self, attribut)
+        if onglet is not None:
+            return onglet
+
+        debut = time.perf_counter()
+        onglet = classe(self.db_manager)
+        self.conteneurs_onglets[index].layout().addWidget(onglet)
+        setattr(self, attribut, onglet)
+        self.temps_onglets[attribut] = (time.perf_counter() - debut) * 1000
+
+        self.connecter_onglet(attribut, onglet)
+        self.onglet_construit.emit(attribut, onglet)
+
+        if len(self.temps_onglets) == len(ONGLETS):
+            print(self.rapport_demarrage())
+
+        return onglet
+
+    def connecter_onglet(self, attribut, onglet):
+        """Connecte les signaux propres à un onglet au moment de sa construction"""
+        if attribut == "planning_tab":
+            # Connexion aux signaux du PlanningTab pour la mise à jour des courses
+            onglet.semaine_supprimee.connect(self.on_semaine_supprimee)
+            onglet.semaine_ajoutee.connect(self.on_semaine_ajoutee)
+        elif attribut == "aliments_composes_tab":
+            EVENT_BUS.aliments_modifies.connect(onglet.refresh_data)
+
+    def precharger_onglet_suivant(self):
+        """Construit le prochain onglet différé puis rend la main à la boucle d'événements"""
+        for index, (attribut, _, _) in enumerate(ONGLETS):
+            if getattr(self, attribut) is None:
+                self.construire_onglet(index)
+                QTimer.singleShot(0, self.precharger_onglet_suivant)
+                return
+
+    def rapport_demarrage(self):
+        """Retourne le rapport des temps de construction des onglets"""
+        differes = {
+            attribut: temps
+            for attribut, temps in self.temps_onglets.items()
+            if attribut not in self.onglets_demarrage
+        }
+        lignes = ["Rapport de démarrage de la fenêtre principale:"]
+        lignes.append(f"    Fenêtre affichable après {self.temps_demarrage_ms:.0f} ms")
+        for attribut, temps in self.temps_onglets.items():
+            moment = "différé" if attribut in differes else "démarrage"
+            lignes.append(f"    {attribut:<24} {temps:>8.0f} ms ({moment})")
+        lignes.append(
+            f"    Temps économisé au démarrage: {sum(differes.values()):.0f} ms"
+        )
+        return "\n".join(lignes)
 
     def on_tab_changed(self, index):
         """Appelé lorsque l'utilisateur change d'onglet"""
+        # Construire l'onglet à sa première ouverture
+        onglet = self.construire_onglet(index)
+        PROFILEUR.definir_ecran(ONGLETS[index][2])
+
         # Si on passe à l'onglet des courses, actualiser la liste des semaines
-        if index == 3:  # L'onglet des courses est le 4ème (index 3)
+        if onglet is self.courses_tab:
             QTimer.singleShot(50, self.courses_tab.charger_semaines)
 
     def on_semaine_supprimee(self):
         """Appelé lorsqu'une semaine est supprimée du planning"""
 
-        # Mettre à jour la liste des courses
-        if hasattr(self, "courses_tab"):
+        # Mettre à jour la liste des courses si l'onglet est déjà construit
+        if self.courses_tab is not None:
             QTimer.singleShot(
                 50, self.courses_tab.charger_semaines
             )  # Léger délai pour assurer l'ordre d'exécution
-        else:
-            print("Erreur: courses_tab n'est pas accessible")
 
     def on_semaine_ajoutee(self):
         """Appelé lorsqu'une semaine est ajoutée au planning"""
 
-        # Mettre à jour la liste des courses
-        if hasattr(self, "courses_tab"):
+        # Mettre à jour la liste des courses si l'onglet est déjà construit
+        if self.courses_tab is not None:
             QTimer.singleShot(
                 50, self.courses_tab.charger_semaines
             )  # Léger délai pour assurer l'ordre d'exécution
-        else:
-            print("Erreur: courses_tab n'est pas accessible")
 
     def refresh_all_tabs(self):
         """Rafraîchit tous les onglets après une importation de données"""
-        # Rafraîchir tous les onglets qui ont une méthode refresh_data
-        if hasattr(self, "utilisateur_tab"):
-            self.utilisateur_tab.refresh_data()
-        if hasattr(self, "aliments_tab"):
-            self.aliments_tab.refresh_data()
-        if hasattr(self, "recettes_tab"):
-            self.recettes_tab.refresh_data()
-        if hasattr(self, "planning_tab"):
-            self.planning_tab.refresh_data()
-        if hasattr(self, "courses_tab"):
-            self.courses_tab.refresh_data()
+        # Rafraîchir les onglets déjà construits, les autres liront les données à jour
+        for attribut in (
+            "utilisateur_tab",
+            "aliments_tab",
+            "recettes_tab",
+            "planning_tab",
+            "courses_tab",
+        ):
+            onglet = getattr(self, attribut)
+            if onglet is not None:
+                onglet.refresh_data()
@@ -257,7 +257,7 @@ class AlimentsComposesTab(TabBase):
         self.table.setRowCount(0)
 
         # Charger les aliments composés
-        aliments = self.db_manager.get_aliments_composes(categorie)
+        aliments = self.db_manager.get_aliments_composes_resume(categorie)
 
         # Filtrer par recherche si nécessaire
         if recherche:
@@ -304,7 +304,7 @@ class AlimentsComposesTab(TabBase):
             self.table.setItem(i, 4, cal_item)
 
             # Nombre d'ingrédients
-            nb_ingredients = len(aliment.get("ingredients", []))
+            nb_ingredients = aliment["nb_ingredients"]
             nb_ing_item = NumericTableItem(nb_ingredients, str(nb_ingredients))
             nb_ing_item.setTextAlignment(Qt.AlignCenter)
             self.table.setItem(i, 5, nb_ing_item)
@@ -3,8 +3,7 @@ from PySide6.QtWidgets import (
     QVBoxLayout,
     QHBoxLayout,
     QPushButton,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QHeaderView,
     QAbstractItemView,
     QMenu,
@@ -13,83 +12,184 @@ from PySide6.QtWidgets import (
     QLabel,
     QLineEdit,
     QComboBox,
+    QStyle,
+    QStyledItemDelegate,
 )
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QIcon
+from PySide6.QtCore import (
+    Qt,
+    Signal,
+    QAbstractTableModel,
+    QModelIndex,
+    QRect,
+    QEvent,
+    QSortFilterProxyModel,
+)
+from PySide6.QtGui import QColor, QFont
 
 from src.ui.dialogs.aliment_dialog import AlimentDialog
 from src.utils.events import EVENT_BUS
 from .tab_base import TabBase
 
+# Rôles personnalisés du modèle des aliments
+ROLE_TRI = Qt.UserRole  # Valeur utilisée par le proxy pour trier
+ROLE_ID = Qt.UserRole + 1  # ID de l'aliment de la ligne
+
+# Colonnes du tableau : (clé de l'aliment, en-tête, format numérique, infobulle)
+COLONNES_ALIMENTS = [
+    ("id", "ID", None, None),
+    (None, "Suppr.", None, None),
+    ("nom", "Nom", None, None),
+    ("marque", "Marque", None, None),
+    ("magasin", "Magasin", None, None),
+    ("categorie", "Catégorie", None, None),
+    ("calories", "Calories", "{:.0f}", "Calories pour 100g"),
+    ("proteines", "Protéines", "{:.1f}", "Protéines en g pour 100g"),
+    ("glucides", "Glucides", "{:.1f}", "Glucides en g pour 100g"),
+    ("lipides", "Lipides", "{:.1f}", "Lipides en g pour 100g"),
+    ("fibres", "Fibres", "{:.1f}", "Fibres en g pour 100g"),
+    ("prix_kg", "Prix/kg", "{:.2f} €", None),
+]
+COLONNE_SUPPRESSION = 1
+
+# Même couleur que $DANGER_COLOR dans la feuille de style
+COULEUR_SUPPRESSION = "#e74c3c"
+
+
+class AlimentsTableModel(QAbstractTableModel):
+    """Modèle des aliments : les cellules sont calculées à la demande par la vue,
+    seules les lignes visibles sont donc formatées"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.aliments = []
 
-# Classe personnalisée pour les éléments de tableau avec tri numérique correct
-class NumericTableItem(QTableWidgetItem):
-    def __init__(self, value, text="", unit=""):
-        super().__init__()
-        self.set_value(value)
-        if text:
-            self.setText(text)
-        else:
-            self.format_value(value, unit)
+    def set_aliments(self, aliments):
+        """Remplace la liste des aliments affichés"""
+        self.beginResetModel()
+        self.aliments = aliments
+        self.endResetModel()
 
-    def set_value(self, value):
-        self.setData(Qt.UserRole, float(value) if value is not None else 0.0)
+    # pylint: disable=invalid-name
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.aliments)
 
-    def format_value(self, value, unit):
-        if value and value > 0:
-            if unit:
-                self.setText(f"{value:.2f} {unit}")
-            else:
-                self.setText(f"{value:.2f}")
-        else:
-            self.setText("")
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLONNES_ALIMENTS)
 
-    def __lt__(self, other):
-        my_value = self.data(Qt.UserRole)
-        other_value = other.data(Qt.UserRole)
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
 
-        # Placer les valeurs nulles/0 à la fin lors du tri ascendant
-        if my_value == 0 and other_value > 0:
-            return False
-        if other_value == 0 and my_value > 0:
-            return True
+        aliment = self.aliments[index.row()]
+        cle, _, format_nombre, _ = COLONNES_ALIMENTS[index.column()]
+
+        if role == ROLE_ID:
+            return aliment["id"]
+
+        if cle is None:  # Colonne du bouton de suppression, peinte par le délégué
+            return None
 
-        return my_value < other_value
+        valeur = aliment.get(cle)
 
+        if role == Qt.DisplayRole:
+            if format_nombre:
+                valeur = valeur or 0
+                # Le prix n'est affiché que s'il est renseigné
+                if cle == "prix_kg" and valeur <= 0:
+                    return ""
+                return format_nombre.format(valeur)
+            return valeur if cle == "id" else valeur or ""
 
-class ActionButton(QPushButton):
-    """Bouton d'action personnalisé pour les cellules du tableau"""
+        if role == ROLE_TRI:
+            if format_nombre:
+                # Les valeurs nulles sont placées à la fin lors du tri ascendant
+                valeur = float(valeur or 0)
+                return valeur if valeur > 0 else float("inf")
+            return valeur if cle == "id" else valeur or ""
 
-    def __init__(self, text, action_type="edit", icon=None, parent=None):
-        super().__init__(text, parent)
+        if role == Qt.TextAlignmentRole:
+            if format_nombre:
+                return Qt.AlignCenter
+            return Qt.AlignLeft | Qt.AlignVCenter
 
-        # Paramètres de taille
-        self.setMinimumWidth(70)
-        self.setMaximumWidth(70)
-        self.setMinimumHeight(22)
-        self.setMaximumHeight(22)
+        return None
 
-        # Définir la classe et le type d'action pour le ciblage CSS
-        self.setProperty("class", "action-button")
-        self.setProperty("actionType", action_type)
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation != Qt.Horizontal:
+            return None
 
-        # Ajouter une icône si fournie
-        if icon:
-            self.setIcon(QIcon(icon))
+        _, titre, format_nombre, infobulle = COLONNES_ALIMENTS[section]
+        if role == Qt.DisplayRole:
+            return titre
+        if role == Qt.ToolTipRole:
+            return infobulle
+        if role == Qt.TextAlignmentRole and format_nombre:
+            return Qt.AlignCenter
+        return None
 
 
-class ButtonContainer(QWidget):
-    """Widget conteneur pour centrer un bouton dans une cellule de tableau"""
+class SuppressionDelegate(QStyledItemDelegate):
+    """Délégué qui peint le bouton de suppression au lieu de créer un widget par ligne"""
 
-    def __init__(self, button, parent=None):
+    suppression_demandee = Signal(int)
+
+    TAILLE_BOUTON = 24
+
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self.setProperty("class", "button-container")  # Pour le ciblage CSS
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)  # Marges réduites
-        layout.setSpacing(0)
-        layout.setAlignment(Qt.AlignCenter)  # Alignement centré
-        layout.addWidget(button)
-        self.setLayout(layout)
+        self.ligne_survolee = -1
+
+    def rect_bouton(self, option):
+        """Rectangle du bouton, centré dans la cellule"""
+        rect = QRect(0, 0, self.TAILLE_BOUTON, self.TAILLE_BOUTON)
+        rect.moveCenter(option.rect.center())
+        return rect
+
+    # pylint: disable=invalid-name
+    def paint(self, painter, option, index):
+        # Fond de la cellule (sélection, lignes alternées)
+        super().paint(painter, option, index)
+
+        rect = self.rect_bouton(option)
+        survole = index.row() == self.ligne_survolee and bool(
+            option.state & QStyle.State_MouseOver
+        )
+
+        painter.save()
+        painter.setRenderHint(painter.RenderHint.Antialiasing)
+        if survole:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(COULEUR_SUPPRESSION))
+            painter.drawRoundedRect(rect, 3, 3)
+            painter.setPen(QColor("white"))
+        else:
+            painter.setPen(QColor(COULEUR_SUPPRESSION))
+
+        police = QFont(option.font)
+        police.setBold(True)
+        police.setPixelSize(15)
+        painter.setFont(police)
+        painter.drawText(rect, Qt.AlignCenter, "〤")
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseMove:
+            survole = self.rect_bouton(option).contains(event.position().toPoint())
+            ligne = index.row() if survole else -1
+            if ligne != self.ligne_survolee:
+                self.ligne_survolee = ligne
+                self.parent().viewport().update()
+            return False
+
+        if (
+            event.type() == QEvent.MouseButtonRelease
+            and event.button() == Qt.LeftButton
+            and self.rect_bouton(option).contains(event.position().toPoint())
+        ):
+            self.suppression_demandee.emit(index.data(ROLE_ID))
+            return True
+
+        return super().editorEvent(event, model, option, index)
 
 
 class AlimentsTab(TabBase):
@@ -108,8 +208,11 @@ class AlimentsTab(TabBase):
         self.reset_filter_btn = None
         self.btn_add = None
 
-        # Tableau principal
+        # Tableau principal, son modèle et le proxy de tri
         self.table = None
+        self.model = None
+        self.proxy_model = None
+        self.delete_delegate = None
 
         # Configuration de l'interface
         self.setup_ui()
@@ -226,32 +329,30 @@ class AlimentsTab(TabBase):
 
     def _setup_table(self, main_layout):
         """Configure le tableau des aliments"""
-        # Tableau des aliments avec une colonne de boutons d'action
-        self.table = QTableWidget()
+        # Modèle des aliments, trié par un proxy : la vue ne peint que les lignes visibles
+        self.model = AlimentsTableModel(self)
+        self.proxy_model = QSortFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.model)
+        self.proxy_model.setSortRole(ROLE_TRI)
+        self.proxy_model.setSortCaseSensitivity(Qt.CaseInsensitive)
+        self.proxy_model.setSortLocaleAware(True)
+
+        self.table = QTableView()
         self.table.setObjectName("alimentsTable")
-        self.table.setColumnCount(12)  # 11 colonnes de données + 1 colonne d'action
-        self.table.setHorizontalHeaderLabels(
-            [
-                "ID",
-                "Suppr.",
-                "Nom",
-                "Marque",
-                "Magasin",
-                "Catégorie",
-                "Calories",
-                "Protéines",
-                "Glucides",
-                "Lipides",
-                "Fibres",
-                "Prix/kg",
-            ]
-        )
+        self.table.setModel(self.proxy_model)
+
+        # Bouton de suppression peint par un délégué
+        self.delete_delegate = SuppressionDelegate(self.table)
+        self.delete_delegate.suppression_demandee.connect(self.delete_aliment_by_id)
+        self.table.setItemDelegateForColumn(COLONNE_SUPPRESSION, self.delete_delegate)
+        self.table.setMouseTracking(True)  # Survol du bouton de suppression
 
         # Configuration du tableau
         self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.table.setSelectionMode(QAbstractItemView.SingleSelection)
         self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)  # Lecture seule
         self.table.setSortingEnabled(True)
+        self.table.sortByColumn(2, Qt.AscendingOrder)  # Tri initial par nom
         self.table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.table.customContextMenuRequested.connect(self.show_context_menu)
         self.table.setAlternatingRowColors(True)
@@ -259,7 +360,7 @@ class AlimentsTab(TabBase):
         self.table.setHorizontalScrollMode(QAbstractItemView.ScrollPerPixel)
 
         # Connecter le double clic sur une ligne à l'édition d'aliment
-        self.table.cellDoubleClicked.connect(self.edit_aliment_from_double_click)
+        self.table.doubleClicked.connect(self.edit_aliment_from_double_click)
 
         # Configurer le viewport pour que la barre de défilement verticale commence après l'en-tête
         viewport = self.table.viewport()
@@ -308,17 +409,6 @@ class AlimentsTab(TabBase):
         # Cette ligne est importante pour que la colonne nom ne soit pas trop étroite
         self.table.setColumnWidth(2, 140)  # Largeur initiale (maintenant en position 2)
 
-        # Centrer le contenu des colonnes numériques
-        for col in range(6, 12):
-            self.table.horizontalHeaderItem(col).setTextAlignment(Qt.AlignCenter)
-
-        # Ajouter des tooltips
-        self.table.horizontalHeaderItem(6).setToolTip("Calories pour 100g")
-        self.table.horizontalHeaderItem(7).setToolTip("Protéines en g pour 100g")
-        self.table.horizontalHeaderItem(8).setToolTip("Glucides en g pour 100g")
-        self.table.horizontalHeaderItem(9).setToolTip("Lipides en g pour 100g")
-        self.table.horizontalHeaderItem(10).setToolTip("Fibres en g pour 100g")
-
         # Définir une hauteur de ligne raisonnable
         self.table.verticalHeader().setDefaultSectionSize(36)  # Hauteur de ligne
         self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
@@ -353,32 +443,15 @@ class AlimentsTab(TabBase):
         sort_order=True,
     ):
         """Charge les aliments filtrés dans le tableau"""
-        # Désactiver temporairement le tri pendant le chargement
-        self.table.setSortingEnabled(False)
-
         # Mémoriser la colonne et l'ordre de tri actuels
         current_sort_column = self.table.horizontalHeader().sortIndicatorSection()
         current_sort_order = self.table.horizontalHeader().sortIndicatorOrder()
 
-        # Déterminer la colonne et l'ordre de tri
-        if self.table.isSortingEnabled() and current_sort_column > 0:
-            sort_column = {
-                2: "nom",
-                3: "marque",
-                4: "magasin",
-                5: "categorie",
-                6: "calories",
-                7: "proteines",
-                8: "glucides",
-                9: "lipides",
-                10: "fibres",
-                11: "prix_kg",
-            }.get(current_sort_column, "nom")
+        # Demander à SQLite le même tri que la vue pour limiter le travail du proxy
+        if current_sort_column > 1:
+            sort_column = COLONNES_ALIMENTS[current_sort_column][0]
             sort_order = current_sort_order == Qt.AscendingOrder
 
-        # Vider le tableau
-        self.table.setRowCount(0)
-
         # Charger les aliments avec les filtres
         aliments = self.db_manager.get_aliments(
             categorie=category,
@@ -389,86 +462,8 @@ class AlimentsTab(TabBase):
             sort_order=sort_order,
         )
 
-        # Remplir le tableau
-        self.table.setRowCount(len(aliments))
-        for i, aliment in enumerate(aliments):
-            # ID (caché)
-            id_item = QTableWidgetItem()
-            id_item.setData(Qt.DisplayRole, aliment["id"])
-            self.table.setItem(i, 0, id_item)
-
-            # Bouton Supprimer (maintenant à la colonne 1)
-            btn_delete = QPushButton("〤")
-            btn_delete.setObjectName("deleteButton")
-            aliment_id = aliment["id"]
-            btn_delete.clicked.connect(
-                lambda checked, aid=aliment_id: self.delete_aliment_by_id(aid)
-            )
-            # Utiliser le conteneur pour centrer le bouton
-            delete_container = ButtonContainer(btn_delete)
-            self.table.setCellWidget(i, 1, delete_container)
-
-            # Nom
-            nom_item = QTableWidgetItem(aliment["nom"])
-            nom_item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-            self.table.setItem(i, 2, nom_item)
-
-            # Marque
-            marque_item = QTableWidgetItem(aliment["marque"] or "")
-            marque_item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-            self.table.setItem(i, 3, marque_item)
-
-            # Magasin
-            magasin_item = QTableWidgetItem(aliment["magasin"] or "")
-            magasin_item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-            self.table.setItem(i, 4, magasin_item)
-
-            # Catégorie
-            categorie_item = QTableWidgetItem(aliment["categorie"] or "")
-            categorie_item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-            self.table.setItem(i, 5, categorie_item)
-
-            # Valeurs nutritionnelles avec tri numérique correct et alignement centré
-            cal_item = NumericTableItem(
-                aliment["calories"], f"{aliment['calories']:.0f}"
-            )
-            cal_item.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(i, 6, cal_item)
-
-            prot_item = NumericTableItem(
-                aliment["proteines"], f"{aliment['proteines']:.1f}"
-            )
-            prot_item.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(i, 7, prot_item)
-
-            gluc_item = NumericTableItem(
-                aliment["glucides"], f"{aliment['glucides']:.1f}"
-            )
-            gluc_item.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(i, 8, gluc_item)
-
-            lip_item = NumericTableItem(aliment["lipides"], f"{aliment['lipides']:.1f}")
-            lip_item.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(i, 9, lip_item)
-
-            # Fibres
-            fibres_val = aliment.get("fibres", 0) or 0
-            fibres_item = NumericTableItem(fibres_val, f"{fibres_val:.1f}")
-            fibres_item.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(i, 10, fibres_item)
-
-            # Prix au kg avec tri numérique correct
-            prix_val = aliment.get("prix_kg", 0) or 0
-            prix_item = NumericTableItem(prix_val)
-            if prix_val > 0:
-                prix_item.setText(f"{prix_val:.2f} €")
-            prix_item.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(i, 11, prix_item)
-
-        # Réactiver le tri avec la même colonne et ordre qu'avant
-        self.table.setSortingEnabled(True)
-        if current_sort_column > 0:
-            self.table.sortItems(current_sort_column, current_sort_order)
+        # Remplacer les données du modèle, le proxy conserve le tri courant
+        self.model.set_aliments(aliments)
 
     def apply_filters(self):
         """Applique les filtres sélectionnés"""
@@ -488,14 +483,25 @@ class AlimentsTab(TabBase):
         self.magasin_combo.setCurrentIndex(0)
         self.load_data()
 
+    def aliment_id_at(self, index):
+        """Retourne l'ID de l'aliment d'un index de la vue"""
+        return index.siblingAtColumn(0).data(ROLE_ID)
+
+    def selected_aliment_id(self):
+        """Retourne l'ID de l'aliment sélectionné, ou None"""
+        selected_rows = self.table.selectionModel().selectedRows()
+        if not selected_rows:
+            return None
+        return self.aliment_id_at(selected_rows[0])
+
     def edit_aliment_from_button(self, row):
         """Éditer un aliment depuis le bouton dans le tableau"""
-        aliment_id = int(self.table.item(row, 0).text())
+        aliment_id = self.aliment_id_at(self.proxy_model.index(row, 0))
         self.edit_aliment_by_id(aliment_id)
 
     def delete_aliment_from_button(self, row):
         """Supprimer un aliment depuis le bouton dans le tableau - Obsolète, garder pour compatibilité"""
-        aliment_id = int(self.table.item(row, 0).text())
+        aliment_id = self.aliment_id_at(self.proxy_model.index(row, 0))
         self.delete_aliment_by_id(aliment_id)
 
     def edit_aliment_by_id(self, aliment_id):
@@ -593,8 +599,8 @@ class AlimentsTab(TabBase):
 
     def edit_aliment(self):
         """Méthode conservée pour compatibilité avec le menu contextuel"""
-        selected_rows = self.table.selectedItems()
-        if not selected_rows:
+        aliment_id = self.selected_aliment_id()
+        if aliment_id is None:
             QMessageBox.warning(
                 self,
                 "Sélection requise",
@@ -602,15 +608,12 @@ class AlimentsTab(TabBase):
             )
             return
 
-        # Récupérer l'ID de la ligne sélectionnée
-        row = selected_rows[0].row()
-        aliment_id = int(self.table.item(row, 0).text())
         self.edit_aliment_by_id(aliment_id)
 
     def delete_aliment(self):
         """Méthode conservée pour compatibilité avec le menu contextuel"""
-        selected_rows = self.table.selectedItems()
-        if not selected_rows:
+        aliment_id = self.selected_aliment_id()
+        if aliment_id is None:
             QMessageBox.warning(
                 self,
                 "Sélection requise",
@@ -618,9 +621,6 @@ class AlimentsTab(TabBase):
             )
             return
 
-        # Récupérer l'ID de la ligne sélectionnée
-        row = selected_rows[0].row()
-        aliment_id = int(self.table.item(row, 0).text())
         self.delete_aliment_by_id(aliment_id)
 
     def show_context_menu(self, position):
@@ -630,8 +630,7 @@ class AlimentsTab(TabBase):
         if not index.isValid():
             return
 
-        row = index.row()
-        aliment_id = int(self.table.item(row, 0).text())
+        aliment_id = self.aliment_id_at(index)
 
         menu = QMenu()
         edit_action = menu.addAction("Modifier")
@@ -645,11 +644,11 @@ class AlimentsTab(TabBase):
         elif action == delete_action:
             self.delete_aliment_by_id(aliment_id)
 
-    def edit_aliment_from_double_click(self, row, column):
+    def edit_aliment_from_double_click(self, index):
         """Éditer un aliment depuis un double-clic sur une ligne du tableau"""
         # Ignorer les clics sur la colonne de suppression
-        if column == 1:  # Colonne de suppression
+        if index.column() == COLONNE_SUPPRESSION:
             return
 
-        aliment_id = int(self.table.item(row, 0).text())
+        aliment_id = self.aliment_id_at(index)
         self.edit_aliment_by_id(aliment_id)
@@ -15,6 +15,8 @@ from PySide6.QtPrintSupport import QPrinter, QPrintDialog
 from PySide6.QtGui import QTextDocument, QPageLayout
 
 from src.ui.dialogs.print_preview_dialog import PrintPreviewDialog
+from src.ui.widgets.indicateur_chargement import IndicateurChargement
+from src.utils.db_executor import DB_EXECUTOR
 from src.utils.events import EVENT_BUS
 from .tab_base import TabBase
 
@@ -132,6 +134,11 @@ class CoursesTab(TabBase):
         self.tree.setMinimumHeight(400)
         main_layout.addWidget(self.tree)
 
+        # Indicateur affiché pendant le calcul de la liste de courses
+        self.indicateur_chargement = IndicateurChargement(
+            self.tree, "Calcul de la liste de courses..."
+        )
+
         # Ajouter le widget de contenu au layout central avec des marges extensibles
         center_layout.addStretch(1)
         center_layout.addWidget(content_widget)
@@ -221,10 +228,19 @@ class CoursesTab(TabBase):
         if self.current_semaine_id is not None:
             self.save_checkbox_states()
 
-        self.tree.clear()
+        # Calculer la liste de courses en arrière-plan ; un nouveau chargement
+        # remplace celui qui est encore en cours
+        requete = DB_EXECUTOR.executer(
+            self.db_manager.generer_liste_courses,
+            self.current_semaine_id,
+            cle=("liste_courses", id(self)),
+        )
+        requete.termine.connect(self.afficher_liste_courses)
+        self.indicateur_chargement.suivre(requete)
 
-        # Récupérer la liste de courses pour la semaine sélectionnée
-        liste_courses = self.db_manager.generer_liste_courses(self.current_semaine_id)
+    def afficher_liste_courses(self, liste_courses):
+        """Remplit l'arbre avec la liste de courses calculée"""
+        self.tree.clear()
 
         total_aliments = 0
         for magasin, categories in liste_courses.items():
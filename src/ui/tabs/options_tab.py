@@ -19,12 +19,14 @@ from PySide6.QtWidgets import (
     QCheckBox,
     QLineEdit,
     QApplication,
+    QFileDialog,
 )
 from PySide6.QtCore import Qt, Signal, QTimer
 from src.utils.app_info import APP_VERSION
 from src.utils.app_restart import restart_application
 from src.utils.theme_manager import ThemeManager
-from src.database.db_connector import DBConnector
+from src.database.db_connector import DBConnector, PROFILS_PRAGMA
+from src.database.db_profilage import PROFILEUR, SEUIL_REQUETE_LENTE_MS
 from src.ui.dialogs.export_import_dialog import ExportImportDialog
 from src.ui.dialogs.backup_select_dialog import BackupSelectDialog
 from .tab_base import TabBase
@@ -182,6 +184,72 @@ class OptionsTab(TabBase):
 
         main_layout.addWidget(export_import_group)
 
+        # Groupe pour les réglages de performance de la base de données
+        db_profile_group = QGroupBox("Performances de la base de données :")
+        db_profile_group.setProperty("class", "options-group")
+        db_profile_layout = QVBoxLayout(db_profile_group)
+
+        # Description
+        db_profile_description = QLabel(
+            "Choisissez comment SQLite gère le journal, le cache et la mémoire. "
+            "Le profil est appliqué aux connexions ouvertes sans redémarrer l'application."
+        )
+        db_profile_description.setWordWrap(True)
+        db_profile_description.setProperty("class", "export-import-description")
+        db_profile_layout.addWidget(db_profile_description)
+
+        db_profile_form = QFormLayout()
+
+        # Combobox pour sélectionner le profil
+        self.db_profile_combo = QComboBox()
+        self.db_profile_combo.addItems(list(PROFILS_PRAGMA.keys()))
+
+        # Sélectionner le profil actuel
+        index = self.db_profile_combo.findText(self.db_manager.get_db_profile())
+        if index >= 0:
+            self.db_profile_combo.setCurrentIndex(index)
+
+        self.db_profile_combo.currentTextChanged.connect(self.on_db_profile_changed)
+        db_profile_form.addRow("Profil :", self.db_profile_combo)
+        db_profile_layout.addLayout(db_profile_form)
+
+        # Détail du profil sélectionné
+        self.db_profile_details = QLabel()
+        self.db_profile_details.setWordWrap(True)
+        self.db_profile_details.setProperty("class", "export-import-description")
+        db_profile_layout.addWidget(self.db_profile_details)
+        self.update_db_profile_details(self.db_profile_combo.currentText())
+
+        # Diagnostic : enregistrement des requêtes SQL
+        self.profilage_checkbox = QCheckBox(
+            "Enregistrer les requêtes SQL (diagnostic des écrans lents)"
+        )
+        self.profilage_checkbox.setChecked(PROFILEUR.actif)
+        self.profilage_checkbox.toggled.connect(self.on_profilage_toggled)
+        db_profile_layout.addWidget(self.profilage_checkbox)
+
+        self.profilage_resume = QLabel()
+        self.profilage_resume.setWordWrap(True)
+        self.profilage_resume.setProperty("class", "export-import-description")
+        db_profile_layout.addWidget(self.profilage_resume)
+
+        profilage_buttons_layout = QHBoxLayout()
+        export_profilage_btn = QPushButton("Exporter le rapport (JSON)...")
+        export_profilage_btn.clicked.connect(self.exporter_rapport_profilage)
+        profilage_buttons_layout.addWidget(export_profilage_btn)
+        reset_profilage_btn = QPushButton("Effacer les mesures")
+        reset_profilage_btn.clicked.connect(self.effacer_mesures_profilage)
+        profilage_buttons_layout.addWidget(reset_profilage_btn)
+        db_profile_layout.addLayout(profilage_buttons_layout)
+
+        # Actualiser le résumé pendant l'enregistrement
+        self.profilage_timer = QTimer(self)
+        self.profilage_timer.setInterval(1000)
+        self.profilage_timer.timeout.connect(self.update_profilage_resume)
+        self.update_profilage_resume()
+
+        main_layout.addWidget(db_profile_group)
+
         # NOUVELLE SECTION: Groupe pour la réinitialisation de la base de données
         reset_db_group = QGroupBox("Gestion de la base de données :")
         reset_db_group.setProperty("class", "options-group")
@@ -277,6 +345,75 @@ class OptionsTab(TabBase):
         # Émettre le signal de changement de thème
         self.theme_changed.emit(theme_name)
 
+    def on_db_profile_changed(self, profile_name):
+        """Appelé lorsque l'utilisateur change de profil de performance SQLite"""
+        print(f"Profil SQLite sélectionné: {profile_name}")
+
+        # Appliquer le profil aux connexions et le sauvegarder dans la BD
+        self.db_manager.save_db_profile(profile_name)
+        self.update_db_profile_details(profile_name)
+
+    def update_db_profile_details(self, profile_name):
+        """Affiche la description et les réglages du profil SQLite"""
+        if profile_name not in PROFILS_PRAGMA:
+            self.db_profile_details.clear()
+            return
+
+        pragmas = self.db_manager.get_pragmas_profil(profile_name)
+        details = ", ".join(f"{nom} = {valeur}" for nom, valeur in pragmas.items())
+        self.db_profile_details.setText(
+            f"{PROFILS_PRAGMA[profile_name]['description']}<br><small>{details}</small>"
+        )
+
+    def on_profilage_toggled(self, actif):
+        """Active ou désactive l'enregistrement des requêtes SQL"""
+        PROFILEUR.activer(actif)
+        if actif:
+            self.profilage_timer.start()
+        else:
+            self.profilage_timer.stop()
+        self.update_profilage_resume()
+
+    def update_profilage_resume(self):
+        """Affiche le nombre de requêtes enregistrées, lentes et répétées (N+1)"""
+        resume = PROFILEUR.resume()
+        self.profilage_resume.setText(
+            f"{resume['requetes']} requêtes enregistrées ({resume['modeles']} distinctes), "
+            f"{resume['lentes']} de plus de {SEUIL_REQUETE_LENTE_MS:.0f} ms, "
+            f"{resume['n_plus_1']} répétitions suspectes (N+1)"
+        )
+
+    def exporter_rapport_profilage(self):
+        """Enregistre le rapport des requêtes SQL dans un fichier JSON"""
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        filepath, _ = QFileDialog.getSaveFileName(
+            self,
+            "Exporter le rapport des requêtes",
+            f"requetes_sql_{timestamp}.json",
+            "Fichiers JSON (*.json)",
+        )
+        if not filepath:
+            return
+
+        try:
+            PROFILEUR.exporter_json(filepath)
+            QMessageBox.information(
+                self,
+                "Rapport exporté",
+                f"Le rapport des requêtes a été enregistré.\n\nEmplacement: {filepath}",
+            )
+        except OSError as e:
+            QMessageBox.critical(
+                self,
+                "Erreur d'exportation",
+                f"Impossible d'enregistrer le rapport:\n\n{str(e)}",
+            )
+
+    def effacer_mesures_profilage(self):
+        """Oublie les requêtes enregistrées"""
+        PROFILEUR.reinitialiser()
+        self.update_profilage_resume()
+
     def show_export_import_dialog(self):
         """Affiche le dialogue d'exportation/importation"""
         dialog = ExportImportDialog(self, self.db_manager)
@@ -295,6 +432,9 @@ class OptionsTab(TabBase):
             backup_filename = f"{os.path.splitext(db_name)[0]}.db.{timestamp}.bak"
             backup_path = os.path.join(db_dir, backup_filename)
 
+            # Reporter le journal WAL dans le fichier avant de le copier
+            self.db_manager.checkpoint()
+
             # Copier le fichier actuel comme sauvegarde
             shutil.copy2(db_path, backup_path)
 
@@ -333,12 +473,15 @@ class OptionsTab(TabBase):
                 timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
                 backup_path = f"{db_path}.{timestamp}.bak"
 
+                # Reporter le journal WAL dans le fichier avant de le copier
+                self.db_manager.checkpoint()
+
                 # Copier le fichier actuel comme sauvegarde
                 shutil.copy2(db_path, backup_path)
                 print(f"Sauvegarde créée: {backup_path}")
 
             # Fermer toutes les connexions à la base de données
-            self.db_manager.disconnect()
+            self.db_manager.force_close_all_connections()
 
             # Supprimer le fichier de base de données actuel
             os.remove(db_path)
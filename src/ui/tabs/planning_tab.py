@@ -22,6 +22,50 @@ from src.ui.widgets.semaine_widget import SemaineWidget
 from src.ui.widgets.print_manager import PrintManager
 from src.utils.events import EVENT_BUS
 
+# Nombre de semaines gardées construites en mémoire, semaine affichée comprise
+SEMAINES_EN_MEMOIRE = 3
+
+
+class SemaineOnglet(QWidget):
+    """Onglet léger d'une semaine : son SemaineWidget n'est construit qu'à l'affichage"""
+
+    def __init__(self, db_manager, semaine_id, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.semaine_id = semaine_id
+        self.semaine_widget = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+    def est_construit(self):
+        """Indique si le SemaineWidget de cet onglet existe"""
+        return self.semaine_widget is not None
+
+    def construire(self):
+        """Construit le SemaineWidget s'il n'existe pas encore et le retourne"""
+        if self.semaine_widget is None:
+            self.semaine_widget = SemaineWidget(self.db_manager, self.semaine_id)
+            self.layout().addWidget(self.semaine_widget)
+        return self.semaine_widget
+
+    def liberer(self):
+        """Détruit le SemaineWidget pour libérer la mémoire, sauf opération en cours"""
+        if self.semaine_widget is None:
+            return True
+        if self.semaine_widget.operation_en_cours():
+            return False
+
+        self.layout().removeWidget(self.semaine_widget)
+        self.semaine_widget.deleteLater()
+        self.semaine_widget = None
+        return True
+
+    def load_data(self):
+        """Recharge la semaine si elle est construite, sinon elle sera lue à l'affichage"""
+        if self.semaine_widget is not None:
+            self.semaine_widget.load_data()
+
 
 # Classe personnalisée pour le widget d'onglets afin de gérer le double-clic
 class CustomTabWidget(QTabWidget):
@@ -74,9 +118,12 @@ class PlanningTab(QWidget):
         super().__init__()
         self.db_manager = db_manager
 
-        # Dictionnaire pour stocker les widgets des semaines
+        # Dictionnaire pour stocker les onglets des semaines
         self.semaines = {}
 
+        # IDs des semaines construites, de la moins à la plus récemment affichée
+        self.semaines_recentes = []
+
         # Liste pour suivre les numéros de semaine utilisés
         self.semaine_ids = []
 
@@ -183,6 +230,11 @@ class PlanningTab(QWidget):
 
     def on_tab_changed(self, index):
         """Appelé quand un onglet est sélectionné"""
+        # Construire la semaine affichée à la demande
+        semaine_onglet = self.tabs_semaines.widget(index)
+        if isinstance(semaine_onglet, SemaineOnglet):
+            self.afficher_semaine(semaine_onglet)
+
         # Si c'est l'onglet +, proposer les options: nouvelle semaine vierge ou dupliquer
         if (
             index == self.tabs_semaines.count() - 1
@@ -275,6 +327,23 @@ class PlanningTab(QWidget):
         has_tab = index >= 0 and index < self.tabs_semaines.count() - 1
         self.btn_print_planning.setEnabled(has_tab)
 
+    def afficher_semaine(self, semaine_onglet):
+        """Construit la semaine affichée et libère les semaines les moins récemment vues"""
+        semaine_onglet.construire()
+
+        semaine_id = semaine_onglet.semaine_id
+        if semaine_id in self.semaines_recentes:
+            self.semaines_recentes.remove(semaine_id)
+        self.semaines_recentes.append(semaine_id)
+
+        # Parcourir les semaines de la plus ancienne à la plus récente
+        for ancienne_id in list(self.semaines_recentes[:-1]):
+            if len(self.semaines_recentes) <= SEMAINES_EN_MEMOIRE:
+                break
+            ancienne = self.semaines.get(ancienne_id)
+            if ancienne is None or ancienne.liberer():
+                self.semaines_recentes.remove(ancienne_id)
+
     def on_tab_moved(self, from_index, to_index):
         """Assure que l'onglet + reste toujours à la fin"""
         count = self.tabs_semaines.count()
@@ -328,8 +397,8 @@ class PlanningTab(QWidget):
                     semaine_id = i
                     break
 
-        # Créer le widget de semaine
-        semaine_widget = SemaineWidget(self.db_manager, semaine_id)
+        # Créer l'onglet de semaine, construit lors de sa sélection
+        semaine_widget = SemaineOnglet(self.db_manager, semaine_id)
 
         # Position: juste avant l'onglet + (dernier)
         position = self.tabs_semaines.count() - 1
@@ -362,8 +431,8 @@ class PlanningTab(QWidget):
         if semaine_id in self.semaine_ids:
             return False
 
-        # Créer le widget de semaine
-        semaine_widget = SemaineWidget(self.db_manager, semaine_id)
+        # Créer l'onglet de semaine, construit lors de sa sélection
+        semaine_widget = SemaineOnglet(self.db_manager, semaine_id)
 
         # Ajouter l'onglet à la fin (avant l'onglet + s'il existe)
         position = self.tabs_semaines.count()
@@ -458,6 +527,8 @@ class PlanningTab(QWidget):
         # Supprimer des collections internes
         try:
             del self.semaines[semaine_id]
+            if semaine_id in self.semaines_recentes:
+                self.semaines_recentes.remove(semaine_id)
             if semaine_id in self.semaine_ids:
                 self.semaine_ids.remove(semaine_id)
             if semaine_id in self.onglets_personnalises:
@@ -633,7 +704,7 @@ class PlanningTab(QWidget):
             jours_selectionnes: Liste des jours à inclure dans la duplication
 
         Returns:
-            int: ID de la nouvelle semaine créée
+            int: ID de la nouvelle semaine créée, ou None en cas d'erreur
         """
         # Créer une nouvelle semaine
         nouvelle_semaine_id = self.ajouter_semaine()
@@ -641,39 +712,22 @@ class PlanningTab(QWidget):
         if not nouvelle_semaine_id:
             return None
 
-        # Récupérer tous les repas de la semaine source
-        repas_semaine = self.db_manager.get_repas_semaine(semaine_id_source)
-
-        # Pour chaque jour sélectionné, dupliquer les repas
-        for jour in jours_selectionnes:
-            if jour in repas_semaine:
-                for repas in repas_semaine[jour]:
-                    # Créer le nouveau repas dans la nouvelle semaine
-                    nouveau_repas_id = self.db_manager.ajouter_repas(
-                        nom=repas["nom"],
-                        jour=jour,
-                        ordre=repas["ordre"],
-                        semaine_id=nouvelle_semaine_id,
-                        repas_type_id=repas.get("repas_type_id"),
-                    )
-
-                    # Dupliquer les aliments
-                    for aliment in repas["aliments"]:
-                        self.db_manager.ajouter_aliment_repas(
-                            nouveau_repas_id, aliment["id"], aliment["quantite"]
-                        )
+        # Copier les repas des jours sélectionnés en une seule transaction
+        resultat = self.db_manager.dupliquer_semaine(
+            semaine_id_source, nouvelle_semaine_id, jours_selectionnes
+        )
 
-                    # Dupliquer le multiplicateur si présent
-                    if "id" in repas:
-                        multi_info = self.db_manager.get_repas_multiplicateur(
-                            repas["id"]
-                        )
-                        if multi_info:
-                            self.db_manager.set_repas_multiplicateur(
-                                nouveau_repas_id,
-                                multi_info["multiplicateur"],
-                                multi_info["ignore_course"],
-                            )
+        if resultat is False:
+            # La copie a été annulée : ne pas garder la semaine vide
+            self.supprimer_onglet_semaine(
+                self.tabs_semaines.indexOf(self.semaines[nouvelle_semaine_id])
+            )
+            QMessageBox.warning(
+                self,
+                "Erreur",
+                "La duplication de la semaine a échoué. Aucune semaine n'a été créée.",
+            )
+            return None
 
         # Rafraîchir les données pour afficher les repas copiés
         self.semaines[nouvelle_semaine_id].load_data()
@@ -709,6 +763,6 @@ class PlanningTab(QWidget):
         self.refresh_data()
 
     def refresh_data(self):
-        """Rafraîchit tous les widgets de semaine"""
+        """Rafraîchit les semaines construites, les autres seront lues à l'affichage"""
         for semaine in self.semaines.values():
             semaine.load_data()
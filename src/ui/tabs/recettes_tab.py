@@ -26,6 +26,8 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QCursor
 from src.utils.events import EVENT_BUS
+from src.utils.db_executor import DB_EXECUTOR
+from src.ui.widgets.indicateur_chargement import IndicateurChargement
 from src.ui.dialogs.categories_manager_dialog import CategoriesManagerDialog
 
 
@@ -66,6 +68,7 @@ class RecettesTab(QWidget):
         self.db_manager = db_manager
         self.setObjectName("RecettesTab")
         self.current_recette_id = None
+        self.ligne_a_restaurer = None  # Ligne à resélectionner après un rechargement
         self.setup_ui()
         self.load_data()
 
@@ -166,6 +169,9 @@ class RecettesTab(QWidget):
         self.recettes_list.currentRowChanged.connect(self.afficher_details_recette)
         left_layout.addWidget(self.recettes_list, 1)  # Stretch factor
 
+        # Indicateur affiché pendant la recherche des recettes
+        self.indicateur_chargement = IndicateurChargement(self.recettes_list)
+
         # Boutons d'action pour les recettes
         btn_layout = QHBoxLayout()
         self.btn_add = QPushButton("Ajouter")
@@ -371,15 +377,28 @@ class RecettesTab(QWidget):
 
     def apply_filters(self):
         """Applique les filtres et charge les données"""
-        self.recettes_list.clear()
-
         # Obtenir les valeurs des filtres
         categorie_id = self.category_filter.currentData()
         recherche = self.search_input.text().strip()
 
+        # Rechercher en arrière-plan ; une recherche plus récente remplace la précédente
+        requete = DB_EXECUTOR.executer(
+            self.rechercher_recettes,
+            categorie_id,
+            recherche,
+            cle=("recettes", id(self)),
+        )
+        requete.termine.connect(self.afficher_recettes)
+        self.indicateur_chargement.suivre(requete)
+
+    def rechercher_recettes(self, categorie_id, recherche):
+        """Retourne les recettes filtrées : liste de (id, texte affiché)
+
+        Exécutée dans un thread de l'exécuteur de requêtes.
+        """
         # Traitement spécial pour les recettes sans catégorie
         if categorie_id == "sans_categorie":
-            # Récupérer les recettes sans catégorie avec une requête spéciale
+            # Filtrer la liste complète (totaux seulement, sans les aliments)
             repas_types = []
             for repas in self.db_manager.get_repas_types():
                 if not repas.get("categorie_id"):
@@ -390,19 +409,36 @@ class RecettesTab(QWidget):
                 categorie_id, recherche
             )
 
+        recettes = []
         for repas_type in repas_types:
-            # Créer l'item sans appliquer de couleur
-            item = QListWidgetItem(repas_type["nom"])
-            item.setData(Qt.UserRole, repas_type["id"])
+            texte = repas_type["nom"]
 
-            # Optionnel : Ajouter une indication de catégorie dans le texte si nécessaire
-            if repas_type.get("categorie_id"):
-                categorie = self.db_manager.get_categorie(repas_type["categorie_id"])
-                if categorie:
-                    item.setText(f"{repas_type['nom']} ({categorie['nom']})")
+            # Indication de catégorie, jointe par la requête de liste
+            if repas_type.get("categorie_nom"):
+                texte = f"{repas_type['nom']} ({repas_type['categorie_nom']})"
 
+            recettes.append((repas_type["id"], texte))
+        return recettes
+
+    def afficher_recettes(self, recettes):
+        """Remplit la liste avec les recettes trouvées"""
+        self.recettes_list.clear()
+
+        for recette_id, texte in recettes:
+            # Créer l'item sans appliquer de couleur
+            item = QListWidgetItem(texte)
+            item.setData(Qt.UserRole, recette_id)
             self.recettes_list.addItem(item)
 
+        # Restaurer la sélection demandée par refresh_data
+        if self.ligne_a_restaurer is not None:
+            current_row = self.ligne_a_restaurer
+            self.ligne_a_restaurer = None
+            if current_row >= 0 and current_row < self.recettes_list.count():
+                self.recettes_list.setCurrentRow(current_row)
+            elif self.recettes_list.count() > 0:
+                self.recettes_list.setCurrentRow(0)
+
     def is_dark_color(self, color):
         """Détermine si une couleur est sombre pour choisir le texte contrastant"""
         # Convertit la couleur hexadécimale en RGB
@@ -814,15 +850,10 @@ class RecettesTab(QWidget):
     # Ajout de la méthode manquante
     def refresh_data(self):
         """Rafraîchit les données affichées"""
-        current_row = self.recettes_list.currentRow()
+        # La sélection est restaurée quand les recettes rechargées sont affichées
+        self.ligne_a_restaurer = self.recettes_list.currentRow()
         self.load_data()
 
-        # Restaurer la sélection si possible
-        if current_row >= 0 and current_row < self.recettes_list.count():
-            self.recettes_list.setCurrentRow(current_row)
-        elif self.recettes_list.count() > 0:
-            self.recettes_list.setCurrentRow(0)
-
 
 class RecetteDialog(QDialog):
     """Dialogue pour ajouter ou modifier une recette"""
@@ -0,0 +1,78 @@
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QProgressBar
+from PySide6.QtCore import Qt, QTimer, QEvent
+
+# Délai avant d'afficher l'indicateur : les chargements rapides ne le font pas clignoter
+DELAI_AFFICHAGE_MS = 200
+
+
+class IndicateurChargement(QWidget):
+    """Overlay de chargement affiché sur un widget pendant des requêtes en arrière-plan"""
+
+    def __init__(self, parent, message="Chargement..."):
+        super().__init__(parent)
+        self.requetes = set()  # Requêtes suivies encore en cours
+
+        self.setStyleSheet(
+            """
+            background-color: rgba(0, 0, 0, 20%);
+            border-radius: 5px;
+        """
+        )
+
+        layout = QVBoxLayout(self)
+        self.label = QLabel(message)
+        self.label.setStyleSheet(
+            """
+            color: white;
+            font-weight: bold;
+            background-color: rgba(40, 40, 40, 80%);
+            border-radius: 5px;
+            padding: 10px;
+        """
+        )
+        self.label.setAlignment(Qt.AlignCenter)
+
+        # Barre de progression indéterminée, animée par Qt
+        self.barre = QProgressBar()
+        self.barre.setRange(0, 0)
+        self.barre.setTextVisible(False)
+        self.barre.setFixedSize(160, 6)
+
+        layout.addStretch()
+        layout.addWidget(self.label, 0, Qt.AlignCenter)
+        layout.addWidget(self.barre, 0, Qt.AlignCenter)
+        layout.addStretch()
+
+        self.timer_affichage = QTimer(self)
+        self.timer_affichage.setSingleShot(True)
+        self.timer_affichage.timeout.connect(self._afficher)
+
+        # Suivre la taille du widget recouvert
+        parent.installEventFilter(self)
+        self.hide()
+
+    def suivre(self, requete):
+        """Affiche l'indicateur jusqu'à la fin de la requête (et des autres suivies)"""
+        self.requetes.add(requete)
+        requete.fin.connect(lambda: self._requete_finie(requete))
+        if not self.isVisible() and not self.timer_affichage.isActive():
+            self.timer_affichage.start(DELAI_AFFICHAGE_MS)
+        return requete
+
+    def _requete_finie(self, requete):
+        self.requetes.discard(requete)
+        if not self.requetes:
+            self.timer_affichage.stop()
+            self.hide()
+
+    def _afficher(self):
+        if self.requetes:
+            self.resize(self.parent().size())
+            self.show()
+            self.raise_()
+
+    def eventFilter(self, obj, event):  # pylint: disable=invalid-name
+        """Redimensionne l'overlay avec le widget recouvert"""
+        if obj is self.parent() and event.type() == QEvent.Resize:
+            self.resize(event.size())
+        return super().eventFilter(obj, event)
@@ -10,11 +10,11 @@ from PySide6.QtWidgets import (
     QApplication,
     QMessageBox,
 )
-from PySide6.QtCore import Qt, QPoint, QThread, QPropertyAnimation, QEasingCurve, QTimer
+from PySide6.QtCore import Qt, QPoint, QPropertyAnimation, QEasingCurve, QTimer
 
 from src.utils import EVENT_BUS
 from src.utils import JOURS_SEMAINE
-from src.utils.planning_worker import PlanningOperationWorker
+from src.utils.db_executor import DB_EXECUTOR
 from src.ui.dialogs.repas_dialog import RepasDialog
 from src.ui.widgets.repas_widget import RepasWidget
 from src.ui.widgets.totaux_macros_widget import TotauxMacrosWidget
@@ -37,8 +37,7 @@ class JourWidget(QWidget):
         self.semaine_id = semaine_id
 
         # Initialisation d'attributs pour éviter les avertissements W0201
-        self.thread = None
-        self.worker = None
+        self.requete_deplacement = None
         self.loading_overlay = None
         self.loading_label = None
         self.animation = None
@@ -299,6 +298,56 @@ class JourWidget(QWidget):
         # Ajouter un espacement extensible en bas
         self.repas_layout.addStretch()
 
+    def mettre_a_jour(self, repas_list):
+        """
+        Met à jour le jour avec de nouvelles données en ne touchant que les repas modifiés.
+        Les widgets des repas inchangés sont conservés, avec leur état d'expansion.
+        """
+        if repas_list == self.repas_list:
+            return
+
+        anciens_repas = {repas["id"]: repas for repas in self.repas_list}
+        widgets_existants = {
+            widget.repas_data["id"]: widget for widget in self.repas_widgets
+        }
+        ordre_precedent = [widget.repas_data["id"] for widget in self.repas_widgets]
+
+        nouveaux_widgets = []
+        for repas in repas_list:
+            repas_widget = widgets_existants.pop(repas["id"], None)
+            if repas_widget is None:
+                # Nouveau repas dans ce jour
+                repas_widget = RepasWidget(
+                    self.db_manager,
+                    repas,
+                    self.semaine_id,
+                    self.jour,
+                    compact_mode=True,
+                )
+                repas_widget.setObjectName(f"repas_{repas['id']}")
+            elif anciens_repas.get(repas["id"]) != repas:
+                # Repas modifié : mettre à jour la carte existante
+                repas_widget.mettre_a_jour(repas)
+            nouveaux_widgets.append(repas_widget)
+
+        # Supprimer les repas qui ne sont plus dans ce jour
+        for repas_widget in widgets_existants.values():
+            self.repas_layout.removeWidget(repas_widget)
+            repas_widget.deleteLater()
+
+        # Replacer les cartes seulement si l'ordre ou la composition a changé
+        if [widget.repas_data["id"] for widget in nouveaux_widgets] != ordre_precedent:
+            for repas_widget in nouveaux_widgets:
+                self.repas_layout.removeWidget(repas_widget)
+            for position, repas_widget in enumerate(nouveaux_widgets):
+                self.repas_layout.insertWidget(position, repas_widget)
+
+        self.repas_widgets = nouveaux_widgets
+        self.repas_list = repas_list
+
+        # Mettre à jour les totaux du jour
+        self.update_objectifs(self.objectifs_utilisateur)
+
     def _get_status_class(self, percentage):
         """Détermine la classe CSS à utiliser en fonction du pourcentage de l'objectif atteint"""
         if percentage > self.THRESHOLD_OVER:
@@ -369,84 +418,41 @@ class JourWidget(QWidget):
 
     def add_meal(self):
         """Ajoute un repas pour ce jour"""
-        # Déterminer le prochain ordre disponible
-        max_ordre = 0
-        for repas in self.repas_list:
-            if repas["ordre"] > max_ordre:
-                max_ordre = repas["ordre"]
-
-        # Le nouvel ordre sera le maximum actuel + 1
-        next_ordre = max_ordre + 1
+        # Par défaut, le nouveau repas est placé après le dernier
+        next_position = len(self.repas_list) + 1
 
         dialog = RepasDialog(
             self,
             self.db_manager,
             self.semaine_id,
             jour_predefini=self.jour,
-            ordre_predefini=next_ordre,
+            ordre_predefini=next_position,
         )
 
         if dialog.exec():
-            nom, jour, ordre, repas_type_id, tous_jours = dialog.get_data()
-
-            if tous_jours:
-                # Ajouter le repas à tous les jours de la semaine
-                for jour_semaine in JOURS_SEMAINE:
-                    if ordre != next_ordre:
-                        repas_jour = self.db_manager.get_repas_semaine(
-                            self.semaine_id
-                        ).get(jour_semaine, [])
-                        existe_deja = any(
-                            repas["ordre"] == ordre for repas in repas_jour
-                        )
-
-                        if existe_deja:
-                            self.db_manager.decaler_ordres(
-                                jour_semaine, self.semaine_id, ordre
-                            )
-
-                    if repas_type_id:
-                        # Utiliser une recette existante MAIS conserver le nom personnalisé
-                        self.db_manager.appliquer_repas_type_au_jour(
-                            repas_type_id,
-                            jour_semaine,
-                            ordre,
-                            self.semaine_id,
-                            nom_personnalise=nom,
-                        )
-                    else:
-                        # Créer un nouveau repas vide
-                        self.db_manager.ajouter_repas(
-                            nom, jour_semaine, ordre, self.semaine_id
-                        )
-            else:
-                # Comportement existant pour un seul jour
-                if ordre != next_ordre:
-                    existe_deja = False
-                    for repas in self.repas_list:
-                        if repas["ordre"] == ordre:
-                            existe_deja = True
-                            break
+            nom, jour, position, repas_type_id, tous_jours = dialog.get_data()
 
-                    if existe_deja:
-                        self.db_manager.decaler_ordres(jour, self.semaine_id, ordre)
+            # Ajouter le repas à tous les jours de la semaine ou au jour choisi
+            for jour_repas in JOURS_SEMAINE if tous_jours else [jour]:
+                # Ordre entre les repas voisins, sans décaler les autres repas
+                ordre = self.db_manager.ordre_pour_position(
+                    jour_repas, self.semaine_id, position
+                )
 
                 if repas_type_id:
                     # Utiliser une recette existante MAIS conserver le nom personnalisé
                     self.db_manager.appliquer_repas_type_au_jour(
                         repas_type_id,
-                        jour,
+                        jour_repas,
                         ordre,
                         self.semaine_id,
                         nom_personnalise=nom,
                     )
                 else:
                     # Créer un nouveau repas vide
-                    self.db_manager.ajouter_repas(nom, jour, ordre, self.semaine_id)
-
-            # Normaliser les ordres après l'ajout pour garantir des ordres consécutifs
-            for j in JOURS_SEMAINE if tous_jours else [jour]:
-                self.db_manager.normaliser_ordres(j, self.semaine_id)
+                    self.db_manager.ajouter_repas(
+                        nom, jour_repas, ordre, self.semaine_id
+                    )
 
             # Émettre le signal pour notifier que les repas ont été modifiés
             EVENT_BUS.repas_modifies.emit(self.semaine_id)
@@ -804,34 +810,15 @@ class JourWidget(QWidget):
                 event.acceptProposedAction()
                 return
 
-            # Trier les repas existants par ordre
-            sorted_repas = sorted(self.repas_list, key=lambda r: r.get("ordre", 1))
-
-            # Déterminer le nouvel ordre du repas en fonction de l'indice de drop
+            # Position d'arrivée dans le jour (1 pour le premier), sans compter
+            # le repas déplacé s'il vient de ce jour
             if self.drop_index >= 0:
-                if len(sorted_repas) == 0:
-                    nouvel_ordre = 1  # Premier repas
-                elif self.drop_index == 0:
-                    nouvel_ordre = (
-                        sorted_repas[0].get("ordre", 1) - 0.5
-                    )  # Avant le premier
-                elif self.drop_index >= len(sorted_repas):
-                    nouvel_ordre = (
-                        sorted_repas[-1].get("ordre", 1) + 1
-                    )  # Après le dernier
-                else:
-                    # Entre deux repas
-                    ordre_avant = sorted_repas[self.drop_index - 1].get("ordre", 1)
-                    ordre_apres = sorted_repas[self.drop_index].get(
-                        "ordre", ordre_avant + 1
-                    )
-                    nouvel_ordre = (ordre_avant + ordre_apres) / 2
+                position = self.drop_index + 1
+                if meme_jour and repas_index != -1 and repas_index < self.drop_index:
+                    position -= 1
             else:
-                # Fallback au dernier ordre + 1 si l'indicateur de drop n'est pas défini
-                if sorted_repas:
-                    nouvel_ordre = sorted_repas[-1].get("ordre", 0) + 1
-                else:
-                    nouvel_ordre = 1
+                # Fallback après le dernier repas si l'indicateur de drop n'est pas défini
+                position = len(self.repas_list) + 1
 
             # Masquer l'indicateur de drop avant de continuer
             self.repas_container.hide_drop_indicator()
@@ -839,27 +826,16 @@ class JourWidget(QWidget):
             # Afficher un overlay de chargement et continuer avec le processus existant
             self.show_loading_overlay("Déplacement du repas en cours...")
 
-            # Créer et configurer le thread et le worker
-            self.thread = QThread()
-            self.worker = PlanningOperationWorker(
-                self.db_manager,
-                "move_repas",
-                repas_id=repas_id,
-                jour_dest=self.jour,
-                ordre_dest=nouvel_ordre,
-                semaine_id=self.semaine_id,
+            # Déplacer le repas en arrière-plan
+            requete = DB_EXECUTOR.executer(
+                self.db_manager.changer_jour_repas, repas_id, self.jour, position
             )
-
-            # Configurer les connexions
-            self.worker.moveToThread(self.thread)
-            self.thread.started.connect(self.worker.run)
-            self.worker.operation_completed.connect(self.on_operation_completed)
-            self.worker.operation_completed.connect(self.thread.quit)
-            self.worker.operation_completed.connect(self.worker.deleteLater)
-            self.thread.finished.connect(self.thread.deleteLater)
-
-            # Démarrer le thread
-            self.thread.start()
+            requete.termine.connect(self.on_operation_completed)
+            requete.echec.connect(
+                lambda message: self.on_operation_completed(False, message)
+            )
+            requete.fin.connect(lambda: self._operation_finie(requete))
+            self.requete_deplacement = requete
 
             event.acceptProposedAction()
         else:
@@ -903,14 +879,23 @@ class JourWidget(QWidget):
         if hasattr(self, "loading_overlay"):
             self.loading_overlay.hide()
 
-    def on_operation_completed(self, success, message, data):
+    def operation_en_cours(self):
+        """Indique si un déplacement de repas est en cours en arrière-plan"""
+        return self.requete_deplacement is not None
+
+    def _operation_finie(self, requete):
+        """Masque l'overlay à la fin du déplacement"""
+        if self.requete_deplacement is requete:
+            self.requete_deplacement = None
+            self.hide_loading_overlay()
+
+    def on_operation_completed(self, success, message="Échec du déplacement du repas"):
         """Callback appelé lorsque l'opération est terminée"""
         self.hide_loading_overlay()
 
         if success:
             # Notifier que les repas ont été modifiés
-            semaine_id = data.get("semaine_id") if data else self.semaine_id
-            EVENT_BUS.repas_modifies.emit(semaine_id)
+            EVENT_BUS.repas_modifies.emit(self.semaine_id)
             EVENT_BUS.planning_modifie.emit()
 
             # Recharger les données
@@ -137,6 +137,42 @@ class RepasWidget(QFrame):
 
         self.setup_ui()
 
+    def get_multiplicateur(self):
+        """Retourne (multiplicateur, ignore_course) du repas
+
+        Les données fournies par get_repas_semaine et get_repas contiennent déjà le
+        multiplicateur ; la base n'est interrogée que pour des données incomplètes.
+        """
+        if "multiplicateur" not in self.repas_data:
+            self.repas_data.update(
+                self.db_manager.get_repas_multiplicateur(self.repas_data["id"])
+            )
+        return self.repas_data["multiplicateur"], self.repas_data["ignore_course"]
+
+    def update_multiplicateur_button(self, multiplicateur, ignore_course):
+        """Met à jour le texte, le statut et l'infobulle du bouton de multiplicateur"""
+        if ignore_course:
+            self.btn_multi.setText("Préparé")
+            self.btn_multi.setProperty("status", "prepared")
+            self.btn_multi.setToolTip(
+                "Déjà préparé - n'apparaît pas dans la liste de courses"
+            )
+        else:
+            self.btn_multi.setText(f"×{multiplicateur}")
+            if multiplicateur > 1:
+                self.btn_multi.setProperty("status", "multiplied")
+                self.btn_multi.setToolTip(
+                    f"Quantités multipliées par {multiplicateur} dans la liste de courses"
+                )
+            else:
+                self.btn_multi.setProperty("status", "normal")
+                self.btn_multi.setToolTip(
+                    "Cliquez pour modifier la quantité dans la liste de courses"
+                )
+
+        # Forcer la mise à jour du style selon le nouveau statut
+        self.btn_multi.style().polish(self.btn_multi)
+
     def setup_ui(self):
         # Layout principal
         self.repas_layout = QVBoxLayout(self)
@@ -198,36 +234,13 @@ class RepasWidget(QFrame):
         # Espace flexible entre les calories et les boutons
         header_layout.addStretch(1)
 
-        # Obtenir l'info de multiplicateur pour ce repas
-        repas_multi_info = self.db_manager.get_repas_multiplicateur(
-            self.repas_data["id"]
-        )
-        multiplicateur = repas_multi_info.get("multiplicateur", 1)
-        ignore_course = repas_multi_info.get("ignore_course", False)
-
         # Créer le bouton de multiplicateur
         self.btn_multi = QPushButton()
         self.btn_multi.setObjectName("multiButton")
 
         # Définir le texte et le style du bouton en fonction des paramètres
-        if ignore_course:
-            self.btn_multi.setText("Préparé")
-            self.btn_multi.setProperty("status", "prepared")
-            self.btn_multi.setToolTip(
-                "Déjà préparé - n'apparaît pas dans la liste de courses"
-            )
-        else:
-            self.btn_multi.setText(f"×{multiplicateur}")
-            if multiplicateur > 1:
-                self.btn_multi.setProperty("status", "multiplied")
-                self.btn_multi.setToolTip(
-                    f"Quantités multipliées par {multiplicateur} dans la liste de courses"
-                )
-            else:
-                self.btn_multi.setProperty("status", "normal")
-                self.btn_multi.setToolTip(
-                    "Cliquez pour modifier la quantité dans la liste de courses"
-                )
+        multiplicateur, ignore_course = self.get_multiplicateur()
+        self.update_multiplicateur_button(multiplicateur, ignore_course)
 
         # Connecter le clic du bouton
         self.btn_multi.clicked.connect(self.modifier_multiplicateur)
@@ -417,6 +430,26 @@ class RepasWidget(QFrame):
         # Notifier le changement
         EVENT_BUS.repas_modifies.emit(self.semaine_id)
 
+    def mettre_a_jour(self, repas_data):
+        """Met à jour la carte avec de nouvelles données sans la reconstruire"""
+        anciennes_donnees = self.repas_data
+        self.repas_data = repas_data
+
+        if anciennes_donnees.get("nom") != repas_data["nom"]:
+            self.titre_repas.setText(f"<b>{repas_data['nom']}</b>")
+
+        if self.get_multiplicateur() != (
+            anciennes_donnees.get("multiplicateur"),
+            anciennes_donnees.get("ignore_course"),
+        ):
+            self.update_multiplicateur_button(*self.get_multiplicateur())
+
+        # Les détails ne sont reconstruits que si les aliments ont changé
+        if anciennes_donnees.get("aliments") != repas_data["aliments"]:
+            self.clear_and_rebuild_details()
+
+        self.update_summaries()
+
     def add_aliment_to_layout(self, aliment, parent_layout):
         """Ajoute un aliment au layout avec son bouton de suppression et alertes éventuelles"""
         # Créer un widget conteneur pour l'aliment
@@ -712,11 +745,7 @@ class RepasWidget(QFrame):
     def modifier_multiplicateur(self):
         """Ouvre une boîte de dialogue pour modifier le multiplicateur du repas"""
         # Récupérer les infos actuelles
-        repas_multi_info = self.db_manager.get_repas_multiplicateur(
-            self.repas_data["id"]
-        )
-        multiplicateur_actuel = repas_multi_info.get("multiplicateur", 1)
-        ignore_actuel = repas_multi_info.get("ignore_course", False)
+        multiplicateur_actuel, ignore_actuel = self.get_multiplicateur()
 
         dialog = QDialog(self)
         dialog.setWindowTitle("Paramètres pour la liste de courses")
@@ -785,27 +814,10 @@ class RepasWidget(QFrame):
                 ignore_course=ignore_course,
             )
 
-            # Mettre à jour l'apparence du bouton
-            if ignore_course:
-                self.btn_multi.setText("Préparé")
-                self.btn_multi.setStyleSheet("background-color: #4CAF50; color: white;")
-                self.btn_multi.setToolTip(
-                    "Déjà préparé - n'apparaît pas dans la liste de courses"
-                )
-            else:
-                self.btn_multi.setText(f"× {multiplicateur}")
-                if multiplicateur > 1:
-                    self.btn_multi.setStyleSheet(
-                        "background-color: #2196F3; color: white;"
-                    )
-                    self.btn_multi.setToolTip(
-                        f"Quantités multipliées par {multiplicateur} dans la liste de courses"
-                    )
-                else:
-                    self.btn_multi.setStyleSheet("")
-                    self.btn_multi.setToolTip(
-                        "Cliquez pour modifier la quantité dans la liste de courses"
-                    )
+            # Mettre à jour les données locales et l'apparence du bouton
+            self.repas_data["multiplicateur"] = multiplicateur
+            self.repas_data["ignore_course"] = ignore_course
+            self.update_multiplicateur_button(multiplicateur, ignore_course)
 
             # Notifier que les repas ont été modifiés
             EVENT_BUS.repas_modifies.emit(self.semaine_id)
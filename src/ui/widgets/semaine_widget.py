@@ -8,6 +8,8 @@ from PySide6.QtWidgets import (
 from src.utils import EVENT_BUS
 from src.utils import JOURS_SEMAINE
 from src.ui.widgets.jour_widget import JourWidget
+from src.ui.widgets.indicateur_chargement import IndicateurChargement
+from src.utils.db_executor import DB_EXECUTOR
 from .print_manager import PrintManager
 
 
@@ -32,6 +34,9 @@ class SemaineWidget(QWidget):
         # Dictionnaire pour suivre les recettes utilisées dans cette semaine
         self.recettes_utilisees = {}
 
+        # Chargement des repas en cours en arrière-plan
+        self.requete_chargement = None
+
         self.setup_ui()
         self.load_data()
 
@@ -39,7 +44,6 @@ class SemaineWidget(QWidget):
         EVENT_BUS.utilisateur_modifie.connect(self.update_objectifs_utilisateur)
         EVENT_BUS.aliment_supprime.connect(self.on_aliment_supprime)
         EVENT_BUS.repas_modifies.connect(self.on_repas_modifies)
-        EVENT_BUS.recette_modifiee.connect(self.on_recette_modifiee)
 
     def setup_ui(self):
         # Dictionnaire pour suivre les recettes utilisées dans cette semaine
@@ -78,63 +82,66 @@ class SemaineWidget(QWidget):
         self.scroll_area.setWidget(self.days_container)
         main_layout.addWidget(self.scroll_area)
 
+        # Indicateur affiché pendant le chargement des repas
+        self.indicateur_chargement = IndicateurChargement(
+            self.scroll_area, "Chargement de la semaine..."
+        )
+
         self.setLayout(main_layout)
 
     def load_data(self):
+        """Charge les données des repas pour la semaine en arrière-plan"""
+        # Un rechargement remplace celui qui est encore en cours
+        requete = DB_EXECUTOR.executer(
+            self.db_manager.get_repas_semaine,
+            self.semaine_id,
+            cle=("semaine", id(self)),
+        )
+        requete.termine.connect(self.afficher_repas)
+        requete.fin.connect(lambda: self._chargement_fini(requete))
+        self.requete_chargement = requete
+        self.indicateur_chargement.suivre(requete)
+
+    def _chargement_fini(self, requete):
+        """Oublie le chargement terminé s'il n'a pas été remplacé"""
+        if self.requete_chargement is requete:
+            self.requete_chargement = None
+
+    def afficher_repas(self, repas_semaine):
         """
-        Charge les données des repas pour la semaine et crée les widgets jour correspondants.
-        Cette méthode nettoie d'abord l'interface existante avant de recharger toutes les données.
+        Affiche les repas de la semaine chargés par load_data.
+        Au premier chargement, crée les widgets jour ; ensuite, chaque jour compare les
+        nouvelles données aux précédentes et ne met à jour que les repas modifiés.
         """
-        # Nettoyer la disposition existante
-        while self.days_layout.count():
-            item = self.days_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
-
-        # Vider la liste des widgets jour et le dictionnaire des recettes utilisées
-        self.jour_widgets = []
-        self.recettes_utilisees = {}
-
-        # Récupérer les données des repas pour la semaine
-        repas_semaine = self.db_manager.get_repas_semaine(self.semaine_id)
-
         # Identifier les recettes utilisées dans cette semaine
+        self.recettes_utilisees = {}
         for jour in JOURS_SEMAINE:
             for repas in repas_semaine[jour]:
                 if repas.get("repas_type_id"):
                     # Ajouter la recette au dictionnaire si elle n'y est pas déjà
                     self.recettes_utilisees[repas["repas_type_id"]] = True
 
-        for col, jour in enumerate(JOURS_SEMAINE):
-            # Créer un widget pour le jour
-            day_widget = JourWidget(
-                self.db_manager,
-                jour,
-                repas_semaine[jour],
-                self.objectifs_utilisateur,
-                self.semaine_id,
-            )
-            self.jour_widgets.append(day_widget)
-            self.days_layout.addWidget(day_widget, 0, col)
+        if self.jour_widgets:
+            # Mise à jour incrémentale des jours existants
+            for jour_widget in self.jour_widgets:
+                jour_widget.mettre_a_jour(repas_semaine[jour_widget.jour])
+        else:
+            for col, jour in enumerate(JOURS_SEMAINE):
+                # Créer un widget pour le jour
+                day_widget = JourWidget(
+                    self.db_manager,
+                    jour,
+                    repas_semaine[jour],
+                    self.objectifs_utilisateur,
+                    self.semaine_id,
+                )
+                self.jour_widgets.append(day_widget)
+                self.days_layout.addWidget(day_widget, 0, col)
 
         # Répartir les colonnes équitablement
         for col in range(len(JOURS_SEMAINE)):
             self.days_layout.setColumnStretch(col, 1)
 
-        # Normaliser les ordres si nécessaire
-        for jour in JOURS_SEMAINE:
-            # Vérifier si des valeurs d'ordre sont fractionnaires
-            has_fractional = False
-            for repas in repas_semaine[jour]:
-                if repas["ordre"] != int(repas["ordre"]):
-                    has_fractional = True
-                    break
-
-            # Si des valeurs fractionnaires sont détectées, normaliser les ordres
-            if has_fractional:
-                self.db_manager.normaliser_ordres(jour, self.semaine_id)
-
     def print_planning(self):
         """Imprime le planning de la semaine actuelle"""
         self.print_manager.print_planning(self.semaine_id)
@@ -149,14 +156,11 @@ class SemaineWidget(QWidget):
         if semaine_id == self.semaine_id:
             self.load_data()
 
-    # Dans SemaineWidget.on_recette_modifiee
-    def on_recette_modifiee(self, recette_id):
-        """Appelé lorsqu'une recette est modifiée"""
-        # Vérifier si cette recette est utilisée dans cette semaine
-        if recette_id in self.recettes_utilisees:
-            # Mettre à jour tous les repas basés sur cette recette
-            self.db_manager.update_repas_based_on_recipe(recette_id)
-            self.load_data()
+    def operation_en_cours(self):
+        """Indique si la semaine ou l'un de ses jours attend une requête en arrière-plan"""
+        if self.requete_chargement is not None:
+            return True
+        return any(jour_widget.operation_en_cours() for jour_widget in self.jour_widgets)
 
     def charger_objectifs_utilisateur(self):
         """Récupère les objectifs nutritionnels de l'utilisateur avec des valeurs par défaut sécuritaires"""
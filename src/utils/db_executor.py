@@ -0,0 +1,156 @@
+"""
+Exécution des appels à la base de données en dehors du thread de l'interface
+
+Les appels sont exécutés par un QThreadPool dédié dont les threads sont
+persistants : chacun garde sa propre connexion SQLite du pool de DBConnector.
+Le résultat est renvoyé par signal dans le thread de l'interface.
+"""
+
+import traceback
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+from src.database.db_profilage import PROFILEUR
+
+# Nombre de threads du pool. Chaque thread a sa propre connexion : les lectures
+# s'exécutent en parallèle, les écritures attendent leur tour sur le verrou SQLite.
+NB_THREADS_DB = 4
+
+
+class RequeteDB(QObject):
+    """Appel à la base de données soumis à l'exécuteur
+
+    Signaux (toujours reçus dans le thread de l'interface) :
+        termine(object): résultat de l'appel
+        echec(str): message d'erreur si l'appel a levé une exception
+        fin(): émis une fois l'appel terminé, réussi, échoué ou annulé
+    """
+
+    termine = Signal(object)
+    echec = Signal(str)
+    fin = Signal()
+
+    # Émis par le thread de travail, relayé dans le thread de l'interface
+    _resultat = Signal(bool, object)
+
+    def __init__(self, fonction, args, kwargs, cle=None, parent=None):
+        super().__init__(parent)
+        self.fonction = fonction
+        self.args = args
+        self.kwargs = kwargs
+        self.cle = cle
+        # Nom de l'action sous lequel le profileur regroupe les requêtes de l'appel
+        if isinstance(cle, tuple):
+            self.action = str(cle[0])
+        else:
+            self.action = str(cle) if cle is not None else fonction.__name__
+        self.annulee = False
+        self.terminee = False
+        self._resultat.connect(self._on_resultat)
+
+    def annuler(self):
+        """Annule la requête : elle n'est pas exécutée si elle n'a pas démarré,
+        et son résultat est ignoré dans tous les cas"""
+        self.annulee = True
+
+    def _on_resultat(self, succes, valeur):
+        """Relaie le résultat dans le thread de l'interface, sauf si la requête est annulée"""
+        self.terminee = True
+        if not self.annulee:
+            if succes:
+                self.termine.emit(valeur)
+            else:
+                self.echec.emit(valeur)
+        self.fin.emit()
+
+
+class _TacheDB(QRunnable):
+    """Tâche du pool qui exécute une RequeteDB"""
+
+    def __init__(self, requete):
+        super().__init__()
+        self.requete = requete
+        self.setAutoDelete(True)
+
+    def run(self):
+        requete = self.requete
+        if requete.annulee:
+            # Requête remplacée avant son démarrage : ne pas interroger la base
+            requete._resultat.emit(True, None)
+            return
+
+        try:
+            with PROFILEUR.action(requete.action):
+                resultat = requete.fonction(*requete.args, **requete.kwargs)
+        except Exception as e:  # pylint: disable=broad-except
+            print(f"Erreur dans une requête en arrière-plan: {e}")
+            traceback.print_exc()
+            requete._resultat.emit(False, str(e))
+            return
+        requete._resultat.emit(True, resultat)
+
+
+class DBExecutor(QObject):
+    """Exécuteur des appels à la base de données dans un pool de threads (Singleton)
+
+    Une requête soumise avec une clé remplace la requête précédente de même clé,
+    qui est annulée : une recherche tapée rapidement n'affiche que le dernier
+    résultat.
+    """
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = DBExecutor()
+        return cls._instance
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(NB_THREADS_DB)
+        # Threads persistants : leur connexion SQLite reste ouverte entre les requêtes
+        self.pool.setExpiryTimeout(-1)
+
+        self.requetes_par_cle = {}  # Requête la plus récente de chaque clé
+        self.requetes_en_cours = set()  # Références gardées jusqu'à la fin des requêtes
+
+    def executer(self, fonction, *args, cle=None, **kwargs):
+        """
+        Exécute fonction(*args, **kwargs) dans le pool et retourne la RequeteDB
+
+        Args:
+            fonction: Méthode de DatabaseManager (ou toute fonction) à appeler
+            cle: Clé identifiant la requête ; la requête précédente de même clé est annulée
+        """
+        if cle is not None:
+            self.annuler(cle)
+
+        requete = RequeteDB(fonction, args, kwargs, cle, self)
+        requete.fin.connect(lambda: self._liberer(requete))
+        self.requetes_en_cours.add(requete)
+        if cle is not None:
+            self.requetes_par_cle[cle] = requete
+
+        self.pool.start(_TacheDB(requete))
+        return requete
+
+    def annuler(self, cle):
+        """Annule la requête en attente ou en cours associée à une clé"""
+        requete = self.requetes_par_cle.pop(cle, None)
+        if requete is not None:
+            requete.annuler()
+
+    def _liberer(self, requete):
+        """Oublie une requête terminée"""
+        self.requetes_en_cours.discard(requete)
+        if self.requetes_par_cle.get(requete.cle) is requete:
+            del self.requetes_par_cle[requete.cle]
+        requete.deleteLater()
+
+    def attendre(self, msecs=-1):
+        """Attend la fin des requêtes en cours (avant la fermeture de la base)"""
+        return self.pool.waitForDone(msecs)
+
+
+# Créer l'instance unique accessible globalement
+DB_EXECUTOR = DBExecutor.instance()
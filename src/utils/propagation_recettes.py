@@ -0,0 +1,39 @@
+from PySide6.QtCore import QObject
+from .events import EVENT_BUS
+from .db_executor import DB_EXECUTOR
+
+
+class PropagationRecettes(QObject):
+    """
+    Répercute les modifications d'une recette sur les repas du planning
+
+    La mise à jour est faite une seule fois par modification, quel que soit le
+    nombre de semaines ouvertes, puis chaque semaine concernée est notifiée par
+    un seul signal repas_modifies.
+
+    La mise à jour s'exécute dans l'exécuteur de requêtes : le thread de
+    l'interface n'attend pas le verrou d'écriture tenu par un autre appel.
+    """
+
+    def __init__(self, db_manager, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        EVENT_BUS.recette_modifiee.connect(self.propager)
+
+    def propager(self, recette_id):
+        """Met à jour en arrière-plan les repas basés sur la recette"""
+        # Une modification plus récente de la même recette remplace celle en attente
+        requete = DB_EXECUTOR.executer(
+            self.db_manager.update_repas_based_on_recipe,
+            recette_id,
+            cle=("propagation", recette_id),
+        )
+        requete.termine.connect(self.notifier_semaines)
+
+    def notifier_semaines(self, semaines):
+        """Notifie une fois chaque semaine dont des repas ont été mis à jour"""
+        if not semaines:
+            return
+
+        for semaine_id in semaines:
+            EVENT_BUS.repas_modifies.emit(semaine_id)